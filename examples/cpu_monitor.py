@@ -21,7 +21,7 @@ import psutil
 from textual.app import App, ComposeResult
 from textual.widgets import Static
 
-from sparklines import sparklines
+from sparklines import SparklineBuffer, sparklines
 
 
 HISTORY = 20
@@ -42,7 +42,9 @@ class MonitorBar(Static, can_focus=False):
 
     def __init__(self) -> None:  # noqa: D107
         super().__init__()
-        self._cpu: deque[float] = deque([0.0] * HISTORY, maxlen=HISTORY)
+        self._cpu = SparklineBuffer(HISTORY, minimum=0, maximum=100)
+        self._cpu.extend([0.0] * HISTORY)
+        self._cpu_last = 0.0
         self._mem: deque[float] = deque([0.0] * HISTORY, maxlen=HISTORY)
         self._prev_mem: float = psutil.virtual_memory().used / 1024**2
 
@@ -50,13 +52,15 @@ class MonitorBar(Static, can_focus=False):
         self.set_interval(1.0, self._tick)
 
     def _tick(self) -> None:
-        self._cpu.append(psutil.cpu_percent(interval=None))
+        self._cpu_last = psutil.cpu_percent(interval=None)
+        self._cpu.push(self._cpu_last)
 
         curr_mb = psutil.virtual_memory().used / 1024**2
         self._mem.append(curr_mb - self._prev_mem)
         self._prev_mem = curr_mb
 
-        cpu_spark = sparklines(list(self._cpu), minimum=0, maximum=100)[0]
+        # Fixed 0-100 scale: the buffer only renders the newly pushed cell.
+        cpu_spark = self._cpu.render()[0]
 
         mem_list = list(self._mem)
         bound = max((abs(v) for v in mem_list), default=1.0) or 1.0
@@ -65,7 +69,7 @@ class MonitorBar(Static, can_focus=False):
             mem_rows = [" " * HISTORY] + mem_rows
 
         hint = "q: quit"
-        cpu_label = f"CPU  {cpu_spark}  {self._cpu[-1]:5.1f}%"
+        cpu_label = f"CPU  {cpu_spark}  {self._cpu_last:5.1f}%"
         width = (self.size.width or 80) - 2  # account for padding: 0 1
         cpu_line = cpu_label + " " * max(0, width - len(cpu_label) - len(hint)) + hint
 
@@ -1,3 +1,16 @@
 """Text-based sparklines for the command-line and Python."""
 
+from typing import Any
+
 from sparklines.sparklines import *  # noqa: F403
+from sparklines.buffer import SparklineBuffer as SparklineBuffer
+from sparklines.index import SeriesIndex as SeriesIndex
+
+
+def __getattr__(name: str) -> Any:
+    """Import sparkline_stream, and asyncio with it, when it is first used."""
+    if name == "sparkline_stream":
+        from sparklines.follow import sparkline_stream
+
+        return sparkline_stream
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
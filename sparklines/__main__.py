@@ -1,15 +1,28 @@
 """CLI entry point for the sparklines program."""
 
 import argparse
-import importlib.util
+import functools
 import re
+import shutil
 import sys
-from importlib.metadata import version
-from typing import Optional
+from collections.abc import Iterator, Sequence
+from typing import IO, Any, Optional
 
-from sparklines.sparklines import NumLines, sparklines, demo
+from sparklines.ansi import HAVE_TERMCOLOR, RenderContext
+from sparklines.columnar import BINARY_FORMATS, load_binary
+from sparklines.parallel import _executor
+from sparklines.renderer import Renderer
+from sparklines.sparklines import (
+    REDUCERS,
+    NumLines,
+    demo,
+    sparklines,
+    write_sparklines,
+)
+from sparklines.stream import write_stream
 
-HAVE_TERMCOLOR = bool(importlib.util.find_spec("termcolor"))
+# The same as sparklines.follow.MAX_FPS, which is imported only by --follow.
+FPS = 10.0
 
 
 def _float_or_none(num_str: str) -> Optional[float]:
@@ -77,6 +90,251 @@ def parse_num_lines(arg: str) -> "NumLines":
     return n
 
 
+def parse_width(arg: str) -> int:
+    """Parse --width argument: positive integer or 'auto' (terminal width)."""
+    if arg == "auto":
+        return shutil.get_terminal_size().columns
+    try:
+        n = int(arg)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"invalid width: {arg!r} (use a positive integer or 'auto')"
+        ) from e
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"--width must be >= 1, got {n}")
+    return n
+
+
+def parse_columns(arg: str) -> list[str]:
+    """Parse --columns argument: comma-separated header names or 1-based numbers."""
+    columns = [c.strip() for c in arg.split(",")]
+    if not all(columns):
+        raise argparse.ArgumentTypeError(f"invalid column list: {arg!r}")
+    for c in columns:
+        if c.isdigit() and int(c) < 1:
+            raise argparse.ArgumentTypeError(f"column numbers start at 1, got {c}")
+    return columns
+
+
+def parse_positive(arg: str) -> int:
+    """Parse a count argument such as --jobs or --window: a positive integer."""
+    try:
+        n = int(arg)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid count: {arg!r}") from e
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+
+def _open_input(path: str) -> IO[str]:
+    """Open a named input file, or stdin for "-"."""
+    if path == "-":
+        return open(sys.stdin.fileno(), closefd=False)
+    return open(path, newline="")
+
+
+def _read_columns(
+    path: str, columns: list[str]
+) -> Iterator[tuple[str, list[Optional[float]]]]:
+    """Yield (label, values) of the given columns of a CSV or TSV file.
+
+    Tab-separated input is recognized by its first line. Columns are header
+    names or 1-based numbers; the first row is a header if any of its cells
+    is neither a number nor empty/null/none.
+    """
+    import csv
+
+    with _open_input(path) as f:
+        first = f.readline()
+        delimiter = "\t" if "\t" in first else ","
+        rows = csv.reader([first], delimiter=delimiter)
+        head = next(rows, [])
+        header = any(
+            cell.strip()
+            and cell.strip().lower() not in ("null", "none")
+            and _float_or_none(cell) is None
+            for cell in head
+        )
+        body = csv.reader(f, delimiter=delimiter)
+        indices = []
+        for c in columns:
+            if c.isdigit():
+                indices.append(int(c) - 1)
+            elif header and c in head:
+                indices.append(head.index(c))
+            else:
+                raise ValueError(f"{path}: no column named {c!r}")
+        series: list[list[Optional[float]]] = [[] for _ in columns]
+        for row in body if header else [head, *body]:
+            for values, i in zip(series, indices):
+                values.append(_float_or_none(row[i]) if i < len(row) else None)
+    for c, values in zip(columns, series):
+        yield f"{path}:{c}", values
+
+
+def _render_file(
+    path: str,
+    columns: Optional[list[str]],
+    options: dict[str, Any],
+    binary: Optional[tuple[str, int, Optional[int]]] = None,
+) -> list[tuple[str, list[str]]]:
+    """Return the (label, sparkline lines) of every series in one input file.
+
+    A file holds one whitespace-separated series, with columns, the named
+    columns of a CSV/TSV table, or with binary, a (format, offset, count)
+    range of binary values (see load_binary). Runs in a --jobs worker.
+    """
+    series: list[tuple[str, Sequence[Optional[float]]]]
+    if binary:
+        series = [
+            (path, load_binary(sys.stdin.buffer if path == "-" else path, *binary))
+        ]
+    elif columns:
+        series = list(_read_columns(path, columns))
+    else:
+        with _open_input(path) as f:
+            series = [(path, [_float_or_none(n) for n in f.read().split()])]
+    return [(label, sparklines(values, **options)) for label, values in series]
+
+
+def _write_labelled(
+    files: list[str],
+    columns: Optional[list[str]],
+    options: dict[str, Any],
+    jobs: int,
+    binary: Optional[tuple[str, int, Optional[int]]] = None,
+) -> None:
+    """Render every file (or column) as a labelled sparkline, in input order.
+
+    With jobs > 1 the files are parsed and rendered in a pool of that many
+    worker processes; results are still written in the order of files.
+    """
+    labels = [f"{f}:{c}" for f in files for c in columns] if columns else files
+    pad = max(map(len, labels))
+    render = functools.partial(
+        _render_file, columns=columns, options=options, binary=binary
+    )
+    if jobs > 1 and len(files) > 1:
+        pool = _executor(jobs)
+        results = pool.map(render, files, chunksize=max(1, len(files) // (jobs * 4)))
+    else:
+        pool = None
+        results = map(render, files)
+    try:
+        for rendered in results:
+            for label, lines in rendered:
+                text = "\n".join(
+                    f"{label if i == 0 else '':<{pad}} {line}" if line else ""
+                    for i, line in enumerate(lines)
+                )
+                sys.stdout.write(text + "\n")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def _run_client(p: argparse.ArgumentParser, a: argparse.Namespace) -> None:
+    """Send the VALUE arguments to the --client key and print its sparkline."""
+    from sparklines.client import request
+
+    nums = [] if a.nums == sys.stdin else a.nums
+    try:
+        lines = request(a.client, map(_float_or_none, nums), a.socket)
+    except OSError as e:
+        p.error(f"cannot reach the daemon: {e.strerror or e}")
+    except ValueError as e:
+        p.error(str(e))
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
+
+
+def _run_server(
+    p: argparse.ArgumentParser, a: argparse.Namespace, options: dict[str, Any]
+) -> None:
+    """Run the --serve daemon until interrupted."""
+    if a.nums != sys.stdin or a.file or a.follow:
+        p.error("--serve takes its values from --client requests only")
+    from sparklines.serve import WINDOW, serve
+
+    try:
+        serve(Renderer(**options), a.socket, a.window or WINDOW)
+    except OSError as e:
+        p.error(str(e))
+    except KeyboardInterrupt:
+        pass
+
+
+def _run_state(
+    p: argparse.ArgumentParser, a: argparse.Namespace, options: dict[str, Any]
+) -> None:
+    """Push to the --state history and draw its last --window values."""
+    if a.nums != sys.stdin or a.file or a.follow or a.serve:
+        p.error("--state takes its values from --push only")
+    from sparklines.state import RingFile
+
+    try:
+        with RingFile(a.state, a.window) as ring:
+            if a.push:
+                ring.push(map(_float_or_none, a.push))
+            values = ring.window(a.window)
+            lo, hi = ring.bounds if a.scale == "history" else (None, None)
+    except (OSError, ValueError) as e:
+        p.error(str(e))
+    options = {
+        **options,
+        "minimum": lo if a.min is None else a.min,
+        "maximum": hi if a.max is None else a.max,
+    }
+    write_sparklines(sys.stdout, values, **options)
+
+
+def _run_follow(
+    p: argparse.ArgumentParser, a: argparse.Namespace, options: dict[str, Any]
+) -> None:
+    """Redraw the last --window values of stdin as they arrive."""
+    if a.nums != sys.stdin or a.file:
+        p.error("--follow reads from stdin only")
+    if a.fps <= 0:
+        p.error(f"--fps must be > 0, got {a.fps:g}")
+    from sparklines.follow import follow
+
+    window = a.window or shutil.get_terminal_size().columns
+    try:
+        follow(
+            sys.stdin.buffer,
+            sys.stdout,
+            Renderer(**options),
+            window,
+            a.fps,
+        )
+    except KeyboardInterrupt:
+        sys.stdout.write("\n")
+
+
+class _VersionAction(argparse.Action):
+    """Like argparse's "version" action, but looks the version up when used.
+
+    importlib.metadata takes longer to import than the rest of the CLI.
+    """
+
+    def __init__(self, option_strings: list[str], dest: str, **kwargs: Any) -> None:
+        """Take no argument, like action="version"."""
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Any,
+        option_string: Optional[str] = None,
+    ) -> None:
+        """Print the installed version of sparklines and exit."""
+        from importlib.metadata import version
+
+        print(version("sparklines"))
+        parser.exit()
+
+
 def main(argv: Optional[list[str]] = None) -> None:
     """Run the sparklines CLI."""
     desc = """Sparklines on the command-line, e.g. ▃▁▄▁▄█▂▅ for
@@ -87,9 +345,9 @@ def main(argv: Optional[list[str]] = None) -> None:
     p.add_argument(
         "-V",
         "--version",
-        action="version",
+        action=_VersionAction,
+        default=argparse.SUPPRESS,
         help="Display version number and quit.",
-        version=version("sparklines"),
     )
 
     help_d = """Show a few usage examples for given (mandatory) input
@@ -153,10 +411,194 @@ def main(argv: Optional[list[str]] = None) -> None:
     """
     p.add_argument("-w", "--wrap", metavar="PERIOD", type=int, help=help_wrap)
 
+    help_width = """Aggregate the input into at most WIDTH bars, or the
+    terminal width with 'auto'. See --reducer for how buckets are combined."""
+    p.add_argument("--width", metavar="WIDTH", type=parse_width, help=help_width)
+
+    p.add_argument(
+        "--reducer",
+        choices=REDUCERS,
+        default="max",
+        help="how --width combines buckets; minmax keeps both extremes. Default: max.",
+    )
+
+    help_file = """Read a series from FILE (whitespace-separated values, "-" for
+        stdin) and label its sparkline with the file name. Can be given
+        repeatedly, instead of VALUE arguments."""
+    p.add_argument(
+        "-f", "--file", metavar="FILE", action="append", default=[], help=help_file
+    )
+
+    help_columns = """Read each --file as CSV (or TSV, detected by a tab in
+        the first line) and render these columns: comma-separated header
+        names or 1-based column numbers, e.g. "cpu,mem" or "2,3"."""
+    p.add_argument(
+        "-c", "--columns", metavar="COLS", type=parse_columns, help=help_columns
+    )
+
+    help_jobs = """Parse and render --file inputs in N worker processes.
+        Output order is that of the files. Default: 1."""
+    p.add_argument(
+        "-j", "--jobs", metavar="N", type=parse_positive, default=1, help=help_jobs
+    )
+
+    help_follow = """Keep reading values from stdin, line by line, and redraw
+        the sparkline of the last --window values in place as they arrive."""
+    p.add_argument("-F", "--follow", action="store_true", help=help_follow)
+
+    p.add_argument(
+        "--window",
+        metavar="N",
+        type=parse_positive,
+        help="values shown by --follow. Default: the terminal width.",
+    )
+
+    p.add_argument(
+        "--fps",
+        metavar="RATE",
+        type=float,
+        default=FPS,
+        help=f"redraws per second at most with --follow. Default: {FPS:g}.",
+    )
+
+    help_format = """Input format: text (default) or binary values, read
+        from each --file or stdin by memory-mapping: f32, f64 or i32
+        (raw little-endian) or npy (a NumPy .npy file). NaN is a missing
+        value."""
+    p.add_argument(
+        "--format",
+        choices=["text", *BINARY_FORMATS, "npy"],
+        default="text",
+        help=help_format,
+    )
+
+    p.add_argument(
+        "--offset",
+        metavar="N",
+        type=int,
+        default=0,
+        help="with a binary --format, skip N values (count from the end if < 0).",
+    )
+
+    p.add_argument(
+        "--count",
+        metavar="N",
+        type=int,
+        help="with a binary --format, read at most N values.",
+    )
+
+    help_serve = """Run a render daemon on a Unix socket: it keeps the last
+        --window values (default: 80) of every key sent with --client and
+        answers with their sparkline, drawn with the other options given
+        here. Runs until interrupted."""
+    p.add_argument("--serve", action="store_true", help=help_serve)
+
+    help_client = """Send the VALUE arguments to the history of KEY on a
+        running --serve daemon and print its sparkline. Rendering options
+        are those of the daemon."""
+    p.add_argument("--client", metavar="KEY", help=help_client)
+
+    p.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="socket of --serve and --client. Default: sparklines.sock in "
+        "$XDG_RUNTIME_DIR, else sparklines-UID.sock in $TMPDIR or /tmp.",
+    )
+
+    help_state = """Keep the history in FILE, a fixed-size binary ring
+        shared safely by concurrent runs: append the --push values, then
+        draw the last --window values. A new FILE holds --window values
+        (default: 80); a smaller one is grown."""
+    p.add_argument("--state", metavar="FILE", help=help_state)
+
+    p.add_argument(
+        "--push",
+        metavar="VALUE",
+        type=test_valid_number,
+        action="append",
+        default=[],
+        help="with --state, append this value (can be given repeatedly).",
+    )
+
+    p.add_argument(
+        "--scale",
+        choices=["window", "history"],
+        default="window",
+        help="with --state, scale to the values drawn (default) or to the "
+        "minimum and maximum of all values ever pushed.",
+    )
+
     a = args = p.parse_args(argv)
 
+    if a.client is not None:
+        _run_client(p, a)
+        return
+
+    options = {
+        "num_lines": a.num_lines,
+        "emph": a.emphasize,
+        "minimum": a.min,
+        "maximum": a.max,
+        "wrap": args.wrap,
+        "zero": a.zero,
+        "width": a.width,
+        "reducer": a.reducer,
+    }
+
+    binary = None
+    if a.format != "text":
+        binary = (a.format, a.offset, a.count)
+        if a.nums != sys.stdin:
+            p.error("VALUE arguments cannot be combined with a binary --format")
+        if a.columns or a.follow:
+            p.error("--columns and --follow read text input only")
+    elif a.offset or a.count is not None:
+        p.error("--offset and --count require a binary --format")
+
+    if a.serve:
+        _run_server(p, a, options)
+        return
+
+    if a.state:
+        _run_state(p, a, options)
+        return
+    if a.push or a.scale != "window":
+        p.error("--push and --scale require --state")
+
+    if a.follow:
+        _run_follow(p, a, options)
+        return
+
+    if a.file:
+        if a.nums != sys.stdin:
+            p.error("VALUE arguments cannot be combined with --file")
+        try:
+            _write_labelled(
+                a.file,
+                a.columns,
+                {**options, "context": RenderContext.detect()},
+                a.jobs,
+                binary,
+            )
+        except (OSError, ValueError) as e:
+            p.error(str(e))
+        return
+    if a.columns:
+        p.error("--columns requires --file")
+
+    if binary:
+        try:
+            values = load_binary(sys.stdin.buffer, *binary)
+        except ValueError as e:
+            p.error(str(e))
+        write_sparklines(sys.stdout, values, **options)
+        return
+
     numbers = args.nums
     if numbers == sys.stdin:
+        if not args.demo:
+            write_stream(sys.stdout, sys.stdin.buffer, Renderer(**options))
+            return
         numbers = numbers.read().strip().split()
     numbers = [_float_or_none(n) for n in numbers]
 
@@ -164,16 +606,7 @@ def main(argv: Optional[list[str]] = None) -> None:
         print(demo(numbers))
         sys.exit()
 
-    for line in sparklines(
-        numbers,
-        num_lines=a.num_lines,
-        emph=a.emphasize,
-        minimum=a.min,
-        maximum=a.max,
-        wrap=args.wrap,
-        zero=a.zero,
-    ):
-        print(line)
+    write_sparklines(sys.stdout, numbers, **options)
 
 
 if __name__ == "__main__":
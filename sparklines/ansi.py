@@ -1,20 +1,23 @@
 """ANSI terminal output: block characters, colour, reverse-video downward bars."""
 
+import functools
 import os
-from typing import Optional
+import re
+from collections.abc import Iterable
+from importlib.util import find_spec
+from typing import Any, Optional
 
-try:
-    import termcolor
-
-    HAVE_TERMCOLOR = True
-except ImportError:
-    HAVE_TERMCOLOR = False
+# termcolor is imported by _colored() when a coloured glyph is first needed.
+HAVE_TERMCOLOR = find_spec("termcolor") is not None
 
 blocks = " ▁▂▃▄▅▆▇█"
 # blocks[8-i]: upward char whose reverse-video produces a downward bar of height i/8.
 _COMPLEMENT = [8 - i for i in range(9)]
 # Top-fill Unicode fallback when ANSI is suppressed (NO_COLOR, TERM=dumb, …).
 _INVERTED_UNICODE = " ▔▔▔▀▀▀▀█"
+# A rendered cell: escape codes, one glyph, escape codes.
+_CELL_PAT = re.compile(r"((?:\x1b\[[\d;]*m)*)(.)((?:\x1b\[[\d;]*m)*)", re.DOTALL)
+_GAP = ("", " ", "")
 
 
 def _ansi_ok() -> bool:
@@ -28,6 +31,34 @@ def _ansi_ok() -> bool:
     return os.environ.get("TERM") != "dumb"
 
 
+def _colored(text: str, color: Optional[str], **kwargs: Any) -> str:
+    """Return termcolor.colored(text, color, **kwargs)."""
+    import termcolor
+
+    return termcolor.colored(text, color, **kwargs)
+
+
+def _inverted_glyphs(
+    color: Optional[str], ansi: bool, use_termcolor: bool
+) -> list[str]:
+    """Return the downward-bar characters for heights 0..8 in one colour."""
+    glyphs = [" "]
+    for v in range(1, 8):
+        if not ansi:
+            glyphs.append(_INVERTED_UNICODE[v])
+            continue
+        ch = blocks[_COMPLEMENT[v]]
+        if use_termcolor:
+            glyphs.append(_colored(ch, color, attrs=["reverse"], force_color=True))
+        else:
+            glyphs.append(f"\033[7m{ch}\033[27m")
+    if color and use_termcolor and ansi:
+        glyphs.append(_colored("█", color, force_color=True))
+    else:
+        glyphs.append("█")
+    return glyphs
+
+
 def _inverted_char(v: int, color: Optional[str] = None) -> str:
     """Return a character representing a downward bar of height v/8.
 
@@ -36,15 +67,153 @@ def _inverted_char(v: int, color: Optional[str] = None) -> str:
     top-fill Unicode character (▔/▀/█) when ANSI is suppressed by NO_COLOR,
     ANSI_COLORS_DISABLED, or TERM=dumb.
     """
-    if v == 0:
-        return " "
-    if v == 8:
-        if color and HAVE_TERMCOLOR and _ansi_ok():
-            return termcolor.colored("█", color, force_color=True)
-        return "█"
-    if not _ansi_ok():
-        return _INVERTED_UNICODE[v]
-    ch = blocks[_COMPLEMENT[v]]
-    if HAVE_TERMCOLOR:
-        return termcolor.colored(ch, color, attrs=["reverse"], force_color=True)
-    return f"\033[7m{ch}\033[27m"
+    return "".join(_cell_runs(color, True, _ansi_ok(), HAVE_TERMCOLOR, False)[v])
+
+
+def _termcolor_enabled() -> bool:
+    """Return True if termcolor.colored() currently emits colour codes."""
+    return HAVE_TERMCOLOR and _colored("", "white") != ""
+
+
+def _cell_glyphs(
+    color: Optional[str],
+    inverted: bool,
+    ansi: bool,
+    use_termcolor: bool,
+    colorize: bool,
+) -> tuple[str, ...]:
+    """Return the rendered cells for levels 0..8 of one colour and direction."""
+    if inverted:
+        return tuple(_inverted_glyphs(color, ansi, use_termcolor))
+    if color and colorize:
+        return tuple(_colored(b, color, force_color=True) for b in blocks)
+    return tuple(blocks)
+
+
+# Shared by all renders; 128 tables cover every termcolor colour in all modes.
+@functools.lru_cache(maxsize=128)
+def _cell_runs(
+    color: Optional[str],
+    inverted: bool,
+    ansi: bool,
+    use_termcolor: bool,
+    colorize: bool,
+) -> tuple[tuple[str, str, str], ...]:
+    """Return the cells of _cell_glyphs pre-split into (prefix, glyph, suffix)."""
+    cells = _cell_glyphs(color, inverted, ansi, use_termcolor, colorize)
+    return tuple(
+        _CELL_PAT.fullmatch(cell).groups()  # type: ignore[union-attr, misc]
+        for cell in cells
+    )
+
+
+def _join_runs(cells: Iterable[tuple[str, str, str]]) -> str:
+    """Join split cells, emitting one escape prefix/suffix per run of equal style."""
+    parts: list[str] = []
+    style = ("", "")
+    for prefix, glyph, suffix in cells:
+        if prefix != style[0] or suffix != style[1]:
+            parts.append(style[1])
+            parts.append(prefix)
+            style = (prefix, suffix)
+        parts.append(glyph)
+    parts.append(style[1])
+    return "".join(parts)
+
+
+def glyph_cache_info() -> "functools._CacheInfo":
+    """Return hits, misses, maxsize and currsize of the shared glyph cache."""
+    return _cell_runs.cache_info()
+
+
+def glyph_cache_clear() -> None:
+    """Empty the shared glyph cache and reset its counters."""
+    _cell_runs.cache_clear()
+
+
+class RenderContext:
+    """Terminal capabilities resolved once per render, plus glyph tables.
+
+    Detected once per sparklines() call by default, or built explicitly to
+    render for a terminal other than the current one. The upward (coloured)
+    and downward glyph tables come from a cache shared across renders (see
+    glyph_cache_info), so the per-cell work in _render_row is a list lookup.
+
+    With coalesce (the default), consecutive cells of the same colour and
+    attributes share one escape sequence instead of one pair per cell.
+    """
+
+    __slots__ = (
+        "_colorize",
+        "_down",
+        "_runs",
+        "_up",
+        "ansi",
+        "coalesce",
+        "termcolor",
+    )
+
+    def __init__(
+        self,
+        ansi: bool = True,
+        termcolor: bool = HAVE_TERMCOLOR,
+        coalesce: bool = True,
+    ) -> None:
+        """Create a context; termcolor=False disables emphasis colours."""
+        self.ansi = ansi
+        self.coalesce = coalesce
+        self.termcolor = termcolor and HAVE_TERMCOLOR
+        self._colorize: Optional[bool] = None
+        self._up: dict[str, tuple[str, ...]] = {}
+        self._down: dict[Optional[str], tuple[str, ...]] = {}
+        self._runs: dict[
+            tuple[Optional[str], bool], tuple[tuple[str, str, str], ...]
+        ] = {}
+
+    @property
+    def colorize(self) -> bool:
+        """Return True if upward bars are drawn in colour.
+
+        termcolor decides itself (env, TTY) whether colours are shown; it is
+        asked, and imported, only when a coloured glyph is first needed.
+        """
+        if self._colorize is None:
+            self._colorize = self.termcolor and _termcolor_enabled()
+        return self._colorize
+
+    @colorize.setter
+    def colorize(self, value: bool) -> None:
+        """Override whether upward bars are drawn in colour."""
+        self._colorize = value
+
+    @classmethod
+    def detect(cls, coalesce: bool = True) -> "RenderContext":
+        """Return a context for the current environment (see _ansi_ok)."""
+        return cls(_ansi_ok(), coalesce=coalesce)
+
+    def up_glyphs(self, color: str) -> tuple[str, ...]:
+        """Return the upward bar characters for levels 0..8 in one colour."""
+        glyphs = self._up.get(color)
+        if glyphs is None:
+            glyphs = self._up[color] = tuple(map("".join, self.runs(color, False)))
+        return glyphs
+
+    def down_glyphs(self, color: Optional[str] = None) -> tuple[str, ...]:
+        """Return the downward bar characters for heights 0..8 in one colour."""
+        glyphs = self._down.get(color)
+        if glyphs is None:
+            glyphs = self._down[color] = tuple(map("".join, self.runs(color, True)))
+        return glyphs
+
+    def runs(
+        self, color: Optional[str], inverted: bool
+    ) -> tuple[tuple[str, str, str], ...]:
+        """Return the up or down cells for levels 0..8 as (prefix, glyph, suffix)."""
+        key = (color, inverted)
+        cells = self._runs.get(key)
+        if cells is None:
+            colorize = self.colorize and not inverted
+            cells = self._runs[key] = _cell_runs(
+                color, inverted, self.ansi, self.termcolor, colorize
+            )
+        return cells
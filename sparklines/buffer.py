@@ -0,0 +1,176 @@
+"""Fixed-capacity sample buffer with incremental rendering for live monitors."""
+
+import math
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from typing import Literal, Optional
+
+from sparklines.ansi import RenderContext
+from sparklines.render import _render_row
+from sparklines.rows import NumLines, _resolve_nl, _validate_num_lines
+from sparklines.scale import scale_values
+from sparklines.sparklines import sparklines
+
+
+class SparklineBuffer:
+    """Sliding window of the last `capacity` samples, rendered as a sparkline.
+
+    Samples are kept in a float64 ring (None is stored as NaN). The window
+    minimum and maximum are maintained with monotonic deques, so push() is
+    amortized O(1). render() returns the same lines as calling sparklines()
+    on values(), but only scales the newly pushed samples as long as the scale
+    is unchanged since the previous render, and for upward bars shifts the
+    previous lines instead of rendering every cell again. Mixed
+    positive/negative windows are always rendered in full.
+
+    Example:
+        buf = SparklineBuffer(60, minimum=0, maximum=100)
+        buf.push(cpu_percent)
+        line = buf.render()[0]
+
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        num_lines: NumLines = 1,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        zero: Literal["up", "none"] = "up",
+    ) -> None:
+        """Create an empty buffer holding at most capacity samples."""
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        _validate_num_lines(num_lines)
+        self.capacity = capacity
+        self.num_lines = num_lines
+        self.minimum = minimum
+        self.maximum = maximum
+        self.zero = zero
+        self._data = array("d", bytes(8 * capacity))
+        self._count = 0
+        # (sequence number, value) pairs, values monotonic from the left.
+        self._minq: deque[tuple[int, float]] = deque()
+        self._maxq: deque[tuple[int, float]] = deque()
+        # Cached scaled levels and lines, and the scale and sample count they use.
+        self._levels: deque[Optional[int]] = deque(maxlen=capacity)
+        self._lines: list[str] = []
+        self._key: Optional[tuple[float, float, int, bool]] = None
+        self._rendered = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples currently in the window."""
+        return min(self._count, self.capacity)
+
+    def push(self, value: Optional[float]) -> None:
+        """Append one sample (None or NaN for a gap), dropping the oldest when full."""
+        if value is not None and math.isnan(value):
+            value = None
+        seq = self._count
+        self._count += 1
+        self._data[seq % self.capacity] = math.nan if value is None else value
+
+        expired = seq - self.capacity
+        for q in (self._minq, self._maxq):
+            while q and q[0][0] <= expired:
+                q.popleft()
+        if value is None:
+            return
+        while self._minq and self._minq[-1][1] >= value:
+            self._minq.pop()
+        self._minq.append((seq, value))
+        while self._maxq and self._maxq[-1][1] <= value:
+            self._maxq.pop()
+        self._maxq.append((seq, value))
+
+    def extend(self, values: Iterable[Optional[float]]) -> None:
+        """Push several samples in order."""
+        for value in values:
+            self.push(value)
+
+    def _window(self, start: int) -> list[Optional[float]]:
+        """Return samples with sequence numbers from start up to now."""
+        data, cap = self._data, self.capacity
+        return [
+            None if math.isnan(v) else v
+            for v in (data[i % cap] for i in range(start, self._count))
+        ]
+
+    def values(self) -> list[Optional[float]]:
+        """Return the samples in the window, oldest first."""
+        return self._window(self._count - len(self))
+
+    def min_max(self) -> Optional[tuple[float, float]]:
+        """Return (min, max) of the window, or None if it holds no values."""
+        if not self._minq:
+            return None
+        return self._minq[0][1], self._maxq[0][1]
+
+    def _scale(
+        self, numbers: list[Optional[float]], key: tuple[float, float, int, bool]
+    ) -> list[Optional[int]]:
+        """Scale numbers with the bounds and row count of key."""
+        lo, hi, rows, inverted = key
+        if inverted:
+            numbers = [abs(v) if v is not None else None for v in numbers]
+        return scale_values(numbers, num_lines=rows, minimum=lo, maximum=hi)
+
+    @staticmethod
+    def _lines_for(
+        levels: Iterable[Optional[int]], rows: int, inverted: bool
+    ) -> list[str]:
+        """Render scaled levels to one line per row, bottom row first."""
+        levels = list(levels)
+        context = RenderContext.detect()
+        return [
+            _render_row(
+                [min(max(v - 8 * r, 0), 8) if v is not None else None for v in levels],
+                0,
+                inverted,
+                {},
+                context,
+            )
+            for r in range(rows)
+        ]
+
+    def render(self) -> list[str]:
+        """Return the sparkline lines for the current window."""
+        bounds = self.min_max()
+        if bounds is None:
+            self._key = None
+            return [""]
+        mn, mx = bounds
+        if mn < 0 < mx:
+            self._key = None
+            return sparklines(self.values(), num_lines=self.num_lines, zero=self.zero)
+
+        inverted = mn < 0
+        rows = _resolve_nl(self.num_lines, "neg" if inverted else "pos")
+        lo = self.minimum if self.minimum is not None else (-mx if inverted else mn)
+        hi = self.maximum if self.maximum is not None else (-mn if inverted else mx)
+        key = (lo, hi, rows, inverted)
+
+        new = self._count - self._rendered
+        if key != self._key or new >= self.capacity:
+            self._levels.clear()
+            self._levels.extend(self._scale(self.values(), key))
+            self._lines = self._lines_for(self._levels, rows, inverted)
+        elif new:
+            added = self._scale(self._window(self._count - new), key)
+            self._levels.extend(added)
+            if inverted:
+                # Downward cells carry escape codes, so lines cannot be sliced.
+                self._lines = self._lines_for(self._levels, rows, inverted)
+            else:
+                width = len(self._levels)
+                self._lines = [
+                    (line + tail)[-width:]
+                    for line, tail in zip(
+                        self._lines, self._lines_for(added, rows, inverted)
+                    )
+                ]
+        self._key = key
+        self._rendered = self._count
+
+        return list(self._lines) if inverted else self._lines[::-1]
@@ -0,0 +1,60 @@
+"""Client of the render daemon (sparklines.serve): a blocking socket request.
+
+Kept apart from the daemon so that a --client call imports neither asyncio
+nor the daemon; see sparklines.serve for the protocol.
+"""
+
+import os
+import socket
+from collections.abc import Iterable
+from typing import IO, Optional
+
+
+def default_socket() -> str:
+    """Return the socket path used unless one is given.
+
+    This is sparklines.sock in $XDG_RUNTIME_DIR if set, else
+    sparklines-UID.sock in $TMPDIR (or /tmp).
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "sparklines.sock")
+    tmp = os.environ.get("TMPDIR", "/tmp")
+    return os.path.join(tmp, f"sparklines-{os.getuid()}.sock")
+
+
+def _read_reply(f: IO[bytes]) -> list[str]:
+    """Read one response from f and return its lines."""
+    head = f.readline().decode().rstrip("\n")
+    if head.startswith("-"):
+        raise ValueError(head[1:])
+    if not head.startswith("+"):
+        raise ConnectionError("connection closed by the server")
+    return [f.readline().decode().rstrip("\n") for _ in range(int(head[1:]))]
+
+
+def request(
+    key: str,
+    values: Iterable[Optional[float]] = (),
+    path: Optional[str] = None,
+    timeout: Optional[float] = 5.0,
+) -> list[str]:
+    """Push values to key on a running server; return the sparkline lines.
+
+    Missing values (None) are sent as null. A ValueError carries the message
+    of a request the server rejected. A socket owned by another user is
+    refused with PermissionError, as anyone can create the default path
+    in /tmp.
+    """
+    if not key or len(key.split()) != 1:
+        raise ValueError(f"key must be one word without whitespace, got {key!r}")
+    tokens = [key, *("null" if v is None else repr(float(v)) for v in values)]
+    path = path or default_socket()
+    if os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path}: a socket of another user")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(" ".join(tokens).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return _read_reply(f)
@@ -0,0 +1,284 @@
+"""Zero-copy input: buffer-protocol objects and Arrow arrays as sequences."""
+
+import mmap
+import os
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import IO, Any, Optional, Union, overload
+
+# memoryview formats of the numeric types we read directly.
+_FORMATS = frozenset("bBhHiIlLqQfd")
+_ARROW_FORMATS: dict[str, Any] = {
+    "double": "d",
+    "float": "f",
+    "int8": "b",
+    "int16": "h",
+    "int32": "i",
+    "int64": "q",
+    "uint8": "B",
+    "uint16": "H",
+    "uint32": "I",
+    "uint64": "Q",
+}
+
+# Raw binary formats of load_binary(): little-endian values, no header.
+BINARY_FORMATS: dict[str, Any] = {"f32": "f", "f64": "d", "i32": "i"}
+_NPY_MAGIC = b"\x93NUMPY"
+_NPY_TYPES: dict[str, Any] = {
+    "f4": "f",
+    "f8": "d",
+    "i1": "b",
+    "i2": "h",
+    "i4": "i",
+    "i8": "q",
+    "u1": "B",
+    "u2": "H",
+    "u4": "I",
+    "u8": "Q",
+}
+
+
+class _Bitmap(Sequence[bool]):
+    """Arrow-style validity bitmap (least significant bit first) as bools."""
+
+    __slots__ = ("bits", "positions")
+
+    def __init__(self, bits: memoryview, positions: range) -> None:
+        """Wrap the bitmap bytes and the bit positions that are visible."""
+        self.bits = bits
+        self.positions = positions
+
+    def __len__(self) -> int:
+        """Return the number of visible bits."""
+        return len(self.positions)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle only the bytes holding the visible bits."""
+        pos = self.positions
+        lo, hi = (min(pos[0], pos[-1]), max(pos[0], pos[-1]) + 1) if pos else (0, 0)
+        first = lo & ~7
+        bits = bytes(self.bits[first >> 3 : (hi + 7) >> 3])
+        positions = range(pos.start - first, pos.stop - first, pos.step)
+        return _Bitmap._from_bytes, (bits, positions)
+
+    @staticmethod
+    def _from_bytes(bits: bytes, positions: range) -> "_Bitmap":
+        """Rebuild a pickled bitmap."""
+        return _Bitmap(memoryview(bits), positions)
+
+    @overload
+    def __getitem__(self, i: int) -> bool: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "_Bitmap": ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[bool, "_Bitmap"]:
+        """Return bit i, or a bitmap over a slice of the positions."""
+        if isinstance(i, slice):
+            return _Bitmap(self.bits, self.positions[i])
+        pos = self.positions[i]
+        return bool(self.bits[pos >> 3] >> (pos & 7) & 1)
+
+
+class ColumnView(Sequence[Optional[float]]):
+    """Read-only numeric buffer seen as a sequence of floats with None gaps.
+
+    Wraps a 1-D memoryview without copying it. A value is missing (read as
+    None) if it is NaN or if valid, when given, is false at its position.
+    Slicing returns another view. The NumPy engine reads data and valid
+    directly, so such input is never converted to a Python list.
+    """
+
+    __slots__ = ("data", "valid")
+
+    def __init__(self, data: memoryview, valid: Optional[Sequence[Any]] = None) -> None:
+        """Wrap a 1-D numeric memoryview and an optional validity mask."""
+        if valid is not None and len(valid) != len(data):
+            raise ValueError(f"valid has {len(valid)} entries for {len(data)} values")
+        self.data = data
+        self.valid = valid
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return len(self.data)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle a copy of the values, e.g. to send a chunk to a worker process."""
+        return ColumnView._from_array, (
+            array(self.data.format, self.data.tobytes()),
+            self.valid,
+        )
+
+    @staticmethod
+    def _from_array(
+        values: "array[Any]", valid: Optional[Sequence[Any]]
+    ) -> "ColumnView":
+        """Rebuild a pickled view."""
+        return ColumnView(memoryview(values), valid)
+
+    @overload
+    def __getitem__(self, i: int) -> Optional[float]: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "ColumnView": ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Optional[float], "ColumnView"]:
+        """Return value i (None if missing), or a view of a slice."""
+        if isinstance(i, slice):
+            valid = self.valid[i] if self.valid is not None else None
+            return ColumnView(self.data[i], valid)
+        v = self.data[i]
+        if v != v or (self.valid is not None and not self.valid[i]):
+            return None
+        return v
+
+    def __iter__(self) -> Iterator[Optional[float]]:
+        """Iterate over the values, yielding None for missing ones."""
+        if self.valid is None:
+            for v in self.data:
+                yield None if v != v else v
+        else:
+            for v, ok in zip(self.data, self.valid):
+                yield v if ok and v == v else None
+
+
+def _memoryview(numbers: Any) -> Optional[memoryview]:
+    """Return a 1-D numeric memoryview of numbers, or None if it has none."""
+    if isinstance(numbers, (str, list, tuple)):
+        return None
+    try:
+        data = memoryview(numbers)
+    except TypeError:
+        return None
+    fmt: Any = data.format.lstrip("@")
+    if fmt not in _FORMATS:
+        return None
+    if data.ndim != 1:
+        if not data.c_contiguous:
+            raise ValueError("multi-dimensional buffers must be C-contiguous")
+        data = data.cast("B").cast(fmt)
+    return data
+
+
+def _arrow_view(array: Any) -> ColumnView:
+    """Return a view of a primitive Arrow array's data and validity buffers."""
+    fmt = _ARROW_FORMATS.get(str(array.type))
+    if fmt is None:
+        raise TypeError(f"unsupported Arrow type {array.type}")
+    validity, data = array.buffers()[:2]
+    size = memoryview(data).cast("B").cast(fmt).itemsize
+    start, stop = array.offset, array.offset + len(array)
+    values = memoryview(data).cast("B")[start * size : stop * size].cast(fmt)
+    valid = None
+    if validity is not None and array.null_count:
+        valid = _Bitmap(memoryview(validity).cast("B"), range(start, stop))
+    return ColumnView(values, valid)
+
+
+def _as_column(
+    numbers: Sequence[Optional[float]], valid: Optional[Sequence[Any]] = None
+) -> Sequence[Optional[float]]:
+    """Wrap buffer-protocol and Arrow input in a ColumnView, without copying.
+
+    Lists, tuples and other sequences are returned unchanged, or with values
+    blanked out where valid is false. A valid mask replaces the validity
+    bitmap of an Arrow array.
+    """
+    if isinstance(numbers, ColumnView):
+        return numbers if valid is None else ColumnView(numbers.data, valid)
+    if hasattr(numbers, "buffers") and hasattr(numbers, "offset"):
+        view = _arrow_view(numbers)
+        return view if valid is None else ColumnView(view.data, valid)
+    if valid is None and type(numbers).__module__ == "numpy":
+        # ndarrays already take the vectorized path as they are.
+        return numbers
+    data = _memoryview(numbers)
+    if data is None:
+        if valid is None:
+            return numbers
+        if len(valid) != len(numbers):
+            raise ValueError(
+                f"valid has {len(valid)} entries for {len(numbers)} values"
+            )
+        return [v if ok else None for v, ok in zip(numbers, valid)]
+    return ColumnView(data, valid)
+
+
+def load_binary(
+    file: Union[str, "os.PathLike[str]", IO[bytes]],
+    format: str = "f64",
+    offset: int = 0,
+    count: Optional[int] = None,
+) -> ColumnView:
+    """Memory-map a file of binary numbers and return a view of its values.
+
+    format is one of f32, f64 or i32 (raw little-endian values, as written
+    by collectors) or npy (a NumPy .npy file of a numeric dtype, read
+    flattened in C order). NaN values are missing, like None.
+
+    offset and count select values offset..offset+count-1 (or to the end);
+    only the pages holding them are read from disk when they are accessed.
+    A trailing partial value in a raw file is ignored. file may be a path
+    or a binary file object; one that cannot be mapped (a pipe) is read in.
+    The view copies the values only if their byte order is not the host's.
+
+    Example:
+        sparklines(load_binary("cpu.f32", "f32", offset=-3600), width=80)
+
+    """
+    if format != "npy" and format not in BINARY_FORMATS:
+        formats = ", ".join([*BINARY_FORMATS, "npy"])
+        raise ValueError(f"format must be one of {formats}; got {format!r}")
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            buf = _map(f)
+    else:
+        buf = _map(file)
+    if format == "npy":
+        start, fmt, little = _npy_header(buf)
+    else:
+        start, fmt, little = 0, BINARY_FORMATS[format], True
+    size = array(fmt).itemsize
+    n = (len(buf) - start) // size
+    if offset < 0:
+        offset = max(n + offset, 0)
+    stop = n if count is None else min(offset + max(count, 0), n)
+    offset = min(offset, stop)
+    data = buf[start + offset * size : start + stop * size]
+    if little != (sys.byteorder == "little"):
+        values = array(fmt)
+        values.frombytes(data)
+        values.byteswap()
+        return ColumnView(memoryview(values))
+    return ColumnView(data.cast(fmt))
+
+
+def _map(f: IO[bytes]) -> memoryview:
+    """Return the bytes of a binary file, memory-mapped if it can be."""
+    try:
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError):
+        # Empty files, pipes and file objects without a descriptor.
+        return memoryview(f.read())
+
+
+def _npy_header(buf: memoryview) -> tuple[int, Any, bool]:
+    """Return the data offset, memoryview format and little-endianness of .npy."""
+    import ast
+
+    if bytes(buf[:6]) != _NPY_MAGIC:
+        raise ValueError("not a .npy file")
+    if buf[6] == 1:
+        length, start = int.from_bytes(buf[8:10], "little"), 10
+    else:
+        length, start = int.from_bytes(buf[8:12], "little"), 12
+    header = ast.literal_eval(bytes(buf[start : start + length]).decode("latin1"))
+    descr, shape = header["descr"], header["shape"]
+    fmt = _NPY_TYPES.get(descr[1:]) if isinstance(descr, str) else None
+    if fmt is None:
+        raise ValueError(f"unsupported .npy dtype {descr!r}")
+    if header["fortran_order"] and len(shape) > 1:
+        raise ValueError(".npy arrays in Fortran order are not supported")
+    little = descr[0] == "<" or (descr[0] in "|=" and sys.byteorder == "little")
+    return start + length, fmt, little
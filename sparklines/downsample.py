@@ -0,0 +1,195 @@
+"""Width-targeted downsampling: aggregate a long series into a fixed width."""
+
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from typing import Literal, Optional
+
+from sparklines.vector import _reduce_buckets, _use_numpy
+
+Reducer = Literal["max", "min", "mean", "last", "minmax", "lttb"]
+REDUCERS: tuple[Reducer, ...] = ("max", "min", "mean", "last", "minmax", "lttb")
+
+
+def _bucket_bounds(n: int, width: int) -> Iterator[tuple[int, int]]:
+    """Yield (start, stop) of width contiguous, near-equal buckets over n items."""
+    for i in range(width):
+        yield i * n // width, (i + 1) * n // width
+
+
+def _valid(
+    numbers: Sequence[Optional[float]], start: int, stop: int
+) -> Iterator[tuple[int, float]]:
+    """Yield (index, value) of non-missing values in numbers[start:stop].
+
+    None and NaN are missing; indexing avoids copying the slice.
+    """
+    for i in range(start, stop):
+        v = numbers[i]
+        if v is not None and v == v:
+            yield i, v
+
+
+def _bucketed(
+    numbers: Iterable[Optional[float]], n: int, width: int, reducer: Reducer
+) -> list[Optional[float]]:
+    """Reduce each bucket of the n numbers to one value in one pass.
+
+    State is O(1) per bucket, and numbers is only iterated over, once.
+    """
+    it = iter(numbers)
+    result: list[Optional[float]] = []
+    for start, stop in _bucket_bounds(n, width):
+        valid = (v for v in islice(it, stop - start) if v is not None and v == v)
+        if reducer == "max":
+            result.append(max(valid, default=None))
+        elif reducer == "min":
+            result.append(min(valid, default=None))
+        elif reducer == "last":
+            last = None
+            for last in valid:  # noqa: B007
+                pass
+            result.append(last)
+        else:
+            total, count = 0.0, 0
+            for v in valid:
+                total += v
+                count += 1
+            result.append(total / count if count else None)
+    return result
+
+
+def _envelope(
+    numbers: Iterable[Optional[float]], n: int, buckets: int
+) -> list[Optional[float]]:
+    """Return the min and max of each bucket of the n numbers, in time order."""
+    it = enumerate(numbers)
+    result: list[Optional[float]] = []
+    for start, stop in _bucket_bounds(n, buckets):
+        lo = hi = None
+        lo_i = hi_i = 0
+        for i, v in islice(it, stop - start):
+            if v is None or v != v:
+                continue
+            if lo is None or v < lo:
+                lo, lo_i = v, i
+            if hi is None or v > hi:
+                hi, hi_i = v, i
+        result.extend((lo, hi) if lo_i <= hi_i else (hi, lo))
+    return result
+
+
+def _lttb(numbers: Sequence[Optional[float]], width: int) -> list[Optional[float]]:
+    """Largest-Triangle-Three-Buckets: keep the most visually significant points.
+
+    The first and last points are kept; each of the width - 2 buckets in
+    between contributes the point forming the largest triangle with the
+    previously kept point and the average of the next bucket (with values).
+    A first pass computes the bucket averages, so memory stays O(width) and
+    time O(n + width).
+    """
+    n = len(numbers)
+    inner = width - 2
+    bounds = [
+        (1 + i * (n - 2) // inner, 1 + (i + 1) * (n - 2) // inner) for i in range(inner)
+    ]
+
+    averages: list[Optional[tuple[float, float]]] = []
+    for start, stop in bounds:
+        sx = sy = 0.0
+        count = 0
+        for i, v in _valid(numbers, start, stop):
+            sx += i
+            sy += v
+            count += 1
+        averages.append((sx / count, sy / count) if count else None)
+    last = numbers[n - 1]
+    if last is not None and last == last:
+        averages.append((n - 1.0, last))
+    else:
+        averages.append(None)
+
+    # The first average after each bucket that is not None, in one reverse pass.
+    following: list[Optional[tuple[float, float]]] = [None] * inner
+    nxt = averages[inner]
+    for b in range(inner - 1, -1, -1):
+        following[b] = nxt
+        nxt = averages[b] or nxt
+
+    first = numbers[0]
+    anchor: Optional[tuple[float, float]] = None
+    result: list[Optional[float]] = [None]
+    if first is not None and first == first:
+        anchor = (0.0, first)
+        result[0] = first
+    for b, (start, stop) in enumerate(bounds):
+        nxt = following[b]
+        best: Optional[float] = None
+        best_x = 0.0
+        best_area = -1.0
+        for i, v in _valid(numbers, start, stop):
+            x = float(i)
+            if anchor is None or nxt is None:
+                area = 0.0
+            else:
+                ax, ay = anchor
+                cx, cy = nxt
+                area = abs((ax - cx) * (v - ay) - (ax - x) * (cy - ay))
+            if area > best_area:
+                best, best_x, best_area = v, x, area
+        result.append(best)
+        if best is not None:
+            anchor = (best_x, best)
+    result.append(last if last is not None and last == last else None)
+    return result
+
+
+def downsample(
+    numbers: Sequence[Optional[float]], width: int, reducer: Reducer = "max"
+) -> list[Optional[float]]:
+    """Aggregate numbers into at most width values for a width-wide sparkline.
+
+    The series is split into width contiguous buckets of near-equal size and
+    each bucket is reduced to its max, min, mean or last value. "minmax"
+    keeps each bucket's minimum and maximum in time order (width // 2 buckets),
+    which preserves both sides of mixed positive/negative data; "lttb" keeps
+    the visually most significant points (Largest-Triangle-Three-Buckets).
+    Widths too small for either (1 for "minmax", under 3 for "lttb") use "mean".
+    None and NaN are missing values; a bucket without values becomes None.
+    Series no longer than width are returned as they are, with NaN as None.
+    """
+    if width < 1:
+        raise ValueError(f"width must be >= 1, got {width}")
+    if reducer not in REDUCERS:
+        raise ValueError(
+            f"reducer must be one of {', '.join(REDUCERS)}; got {reducer!r}"
+        )
+    n = len(numbers)
+    reducer = _fallback(reducer, width)
+    if n > width and reducer == "lttb":
+        return _lttb(numbers, width)
+    if n > width and reducer != "minmax" and _use_numpy(numbers):
+        return _reduce_buckets(numbers, width, reducer)
+    return _reduce(numbers, n, width, reducer)
+
+
+def _fallback(reducer: Reducer, width: int) -> Reducer:
+    """Return "mean" for a width too small for reducer, else reducer."""
+    if (reducer == "minmax" and width < 2) or (reducer == "lttb" and width < 3):
+        return "mean"
+    return reducer
+
+
+def _reduce(
+    numbers: Iterable[Optional[float]], n: int, width: int, reducer: Reducer
+) -> list[Optional[float]]:
+    """Return downsample() of the n numbers, iterating over them once.
+
+    For series read from a stream, whose length was counted beforehand;
+    reducer is any but "lttb", which needs the points around each bucket.
+    """
+    if n <= width:
+        return [None if v is None or v != v else v for v in numbers]
+    reducer = _fallback(reducer, width)
+    if reducer == "minmax":
+        return _envelope(numbers, n, width // 2)
+    return _bucketed(numbers, n, width, reducer)
@@ -1,48 +1,174 @@
 """Colour emphasis evaluation: value-based and index-slice expressions."""
 
+import operator
 import re
+from array import array
 from collections.abc import Sequence
-from typing import Optional
+from typing import Any, Callable, NamedTuple, Optional, Union
 
+from sparklines.vector import _as_masked_array, _emphasis_indices, _use_numpy
 
-def _check_emphasis(
-    numbers: Sequence[Optional[float]], emph: list[str]
-) -> dict[int, str]:
-    """Find index positions in list of numbers to be emphasized according to emph."""
-    val_pat = r"(\w+)\:(eq|gt|ge|lt|le)\:(.+)"
-    idx_pat = r"(\w+)\:\[([^\]]*)\]"
-    emphasized: dict[int, str] = {}
+# Compiled by compile_emphasis() on first use (re caches them afterwards).
+_VAL_PAT = r"(\w+)\:(eq|gt|ge|lt|le)\:(.+)"
+_IDX_PAT = r"(\w+)\:\[([^\]]*)\]"
+_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
+
+
+class EmphasisRule(NamedTuple):
+    """One parsed emphasis rule: a value comparison or an index slice."""
+
+    color: int
+    op: Optional[Callable[[Any, Any], Any]] = None
+    value: float = 0.0
+    span: Optional[slice] = None
+
+
+class EmphasisMap:
+    """Per-point colour lookup backed by a compact colour-index array.
+
+    Index 0 means "not emphasized"; index k > 0 selects palette[k]. Supports the
+    dict-style get() used by the row renderer and is falsy when no point is
+    emphasized, like an empty dict.
+    """
+
+    __slots__ = ("_any", "indices", "palette")
+
+    def __init__(self, palette: tuple[str, ...], indices: "array[int]") -> None:
+        """Wrap a palette (unused entry at index 0) and a colour-index array."""
+        self.palette = palette
+        self.indices = indices
+        self._any = any(indices)
+
+    def __bool__(self) -> bool:
+        """Return True if any point is emphasized."""
+        return self._any
+
+    def get(self, i: int, default: Optional[str] = None) -> Optional[str]:
+        """Return the colour at index i, or default if it is not emphasized."""
+        k = self.indices[i] if 0 <= i < len(self.indices) else 0
+        return self.palette[k] if k else default
+
+    def sliced(self, start: int, stop: int) -> "EmphasisMap":
+        """Return the map of points start..stop-1, re-indexed from 0.
+
+        The slice is truthy if this map is, so that a piece of a series is
+        drawn in the same (coloured or plain) mode as the whole.
+        """
+        part = EmphasisMap(self.palette, self.indices[start:stop])
+        part._any = self._any
+        return part
+
+    def to_dict(self) -> dict[int, str]:
+        """Return the emphasized points as an index-to-colour dict."""
+        palette = self.palette
+        return {i: palette[k] for i, k in enumerate(self.indices) if k}
+
+
+class CompiledEmphasis:
+    """Emphasis rule strings parsed once, for reuse across many renders."""
+
+    __slots__ = ("palette", "rules")
+
+    def __init__(self, palette: tuple[str, ...], rules: list[EmphasisRule]) -> None:
+        """Store a palette (unused entry at index 0) and the rules in order."""
+        self.palette = palette
+        self.rules = rules
+
+    def __len__(self) -> int:
+        """Return the number of rules."""
+        return len(self.rules)
+
+    def evaluate(self, numbers: Sequence[Optional[float]]) -> EmphasisMap:
+        """Return the colour of every point in numbers; later rules win."""
+        if _use_numpy(numbers):
+            values, mask = _as_masked_array(numbers)
+            return self.evaluate_array(values, mask)
+
+        n = len(numbers)
+        checks: list[tuple[int, Any, Any]] = []
+        for rule in reversed(self.rules):
+            if rule.span is not None:
+                checks.append((rule.color, None, range(*rule.span.indices(n))))
+            else:
+                checks.append((rule.color, rule.op, rule.value))
+
+        indices = array("B", bytes(n))
+        for i, v in enumerate(numbers):
+            if v is None:
+                continue
+            for color, op, arg in checks:
+                if (i in arg) if op is None else op(v, arg):
+                    indices[i] = color
+                    break
+        return EmphasisMap(self.palette, indices)
+
+    def evaluate_array(self, values: Any, mask: Any) -> EmphasisMap:
+        """Vectorized evaluate() for a NumPy value array and missing mask."""
+        indices = array("B", _emphasis_indices(values, mask, self.rules))
+        return EmphasisMap(self.palette, indices)
+
+
+Emph = Union[Sequence[str], CompiledEmphasis]
+Emphasized = Union[dict[int, str], EmphasisMap]
+
+
+def compile_emphasis(emph: Emph) -> CompiledEmphasis:
+    """Parse emphasis strings like "green:gt:5.0" or "red:[0:3]" once.
+
+    Malformed strings are ignored, as they are by sparklines(). An already
+    compiled value is returned unchanged.
+    """
+    if isinstance(emph, CompiledEmphasis):
+        return emph
 
     def _int_or_none(s: Optional[str]) -> Optional[int]:
         return int(s) if s else None
 
+    idx_pat, val_pat = re.compile(_IDX_PAT), re.compile(_VAL_PAT)
+    palette = [""]
+    rules: list[EmphasisRule] = []
     for em in emph:
-        idx_match = re.fullmatch(idx_pat, em)
-        if idx_match:
-            color, slice_str = idx_match.groups()
-            parts = (slice_str.split(":") + [None, None, None])[:3]
+        match = idx_pat.fullmatch(em) or val_pat.fullmatch(em)
+        if match is None:
+            continue
+        color = match.group(1)
+        if color not in palette:
+            palette.append(color)
+        k = palette.index(color)
+        if match.re is idx_pat:
+            parts = (match.group(2).split(":") + [None, None, None])[:3]
             sl = slice(
                 _int_or_none(parts[0]), _int_or_none(parts[1]), _int_or_none(parts[2])
             )
-            for i in range(*sl.indices(len(numbers))):
-                if numbers[i] is not None:
-                    emphasized[i] = color
-            continue
-        for i, n in enumerate(numbers):
-            if n is None:
-                continue
-            match = re.fullmatch(val_pat, em)
-            if match is None:
-                continue
-            color, op, value_str = match.groups()
-            v = float(value_str)
-            ops = {
-                "eq": n == v,
-                "gt": n > v,
-                "ge": n >= v,
-                "lt": n < v,
-                "le": n <= v,
-            }
-            if ops.get(op):
-                emphasized[i] = color
-    return emphasized
+            rules.append(EmphasisRule(k, span=sl))
+        else:
+            _, op, value_str = match.groups()
+            rules.append(EmphasisRule(k, _OPS[op], float(value_str)))
+    return CompiledEmphasis(tuple(palette), rules)
+
+
+def _emphasis_map(
+    numbers: Sequence[Optional[float]], emph: Optional[Emph]
+) -> Emphasized:
+    """Evaluate emph (strings or compiled) for numbers; {} if there is none."""
+    if not emph:
+        return {}
+    return compile_emphasis(emph).evaluate(numbers)
+
+
+def _check_emphasis(numbers: Sequence[Optional[float]], emph: Emph) -> dict[int, str]:
+    """Find index positions in list of numbers to be emphasized according to emph."""
+    return compile_emphasis(emph).evaluate(numbers).to_dict()
+
+
+def _emphasis_slice(emphasized: Emphasized, start: int, stop: int) -> Emphasized:
+    """Return the part of an emphasis map for points start..stop-1, from 0."""
+    if isinstance(emphasized, EmphasisMap):
+        return emphasized.sliced(start, stop)
+    return {i - start: c for i, c in emphasized.items() if start <= i < stop}
@@ -0,0 +1,189 @@
+"""Follow mode: redraw a sliding window of a live stream in place.
+
+follow() draws a byte stream (stdin) to a terminal; sparkline_stream() yields
+the frames of an async iterable of values, for asyncio applications.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterable
+from typing import IO, Any, Optional
+
+from sparklines.ansi import RenderContext
+from sparklines.renderer import Renderer
+from sparklines.stream import _parse
+
+# Redraws per second, at most, unless given.
+MAX_FPS = 10.0
+
+
+def _read_lines(
+    source: IO[bytes],
+    values: "deque[Optional[float]]",
+    lock: threading.Lock,
+    changed: threading.Event,
+    finished: threading.Event,
+) -> None:
+    """Append the values of every line of source to values (a reader thread).
+
+    finished is set at the end of source, before changed is set a last time.
+    """
+    try:
+        for line in source:
+            parsed = [_parse(token) for token in line.split()]
+            if parsed:
+                with lock:
+                    values.extend(parsed)
+                changed.set()
+    finally:
+        finished.set()
+        changed.set()
+
+
+def _frame(lines: list[str], height: int, ansi: bool, width: int) -> str:
+    """Return the text that replaces the previous frame of height lines.
+
+    With ANSI, the cursor is moved back to the start of the previous frame,
+    which is cleared. Without, a one-line frame is rewritten after a carriage
+    return (padded to cover the previous width) and taller frames are simply
+    written below the previous ones.
+    """
+    if not height:
+        return "\n".join(lines)
+    if ansi:
+        up = f"\x1b[{height - 1}A" if height > 1 else ""
+        return f"\r{up}\x1b[J" + "\n".join(lines)
+    if height == 1 and len(lines) == 1:
+        return "\r" + lines[0].ljust(width)
+    return "\n\n" + "\n".join(lines)
+
+
+def follow(
+    source: IO[bytes],
+    out: IO[str],
+    renderer: Renderer,
+    window: int,
+    max_fps: float = MAX_FPS,
+) -> int:
+    """Draw the last window values read from source, redrawn as lines arrive.
+
+    Lines are read by a background thread. The sparkline is redrawn in
+    place at most max_fps times per second; values arriving in the meantime
+    are drawn together in the next frame. Each frame renders the whole
+    window, with all of renderer's options; max_fps bounds that work. Returns
+    at the end of source, the last frame left on screen, with the number of
+    frames drawn.
+    """
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    if max_fps <= 0:
+        raise ValueError(f"max_fps must be > 0, got {max_fps}")
+    values: deque[Optional[float]] = deque(maxlen=window)
+    lock = threading.Lock()
+    changed = threading.Event()
+    finished = threading.Event()
+    reader = threading.Thread(
+        target=_read_lines,
+        args=(source, values, lock, changed, finished),
+        daemon=True,
+    )
+    reader.start()
+
+    context = renderer.context or RenderContext.detect()
+    interval = 1.0 / max_fps
+    height = width = frames = 0
+    next_frame = time.monotonic()
+    while True:
+        changed.wait()
+        done = finished.is_set()
+        delay = next_frame - time.monotonic()
+        if delay > 0 and not done:
+            # Let a burst of lines accumulate until the frame is due.
+            time.sleep(delay)
+        changed.clear()
+        with lock:
+            snapshot = list(values)
+        lines = renderer.render(snapshot, context=context)
+        out.write(_frame(lines, height, context.ansi, width))
+        out.flush()
+        height, width = len(lines), max(map(len, lines))
+        frames += 1
+        next_frame = time.monotonic() + interval
+        # Values read before finished was set were followed by changed.set(),
+        # so if changed is clear, this frame drew the last of them.
+        if done or (finished.is_set() and not changed.is_set()):
+            break
+    out.write("\n")
+    out.flush()
+    return frames
+
+
+async def sparkline_stream(
+    values: AsyncIterable[Optional[float]],
+    window: int,
+    max_fps: float = MAX_FPS,
+    **options: Any,
+) -> AsyncGenerator[list[str], None]:
+    """Yield the sparkline lines of the last window values of an async iterable.
+
+    Values are read by a task of their own as they arrive. A frame is drawn
+    when values have arrived, at most max_fps times per second: values that
+    arrive in the meantime, or while the caller handles a frame, are drawn
+    together in the next one, so under bursts frames are dropped rather than
+    queued. options are those of Renderer, and each frame renders the whole
+    window with them (SparklineBuffer renders only the new values, for the
+    options it supports). The last values are drawn as soon as values is
+    exhausted; errors it raises are raised here.
+
+    Example:
+        async for lines in sparkline_stream(samples(), window=60, minimum=0):
+            status.update(lines[0])
+
+    """
+    import asyncio
+
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    if max_fps <= 0:
+        raise ValueError(f"max_fps must be > 0, got {max_fps}")
+    renderer = Renderer(**options)
+    context = renderer.context or RenderContext.detect()
+    history: deque[Optional[float]] = deque(maxlen=window)
+    changed = asyncio.Event()
+    received = drawn = 0
+
+    async def read() -> None:
+        nonlocal received
+        try:
+            async for v in values:
+                history.append(v)
+                received += 1
+                changed.set()
+        finally:
+            changed.set()
+
+    reader = asyncio.ensure_future(read())
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / max_fps
+    next_frame = loop.time()
+    try:
+        while True:
+            await changed.wait()
+            delay = next_frame - loop.time()
+            if delay > 0 and not reader.done():
+                # Let a burst accumulate until the frame is due (or the end).
+                await asyncio.wait({reader}, timeout=delay)
+            changed.clear()
+            done = reader.done()
+            if done:
+                reader.result()
+            if received > drawn:
+                drawn = received
+                lines = renderer.render(list(history), context=context)
+                next_frame = loop.time() + interval
+                yield lines
+            if done:
+                return
+    finally:
+        reader.cancel()
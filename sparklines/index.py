@@ -0,0 +1,181 @@
+"""Multi-resolution min/max/sum pyramid for zoomable rendering of long series."""
+
+import math
+import operator
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, BinaryIO, Literal, Optional, Union
+
+from sparklines.downsample import _bucket_bounds
+from sparklines.sparklines import sparklines
+
+IndexReducer = Literal["max", "min", "mean"]
+
+_MAGIC = b"SPKIDX1\0"
+_HEADER = struct.Struct("<8sQQ")
+_LENGTH = struct.Struct("<Q")
+
+
+def _pairs(values: "array[Any]", fn: Any, pad: Union[float, int]) -> "array[Any]":
+    """Combine neighbours (0,1), (2,3), ... of values with fn into a new array."""
+    if len(values) % 2:
+        values = values + array(values.typecode, [pad])
+    return array(values.typecode, map(fn, values[0::2], values[1::2]))
+
+
+class SeriesIndex:
+    """Min/max/sum/count pyramid (mipmap) over one series, built once.
+
+    Level 0 holds the input values, each higher level combines pairs of the
+    level below. Any [start:stop] range can then be aggregated to any width
+    by visiting O(log n) blocks per output bucket, so zooming and panning a
+    very long series costs O(width * log n) instead of O(n) per frame.
+    Missing values (None or NaN) are left out of every aggregate.
+
+    Example:
+        index = SeriesIndex(values)
+        index.save("metrics.spkidx")
+        lines = SeriesIndex.load("metrics.spkidx").render(1000, 50000, width=80)
+
+    """
+
+    def __init__(self, numbers: Optional[Sequence[Optional[float]]] = None) -> None:
+        """Build the pyramid over numbers in O(n)."""
+        mins = array("d")
+        maxs = array("d")
+        sums = array("d")
+        counts = array("q")
+        if numbers is None:
+            numbers = []
+        for v in numbers:
+            if v is None or v != v:
+                mins.append(math.inf)
+                maxs.append(-math.inf)
+                sums.append(0.0)
+                counts.append(0)
+            else:
+                mins.append(v)
+                maxs.append(v)
+                sums.append(v)
+                counts.append(1)
+        self._levels = [(mins, maxs, sums, counts)]
+        while len(mins) > 1:
+            mins = _pairs(mins, min, math.inf)
+            maxs = _pairs(maxs, max, -math.inf)
+            sums = _pairs(sums, operator.add, 0.0)
+            counts = _pairs(counts, operator.add, 0)
+            self._levels.append((mins, maxs, sums, counts))
+
+    def __len__(self) -> int:
+        """Return the number of values in the indexed series."""
+        return len(self._levels[0][0])
+
+    def _range(self, start: int, stop: int) -> tuple[float, float, float, int]:
+        """Return (min, max, sum, count) over [start, stop) from O(log n) blocks."""
+        mn, mx, total, count = math.inf, -math.inf, 0.0, 0
+        for mins, maxs, sums, counts in self._levels:
+            if start >= stop:
+                break
+            if start & 1:
+                mn = min(mn, mins[start])
+                mx = max(mx, maxs[start])
+                total += sums[start]
+                count += counts[start]
+                start += 1
+            if stop & 1:
+                stop -= 1
+                mn = min(mn, mins[stop])
+                mx = max(mx, maxs[stop])
+                total += sums[stop]
+                count += counts[stop]
+            start >>= 1
+            stop >>= 1
+        return mn, mx, total, count
+
+    def aggregate(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None,
+        width: int = 80,
+        reducer: IndexReducer = "max",
+    ) -> list[Optional[float]]:
+        """Return [start:stop] aggregated into at most width values.
+
+        Buckets are the same as downsample() uses; a bucket without values
+        becomes None. Ranges no longer than width return the raw values.
+        """
+        if width < 1:
+            raise ValueError(f"width must be >= 1, got {width}")
+        start, stop, _ = slice(start, stop).indices(len(self))
+        n = max(stop - start, 0)
+        if n <= width:
+            _, maxs, _, counts = self._levels[0]
+            return [maxs[i] if counts[i] else None for i in range(start, stop)]
+
+        result: list[Optional[float]] = []
+        for lo, hi in _bucket_bounds(n, width):
+            mn, mx, total, count = self._range(start + lo, start + hi)
+            if not count:
+                result.append(None)
+            elif reducer == "max":
+                result.append(mx)
+            elif reducer == "min":
+                result.append(mn)
+            else:
+                result.append(total / count)
+        return result
+
+    def render(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None,
+        width: int = 80,
+        reducer: IndexReducer = "max",
+        **kwargs: Any,
+    ) -> list[str]:
+        """Return sparklines() of aggregate(start, stop, width, reducer).
+
+        Extra keyword arguments (num_lines, emph, minimum, ...) are passed on.
+        """
+        return sparklines(self.aggregate(start, stop, width, reducer), **kwargs)
+
+    def save(self, path: str) -> None:
+        """Write the pyramid to path in a little-endian binary format."""
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(self), len(self._levels)))
+            for level in self._levels:
+                f.write(_LENGTH.pack(len(level[0])))
+                for arr in level:
+                    if sys.byteorder == "big":
+                        arr = array(arr.typecode, arr)
+                        arr.byteswap()
+                    arr.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "SeriesIndex":
+        """Read a pyramid written by save()."""
+        with open(path, "rb") as f:
+            magic, _, num_levels = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path!r} is not a sparklines series index")
+            levels = [_read_level(f) for _ in range(num_levels)]
+        index = cls()
+        index._levels = levels
+        return index
+
+
+def _read_level(
+    f: BinaryIO,
+) -> tuple["array[float]", "array[float]", "array[float]", "array[int]"]:
+    """Read one level's min, max, sum and count arrays."""
+    (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+    arrays: list[Any] = []
+    for typecode in "dddq":
+        arr = array(typecode)
+        arr.fromfile(f, length)
+        if sys.byteorder == "big":
+            arr.byteswap()
+        arrays.append(arr)
+    return arrays[0], arrays[1], arrays[2], arrays[3]
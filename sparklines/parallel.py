@@ -0,0 +1,189 @@
+"""Chunk-parallel rendering of one long series across cores."""
+
+import math
+import sys
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Literal, Optional
+
+from sparklines.ansi import RenderContext
+from sparklines.emphasis import (
+    Emph,
+    Emphasized,
+    _emphasis_map,
+    _emphasis_slice,
+    compile_emphasis,
+)
+from sparklines.render import _PLAIN, Style, _series_windows, _split_windows
+from sparklines.rows import NumLines
+from sparklines.scale import SeriesScan
+from sparklines.vector import _as_masked_array, _use_numpy
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# Shorter series are rendered serially; starting a pool costs more than it saves.
+PARALLEL_THRESHOLD = 1 << 16
+# Chunks handed out per worker, so that uneven chunks still balance.
+CHUNKS_PER_WORKER = 4
+
+Chunk = tuple[list[list[str]], list[tuple[Style, Style]]]
+
+
+def _free_threaded() -> bool:
+    """Return True on a free-threaded interpreter with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _executor(workers: int) -> "Executor":
+    """Return a thread pool without a GIL, a process pool otherwise.
+
+    Worker processes are started by a fork server (or spawned where there is
+    none), never forked from a process that may be running threads.
+    """
+    # Imported here: concurrent.futures and multiprocessing are slow to import.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if _free_threaded():
+        return ThreadPoolExecutor(workers)
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    ctx = multiprocessing.get_context("forkserver")
+    # Workers are forked from a server that has already imported this module.
+    ctx.set_forkserver_preload([__name__])
+    return ProcessPoolExecutor(workers, mp_context=ctx)
+
+
+def _chunk_bounds(n: int, workers: int, wrap: Optional[int]) -> list[tuple[int, int]]:
+    """Return (start, stop) of the chunks; with wrap, whole windows each."""
+    size = math.ceil(n / (workers * CHUNKS_PER_WORKER))
+    if wrap:
+        size = math.ceil(size / wrap) * wrap
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _whole_emphasis(
+    numbers: Sequence[Optional[float]], emph: Optional[Emph], inverted: bool
+) -> Emphasized:
+    """Evaluate emph once for the whole series, as the serial path would."""
+    if not emph or not inverted:
+        return _emphasis_map(numbers, emph)
+    # Negative-only series are matched on their absolute values.
+    if _use_numpy(numbers):
+        values, mask = _as_masked_array(numbers, absolute=True)
+        return compile_emphasis(emph).evaluate_array(values, mask)
+    return _emphasis_map([None if v is None else abs(v) for v in numbers], emph)
+
+
+def _render_chunk(
+    numbers: Sequence[Optional[float]],
+    split: bool,
+    num_lines: NumLines,
+    emphasized: Emphasized,
+    minimum: Optional[float],
+    maximum: Optional[float],
+    wrap: Optional[int],
+    zero: Literal["up", "none"],
+    inverted: bool,
+    context: RenderContext,
+    scan: SeriesScan,
+) -> Chunk:
+    """Render one chunk with the bounds of the whole series (in a worker).
+
+    Returns the chunk's windows and the end styles of their lines.
+    """
+    edges: list[tuple[Style, Style]] = []
+    if split:
+        windows = _split_windows(
+            numbers, num_lines, None, wrap, zero, context, scan, emphasized, edges
+        )
+    else:
+        assert isinstance(num_lines, int)
+        windows = _series_windows(
+            numbers,
+            num_lines,
+            None,
+            emphasized,
+            minimum,
+            maximum,
+            wrap,
+            inverted,
+            context,
+            scan,
+            edges,
+        )
+    return list(windows), edges
+
+
+def _stitch(chunks: list[Chunk]) -> list[str]:
+    """Join the single-window lines of consecutive chunks side by side.
+
+    Where a line's last cell and the next chunk's first cell share a style,
+    the escape suffix and prefix between them are dropped, so the joined
+    line has the same runs as one rendered in one piece.
+    """
+    (first_lines,), first_edges = chunks[0]
+    pieces = [[line] for line in first_lines]
+    ends = [last for _, last in first_edges]
+    for (lines,), edges in chunks[1:]:
+        for j, (line, (first, last)) in enumerate(zip(lines, edges)):
+            if first == ends[j] and first != _PLAIN:
+                prefix, suffix = first
+                prev = pieces[j][-1]
+                pieces[j][-1] = prev[: len(prev) - len(suffix)]
+                line = line[len(prefix) :]
+            pieces[j].append(line)
+            ends[j] = last
+    return ["".join(p) for p in pieces]
+
+
+def _parallel_windows(
+    numbers: Sequence[Optional[float]],
+    split: bool,
+    num_lines: NumLines,
+    emph: Optional[Emph],
+    minimum: Optional[float],
+    maximum: Optional[float],
+    wrap: Optional[int],
+    zero: Literal["up", "none"],
+    inverted: bool,
+    context: RenderContext,
+    scan: SeriesScan,
+    workers: int,
+) -> Iterator[list[str]]:
+    """Render numbers in chunks on workers, yielding the same windows as serially.
+
+    scan must be that of the whole series, so that every chunk is scaled
+    alike (and, for mixed data, gets the same rows). Emphasis is evaluated
+    here once, so that index rules keep their positions.
+    """
+    emphasized = _whole_emphasis(numbers, emph, inverted)
+    bounds = _chunk_bounds(len(numbers), workers, wrap)
+    # Workers convert their own chunk; the full arrays need not be sent.
+    scan = scan._replace(missing=None, values=None)
+    with _executor(workers) as pool:
+        futures = [
+            pool.submit(
+                _render_chunk,
+                numbers[start:stop],
+                split,
+                num_lines,
+                _emphasis_slice(emphasized, start, stop),
+                minimum,
+                maximum,
+                wrap,
+                zero,
+                inverted,
+                context,
+                scan,
+            )
+            for start, stop in bounds
+        ]
+        if wrap:
+            for future in futures:
+                yield from future.result()[0]
+        else:
+            yield _stitch([future.result() for future in futures])
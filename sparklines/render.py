@@ -1,46 +1,113 @@
 """Rendering pipeline: single rows, series, partition, and mixed split."""
 
-from collections.abc import Sequence
-from typing import Literal, Optional
+import functools
+from collections.abc import Iterator, Sequence
+from typing import Any, Literal, Optional
 
-from sparklines.ansi import HAVE_TERMCOLOR, _inverted_char, blocks
-from sparklines.emphasis import _check_emphasis
+from sparklines.ansi import _GAP, RenderContext, _join_runs, blocks
+from sparklines.emphasis import Emph, Emphasized, _emphasis_map, compile_emphasis
 from sparklines.rows import NumLines, resolve_mixed_rows
-from sparklines.scale import batch, list_join, scale_values
+from sparklines.scale import (
+    SeriesScan,
+    _scale,
+    _scan,
+    _windows,
+    list_join,
+    scale_values,
+)
+from sparklines.vector import (
+    _as_masked_array,
+    _join_row,
+    _row_levels,
+    _scale_array,
+    _use_numpy,
+    _with_gaps,
+)
 
-import contextlib
+_BLOCKS = tuple(blocks)
 
-with contextlib.suppress(ImportError):
-    import termcolor
+# The (prefix, suffix) escape codes around a cell; empty for plain cells.
+Style = tuple[str, str]
+_PLAIN: Style = ("", "")
+
+
+@functools.lru_cache(maxsize=64)
+def _columns(
+    glyphs: Optional[tuple[str, ...]], num_lines: int
+) -> tuple[tuple[Any, ...], ...]:
+    """Return the column of every scaled level over num_lines rows.
+
+    Entry k holds, bottom row first, the per-row levels 0..8 of level k
+    (0..8 * num_lines), or their characters from glyphs if given. The last
+    entry is the column of a missing value: None, or blanks with glyphs.
+    """
+    table: list[tuple[Any, ...]] = [
+        tuple(min(max(level - 8 * row, 0), 8) for row in range(num_lines))
+        for level in range(8 * num_lines + 1)
+    ]
+    table.append((None,) * num_lines)
+    if glyphs is not None:
+        table = [tuple(glyphs[v] if v is not None else " " for v in c) for c in table]
+    return tuple(table)
+
+
+def _transpose(
+    values: Sequence[Optional[int]],
+    glyphs: Optional[tuple[str, ...]],
+    num_lines: int,
+) -> list[tuple[Any, ...]]:
+    """Split scaled values into num_lines rows, bottom row first.
+
+    Each value costs one table lookup; zip() transposes the columns into rows.
+    """
+    table = _columns(glyphs, num_lines)
+    gap = table[-1]
+    rows = list(zip(*[table[v] if v is not None else gap for v in values]))
+    return rows or [()] * num_lines
+
+
+def _plain_glyphs(
+    inverted: bool, emphasized: Emphasized, context: RenderContext
+) -> Optional[tuple[str, ...]]:
+    """Return the per-level characters if rows need no colour or run joining."""
+    if context.termcolor and emphasized:
+        return None
+    if not inverted:
+        return _BLOCKS
+    if context.coalesce and context.ansi:
+        return None
+    return context.down_glyphs()
 
 
 def _render_row(
-    row_values: list[Optional[int]],
+    row_values: Sequence[Optional[int]],
     point_base: int,
     inverted: bool,
-    emphasized: dict[int, str],
+    emphasized: Emphasized,
+    context: Optional[RenderContext] = None,
 ) -> str:
     """Render one horizontal row of scaled bar values to a string."""
+    if context is None:
+        context = RenderContext.detect()
+    colored = context.termcolor and bool(emphasized)
+    if context.coalesce and (colored or (inverted and context.ansi)):
+        return _join_runs(
+            _cells(row_values, point_base, inverted, emphasized, context, colored)
+        )
     if inverted:
+        if not colored:
+            glyphs = context.down_glyphs()
+            return "".join(glyphs[v] if v is not None else " " for v in row_values)
+        down = context.down_glyphs
         return "".join(
-            (
-                _inverted_char(
-                    v,
-                    emphasized.get(point_base + i)
-                    if HAVE_TERMCOLOR and emphasized
-                    else None,
-                )
-                if v is not None
-                else " "
-            )
+            down(emphasized.get(point_base + i))[v] if v is not None else " "
             for i, v in enumerate(row_values)
         )
-    if HAVE_TERMCOLOR and emphasized:
+    if colored:
+        up = context.up_glyphs
         return "".join(
             (
-                termcolor.colored(
-                    blocks[int(v)], emphasized.get(point_base + i, "white")
-                )
+                up(emphasized.get(point_base + i) or "white")[int(v)]
                 if v is not None
                 else " "
             )
@@ -49,77 +116,285 @@ def _render_row(
     return "".join(blocks[int(v)] if v is not None else " " for v in row_values)
 
 
+def _cells(
+    row_values: Sequence[Optional[int]],
+    point_base: int,
+    inverted: bool,
+    emphasized: Emphasized,
+    context: RenderContext,
+    colored: bool,
+) -> Iterator[tuple[str, str, str]]:
+    """Yield the (prefix, glyph, suffix) cells of a row joined from runs."""
+    runs = context.runs
+    default = None if inverted else "white"
+    for i, v in enumerate(row_values):
+        if v is None:
+            yield _GAP
+        else:
+            color = (emphasized.get(point_base + i) or default) if colored else None
+            yield runs(color, inverted)[v]
+
+
+def _row_edges(
+    row_values: Sequence[Optional[int]],
+    point_base: int,
+    inverted: bool,
+    emphasized: Emphasized,
+    context: RenderContext,
+) -> tuple[Style, Style]:
+    """Return the (prefix, suffix) of the first and last cell of a rendered row.
+
+    Rows that _render_row does not join from runs have no escapes at their
+    ends. Used to stitch rows rendered in pieces (see parallel.py).
+    """
+    colored = context.termcolor and bool(emphasized)
+    if not row_values or not (
+        context.coalesce and (colored or (inverted and context.ansi))
+    ):
+        return _PLAIN, _PLAIN
+    last = len(row_values) - 1
+    head = next(
+        _cells(row_values[:1], point_base, inverted, emphasized, context, colored)
+    )
+    tail = next(
+        _cells(
+            row_values[last:], point_base + last, inverted, emphasized, context, colored
+        )
+    )
+    return (head[0], head[2]), (tail[0], tail[2])
+
+
+def _draw_rows(
+    rows: Sequence[Sequence[Optional[int]]],
+    point_base: int,
+    inverted: bool,
+    emphasized: Emphasized,
+    context: RenderContext,
+    edges: Optional[list[tuple[Style, Style]]],
+) -> list[str]:
+    """Render level rows with _render_row, appending their end styles to edges."""
+    if edges is not None:
+        edges.extend(
+            _row_edges(row, point_base, inverted, emphasized, context) for row in rows
+        )
+    return [_render_row(row, point_base, inverted, emphasized, context) for row in rows]
+
+
 def _render_series(
     numbers: Sequence[Optional[float]],
     num_lines: int = 1,
-    emph: Optional[list[str]] = None,
-    emphasized: Optional[dict[int, str]] = None,
+    emph: Optional[Emph] = None,
+    emphasized: Optional[Emphasized] = None,
     minimum: Optional[float] = None,
     maximum: Optional[float] = None,
     wrap: Optional[int] = None,
     inverted: bool = False,
+    context: Optional[RenderContext] = None,
 ) -> list[str]:
     """Render a sequence of scaled numbers as a list of sparkline strings."""
-    if inverted:
-        numbers = [abs(v) if v is not None and v < 0 else v for v in numbers]
-
-    values = scale_values(
-        numbers, num_lines=num_lines, minimum=minimum, maximum=maximum
+    return list_join(
+        "",
+        list(
+            _series_windows(
+                numbers,
+                num_lines,
+                emph,
+                emphasized,
+                minimum,
+                maximum,
+                wrap,
+                inverted,
+                context,
+            )
+        ),
     )
 
-    if emphasized is None:
-        emphasized = _check_emphasis(numbers, emph) if emph else {}
 
+def _series_windows(
+    numbers: Sequence[Optional[float]],
+    num_lines: int = 1,
+    emph: Optional[Emph] = None,
+    emphasized: Optional[Emphasized] = None,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+    wrap: Optional[int] = None,
+    inverted: bool = False,
+    context: Optional[RenderContext] = None,
+    scan: Optional[SeriesScan] = None,
+    edges: Optional[list[tuple[Style, Style]]] = None,
+) -> Iterator[list[str]]:
+    """Yield the lines of _render_series one wrap window at a time.
+
+    scan, if the caller already has it, saves another pass over numbers.
+    If edges is given, the end styles of every line are appended to it.
+    """
+    if context is None:
+        context = RenderContext.detect()
+    if scan is None and (minimum is None or maximum is None):
+        scan = _scan(numbers)
+    if _use_numpy(numbers):
+        yield from _series_windows_np(
+            numbers,
+            num_lines,
+            emph,
+            emphasized,
+            minimum,
+            maximum,
+            wrap,
+            inverted,
+            context,
+            scan,
+            edges,
+        )
+        return
+
+    if scan is not None:
+        if not scan.num_values:
+            raise ValueError("cannot scale a series without values")
+        # Negative-only series are scaled by absolute value, whose range is
+        # the negated range of the values.
+        lo, hi = (-scan.maximum, -scan.minimum) if inverted else scan[1:3]
+        minimum = lo if minimum is None else minimum
+        maximum = hi if maximum is None else maximum
+    assert minimum is not None and maximum is not None
+    values = _scale(numbers, num_lines, minimum, maximum, absolute=inverted)
+
+    if emphasized is None and emph:
+        # Emphasis rules compare against the (absolute) scaled-from values.
+        if inverted:
+            numbers = [abs(v) if v is not None and v < 0 else v for v in numbers]
+        emphasized = _emphasis_map(numbers, emph)
+    elif emphasized is None:
+        emphasized = {}
+
+    glyphs = _plain_glyphs(inverted, emphasized, context)
     point_index = 0
-    subgraphs = []
-    for batch_values in batch(wrap, values):
-        remaining: list[Optional[int]] = list(batch_values)
-        multi_values = []
-        for _ in range(num_lines):
-            multi_values.append(
-                [min(v, 8) if v is not None else None for v in remaining]
-            )
-            remaining = [max(0, v - 8) if v is not None else None for v in remaining]
+    for batch_values in _windows(wrap, values):
+        rows = _transpose(batch_values, glyphs, num_lines)
         if not inverted:
-            multi_values.reverse()
-        lines = [
-            _render_row(row_values, point_index, inverted, emphasized)
-            for row_values in multi_values
-        ]
-        subgraphs.append(lines)
+            rows.reverse()
+        if glyphs is not None:
+            if edges is not None:
+                edges.extend([(_PLAIN, _PLAIN)] * num_lines)
+            yield list(map("".join, rows))
+        else:
+            yield _draw_rows(rows, point_index, inverted, emphasized, context, edges)
         point_index += len(batch_values)
 
-    return list_join("", subgraphs)
+
+def _series_windows_np(
+    numbers: Sequence[Optional[float]],
+    num_lines: int,
+    emph: Optional[Emph],
+    emphasized: Optional[Emphasized],
+    minimum: Optional[float],
+    maximum: Optional[float],
+    wrap: Optional[int],
+    inverted: bool,
+    context: RenderContext,
+    scan: Optional[SeriesScan] = None,
+    edges: Optional[list[tuple[Style, Style]]] = None,
+) -> Iterator[list[str]]:
+    """Vectorized _series_windows producing identical output."""
+    if scan is not None and scan.values is not None:
+        values, mask = scan.values, scan.missing
+        if inverted:
+            values = abs(values)
+    else:
+        values, mask = _as_masked_array(numbers, absolute=inverted)
+    if scan is not None:
+        if minimum is None:
+            minimum = -scan.maximum if inverted else scan.minimum
+        if maximum is None:
+            maximum = -scan.minimum if inverted else scan.maximum
+    levels = _scale_array(values, mask, num_lines, minimum, maximum)
+
+    if emphasized is None:
+        emphasized = compile_emphasis(emph).evaluate_array(values, mask) if emph else {}
+    plain = not inverted and not (context.termcolor and emphasized)
+
+    size = wrap or len(levels)
+    for start in range(0, len(levels), size):
+        rows = _row_levels(levels[start : start + size], num_lines)
+        if not inverted:
+            rows = rows[::-1]
+        if plain:
+            if edges is not None:
+                edges.extend([(_PLAIN, _PLAIN)] * num_lines)
+            yield [_join_row(row) for row in rows]
+        else:
+            win_mask = mask[start : start + size]
+            yield _draw_rows(
+                [_with_gaps(row, win_mask) for row in rows],
+                start,
+                inverted,
+                emphasized,
+                context,
+                edges,
+            )
 
 
 def _partition_series(
     numbers: Sequence[Optional[float]],
     zero: Literal["up", "none"],
+    scan: Optional[SeriesScan] = None,
 ) -> tuple[list[Optional[float]], list[Optional[float]], float, float]:
-    """Split numbers into (pos_series, neg_series, pos_max, neg_max)."""
-    if zero == "up":
-        pos: list[Optional[float]] = [
-            v if v is not None and v >= 0 else None for v in numbers
-        ]
-    else:
-        pos = [v if v is not None and v > 0 else None for v in numbers]
-    neg: list[Optional[float]] = [
-        abs(v) if v is not None and v < 0 else None for v in numbers
-    ]
-    pos_max = max((v for v in pos if v is not None), default=0.0)
-    neg_max = max((v for v in neg if v is not None), default=0.0)
-    return pos, neg, pos_max, neg_max
+    """Split numbers into (pos_series, neg_series, pos_max, neg_max).
+
+    Both series are built in one pass; the maxima come from scan. NaN
+    (as in ndarray and ColumnView input) is missing, like None.
+    """
+    if scan is None:
+        scan = _scan(numbers)
+    strict = zero != "up"
+    pos: list[Optional[float]] = []
+    neg: list[Optional[float]] = []
+    for v in numbers:
+        if v is None or v != v or (strict and v == 0):
+            pos.append(None)
+            neg.append(None)
+        elif v < 0:
+            pos.append(None)
+            neg.append(-v)
+        else:
+            pos.append(v)
+            neg.append(None)
+    return pos, neg, scan.pos_max, scan.neg_max
 
 
 def _render_split(
     numbers: Sequence[Optional[float]],
     num_lines: NumLines,
-    emph: Optional[list[str]],
+    emph: Optional[Emph],
     wrap: Optional[int],
     zero: Literal["up", "none"],
+    context: Optional[RenderContext] = None,
 ) -> list[str]:
     """Render mixed positive/negative data as stacked up/down sparkline rows."""
-    pos, neg, pos_max, neg_max = _partition_series(numbers, zero)
+    return list_join(
+        "", list(_split_windows(numbers, num_lines, emph, wrap, zero, context))
+    )
+
+
+def _split_windows(
+    numbers: Sequence[Optional[float]],
+    num_lines: NumLines,
+    emph: Optional[Emph],
+    wrap: Optional[int],
+    zero: Literal["up", "none"],
+    context: Optional[RenderContext] = None,
+    scan: Optional[SeriesScan] = None,
+    emphasized: Optional[Emphasized] = None,
+    edges: Optional[list[tuple[Style, Style]]] = None,
+) -> Iterator[list[str]]:
+    """Yield the lines of _render_split one wrap window at a time.
+
+    Like _series_windows, takes a precomputed scan and emphasized map and
+    records line end styles in edges.
+    """
+    if context is None:
+        context = RenderContext.detect()
+    pos, neg, pos_max, neg_max = _partition_series(numbers, zero, scan)
     up_rows, down_rows = resolve_mixed_rows(num_lines, pos_max, neg_max)
 
     if isinstance(num_lines, tuple):
@@ -128,28 +403,17 @@ def _render_split(
         shared = max(pos_max, neg_max)
         pos_M = neg_M = shared
 
-    emphasized = _check_emphasis(numbers, emph) if emph else {}
+    if emphasized is None:
+        emphasized = _emphasis_map(numbers, emph)
 
     pos_scaled = scale_values(pos, num_lines=up_rows, minimum=0.0, maximum=pos_M)
     neg_scaled = scale_values(neg, num_lines=down_rows, minimum=0.0, maximum=neg_M)
 
-    def _multi(scaled: list[Optional[int]], n: int) -> list[list[Optional[int]]]:
-        remaining = list(scaled)
-        rows = []
-        for _ in range(n):
-            rows.append([min(v, 8) if v is not None else None for v in remaining])
-            remaining = [max(0, v - 8) if v is not None else None for v in remaining]
-        return rows
-
-    subgraphs = []
     point_index = 0
-    for pos_win, neg_win in zip(batch(wrap, pos_scaled), batch(wrap, neg_scaled)):
-        pos_rows = list(reversed(_multi(pos_win, up_rows)))
-        neg_rows = _multi(neg_win, down_rows)
-        lines = [
-            _render_row(row, point_index, False, emphasized) for row in pos_rows
-        ] + [_render_row(row, point_index, True, emphasized) for row in neg_rows]
-        subgraphs.append(lines)
+    for pos_win, neg_win in zip(_windows(wrap, pos_scaled), _windows(wrap, neg_scaled)):
+        pos_rows = _transpose(pos_win, None, up_rows)[::-1]
+        neg_rows = _transpose(neg_win, None, down_rows)
+        yield _draw_rows(
+            pos_rows, point_index, False, emphasized, context, edges
+        ) + _draw_rows(neg_rows, point_index, True, emphasized, context, edges)
         point_index += len(pos_win)
-
-    return list_join("", subgraphs)
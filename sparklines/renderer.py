@@ -0,0 +1,287 @@
+"""Reusable renderer: sparkline options validated and compiled once."""
+
+import io
+from collections.abc import Iterable, Iterator, Sequence
+from typing import IO, Any, Literal, Optional
+
+from sparklines.ansi import RenderContext
+from sparklines.columnar import _as_column
+from sparklines.downsample import REDUCERS, Reducer, downsample
+from sparklines.emphasis import CompiledEmphasis, Emph, compile_emphasis
+from sparklines.parallel import (
+    PARALLEL_THRESHOLD,
+    _parallel_windows,
+    _render_chunk,
+    _stitch,
+)
+from sparklines.render import _series_windows, _split_windows
+from sparklines.rows import NumLines, _resolve_nl, _validate_num_lines
+from sparklines.scale import SeriesScan, _scan, list_join
+
+
+class Renderer:
+    """Sparkline options checked and prepared once, for rendering many series.
+
+    Takes the options of sparklines() except numbers and valid. num_lines,
+    width and reducer are validated, emphasis rules are parsed and the row
+    counts of non-split renders are resolved in the constructor, so render()
+    only scans and draws. Without a context, terminal capabilities are
+    detected on each render() call, and once per render_many() call.
+
+    Example:
+        renderer = Renderer(num_lines=2, emph=["red:gt:90"], minimum=0)
+        for values in metrics.values():
+            renderer.write(sys.stdout, values)
+
+    """
+
+    __slots__ = (
+        "context",
+        "emph",
+        "maximum",
+        "minimum",
+        "num_lines",
+        "reducer",
+        "width",
+        "workers",
+        "wrap",
+        "zero",
+        "_neg_lines",
+        "_pos_lines",
+    )
+
+    def __init__(
+        self,
+        num_lines: NumLines = 1,
+        emph: Optional[Emph] = None,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        wrap: Optional[int] = None,
+        zero: Literal["up", "none"] = "up",
+        context: Optional[RenderContext] = None,
+        width: Optional[int] = None,
+        reducer: Reducer = "max",
+        workers: Optional[int] = None,
+    ) -> None:
+        """Validate and compile the options."""
+        _validate_num_lines(num_lines)
+        if width is not None and width < 1:
+            raise ValueError(f"width must be >= 1, got {width}")
+        if reducer not in REDUCERS:
+            raise ValueError(
+                f"reducer must be one of {', '.join(REDUCERS)}; got {reducer!r}"
+            )
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        self.num_lines = num_lines
+        self.emph: Optional[CompiledEmphasis] = compile_emphasis(emph) if emph else None
+        self.minimum = minimum
+        self.maximum = maximum
+        self.wrap = wrap
+        self.zero = zero
+        self.context = context
+        self.width = width
+        self.reducer = reducer
+        self.workers = workers
+        self._pos_lines = _resolve_nl(num_lines, "pos")
+        self._neg_lines = _resolve_nl(num_lines, "neg")
+
+    @property
+    def up_rows(self) -> int:
+        """Return the rows drawn for a series without negative values."""
+        return self._pos_lines
+
+    @property
+    def down_rows(self) -> int:
+        """Return the rows drawn for a series of negative values only."""
+        return self._neg_lines
+
+    def render(
+        self,
+        numbers: Optional[Sequence[Optional[float]]] = None,
+        valid: Optional[Sequence[Any]] = None,
+        context: Optional[RenderContext] = None,
+    ) -> list[str]:
+        """Return the sparkline lines of numbers, like sparklines().
+
+        context, if given, is used instead of the renderer's, e.g. by callers
+        that draw many frames and detect the terminal once.
+        """
+        windows = self._windows(numbers, valid, context or self.context)
+        return list_join("", list(windows))
+
+    def render_many(
+        self, series: Iterable[Optional[Sequence[Optional[float]]]]
+    ) -> list[list[str]]:
+        """Return render() of every series, detecting the terminal only once."""
+        context = self.context or RenderContext.detect()
+        return [self.render(numbers, context=context) for numbers in series]
+
+    def iter_lines(
+        self,
+        numbers: Optional[Sequence[Optional[float]]] = None,
+        valid: Optional[Sequence[Any]] = None,
+        context: Optional[RenderContext] = None,
+    ) -> Iterator[str]:
+        """Yield the lines of render() lazily, one wrap window at a time."""
+        windows = self._windows(numbers, valid, context or self.context)
+        for i, lines in enumerate(windows):
+            if i:
+                yield ""
+            yield from lines
+
+    def write(
+        self,
+        stream: IO[Any],
+        numbers: Optional[Sequence[Optional[float]]] = None,
+        valid: Optional[Sequence[Any]] = None,
+        encoding: str = "utf-8",
+        context: Optional[RenderContext] = None,
+    ) -> None:
+        """Send the lines of render() to stream, one wrap window per call.
+
+        Binary streams (io.RawIOBase and io.BufferedIOBase, or opened with
+        "b" in their mode) receive the text encoded with encoding.
+        """
+        windows = self._windows(numbers, valid, context or self.context)
+        _write_windows(stream, windows, encoding)
+
+    def _windows(
+        self,
+        numbers: Optional[Sequence[Optional[float]]],
+        valid: Optional[Sequence[Any]],
+        context: Optional[RenderContext],
+    ) -> Iterator[list[str]]:
+        """Prepare numbers, then return an iterator over its wrap windows.
+
+        Input conversion and downsampling happen eagerly so that errors are
+        raised by the call itself, not by the first next() on the result.
+        """
+        if numbers is None:
+            numbers = []
+        numbers = _as_column(numbers, valid)
+        if self.width is not None:
+            numbers = downsample(numbers, self.width, self.reducer)
+        return self._draw(numbers, context)
+
+    def _draw(
+        self, numbers: Sequence[Optional[float]], context: Optional[RenderContext]
+    ) -> Iterator[list[str]]:
+        """Yield the rendered lines of numbers one wrap window at a time."""
+        if len(numbers) == 0:
+            yield [""]
+            return
+
+        scan = _scan(numbers)
+        if not scan.num_values:
+            yield [""]
+            return
+        mn, mx = scan.minimum, scan.maximum
+
+        if self.workers and self.workers > 1 and len(numbers) >= PARALLEL_THRESHOLD:
+            split = mn < 0 < mx
+            inverted = mn < 0 and not split
+            yield from _parallel_windows(
+                numbers,
+                split,
+                self.num_lines
+                if split
+                else self._neg_lines
+                if inverted
+                else self._pos_lines,
+                self.emph,
+                self.minimum,
+                self.maximum,
+                self.wrap,
+                self.zero,
+                inverted,
+                context or RenderContext.detect(),
+                scan,
+                self.workers,
+            )
+        elif mn < 0 < mx:
+            yield from _split_windows(
+                numbers, self.num_lines, self.emph, self.wrap, self.zero, context, scan
+            )
+        else:
+            # _series_windows takes absolute values itself when inverted.
+            inverted = mn < 0
+            yield from _series_windows(
+                numbers,
+                self._neg_lines if inverted else self._pos_lines,
+                self.emph,
+                minimum=self.minimum,
+                maximum=self.maximum,
+                wrap=self.wrap,
+                inverted=inverted,
+                context=context,
+                scan=scan,
+            )
+
+    def render_blocks(
+        self,
+        blocks: Iterable[Sequence[Optional[float]]],
+        minimum: float,
+        maximum: float,
+        context: Optional[RenderContext] = None,
+    ) -> Iterator[list[str]]:
+        """Yield the wrap windows of a series given block by block.
+
+        minimum and maximum are those of the whole series, which is drawn as
+        render() would draw it; bounds of the renderer still take precedence
+        for scaling. Blocks, whose sizes must be multiples of wrap, are drawn
+        in turn: with wrap, their windows are yielded as soon as they are
+        drawn, otherwise the lines of all blocks are joined at the end.
+        Emphasis is not applied.
+        """
+        if context is None:
+            context = self.context or RenderContext.detect()
+        mn, mx = minimum, maximum
+        scan = SeriesScan(1, mn, mx, max(mx, 0.0), max(-mn, 0.0), None)
+        split = mn < 0 < mx
+        inverted = mn < 0 and not split
+        num_lines = (
+            self.num_lines
+            if split
+            else self._neg_lines
+            if inverted
+            else self._pos_lines
+        )
+        chunks = []
+        for block in blocks:
+            chunk = _render_chunk(
+                block,
+                split,
+                num_lines,
+                {},
+                self.minimum,
+                self.maximum,
+                self.wrap,
+                self.zero,
+                inverted,
+                context,
+                scan,
+            )
+            if self.wrap:
+                yield from chunk[0]
+            else:
+                chunks.append(chunk)
+        if chunks:
+            yield _stitch(chunks)
+
+
+def _write_windows(
+    stream: IO[Any], windows: Iterable[list[str]], encoding: str = "utf-8"
+) -> None:
+    """Write windows of lines to stream, a blank line between windows.
+
+    Binary streams (io.RawIOBase and io.BufferedIOBase, or opened with "b"
+    in their mode) receive the text encoded with encoding.
+    """
+    mode = getattr(stream, "mode", "")
+    binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) or (
+        isinstance(mode, str) and "b" in mode
+    )
+    for i, lines in enumerate(windows):
+        text = "\n".join(([""] if i else []) + lines) + "\n"
+        stream.write(text.encode(encoding) if binary else text)
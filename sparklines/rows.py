@@ -1,5 +1,6 @@
 """Row allocation for multi-line and mixed positive/negative sparklines."""
 
+import functools
 import math
 from typing import Literal, Optional, Union
 
@@ -20,7 +21,11 @@ def allocate_rows(pos_max: float, neg_max: float, n: int) -> tuple[int, int]:
     target_i = round(ideal_i)
     best_i, best_j = 1, n - 1
     best_key: Optional[tuple[float, int, float, float]] = None
-    for i in range(1, n):
+    # The imbalance |pos_max * n - size * i| is V-shaped with its minimum at
+    # ideal_i and grows by size per step, so only i next to ideal_i can win;
+    # the key below keeps the tie-breaking of a scan over all 1 <= i < n.
+    base = math.floor(ideal_i)
+    for i in range(max(1, base - 1), min(n - 1, base + 2) + 1):
         j = n - i
         imbalance = abs(pos_max * j - neg_max * i)
         key = (imbalance, abs(i - j), abs(i - ideal_i), abs(i - target_i))
@@ -30,10 +35,12 @@ def allocate_rows(pos_max: float, neg_max: float, n: int) -> tuple[int, int]:
     return best_i, best_j
 
 
+@functools.lru_cache(maxsize=1024)
 def ideal_num_rows(pos_max: float, neg_max: float) -> int:
     """Return the smallest total row count that yields an exactly proportional split.
 
     Falls back to the closest approximation within 10 rows if no exact split exists.
+    Results are cached, as live dashboards ask for the same ranges every frame.
     """
     best_n = 2
     best_imbalance = float("inf")
@@ -58,6 +65,20 @@ def resolve_mixed_rows(
     return allocate_rows(pos_max, neg_max, n)
 
 
+def _validate_num_lines(num_lines: NumLines) -> None:
+    """Raise ValueError if num_lines is not a valid row-count spec."""
+    if isinstance(num_lines, int) and num_lines > 0:
+        return
+    if num_lines == "auto":
+        return
+    if isinstance(num_lines, tuple) and all(n > 0 for n in num_lines):
+        return
+    raise ValueError(
+        f"num_lines must be a positive int, 'auto', or (up, down) tuple; "
+        f"got {num_lines!r}"
+    )
+
+
 def _resolve_nl(num_lines: NumLines, side: Literal["pos", "neg"]) -> int:
     """Resolve NumLines to a concrete row count for one side of a non-split render."""
     if num_lines == "auto":
@@ -1,9 +1,86 @@
 """Value scaling and sequence utilities: scale_values, batch, list_join."""
 
-from collections.abc import Sequence
-from typing import Any, Optional
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, NamedTuple, Optional
 
 from sparklines.ansi import blocks
+from sparklines.vector import (
+    _as_masked_array,
+    _count_min_max,
+    _scale_array,
+    _with_gaps,
+    _use_numpy,
+)
+
+
+class SeriesScan(NamedTuple):
+    """Summary of a series from one pass over it, shared by the renderers.
+
+    minimum and maximum are 0.0 if num_values is 0. pos_max and neg_max are
+    the largest value and the largest absolute negative value, 0.0 if there
+    is none. missing flags the missing values (a bytearray, or a bool ndarray
+    on the NumPy engine, which also keeps the converted values).
+    """
+
+    num_values: int
+    minimum: float
+    maximum: float
+    pos_max: float
+    neg_max: float
+    missing: Any
+    values: Any = None
+
+
+def _scan(numbers: Sequence[Optional[float]]) -> SeriesScan:
+    """Return count, min, max, pos_max, neg_max and missing flags in one pass.
+
+    None and NaN are missing, on both engines.
+    """
+    if _use_numpy(numbers):
+        values, mask = _as_masked_array(numbers)
+        count, mn, mx = _count_min_max(values, mask)
+    else:
+        values = None
+        mask = bytearray(len(numbers))
+        count = 0
+        mn = mx = 0.0
+        for i, v in enumerate(numbers):
+            if v is None or v != v:
+                mask[i] = 1
+            elif not count:
+                mn = mx = v
+                count = 1
+            else:
+                if v < mn:
+                    mn = v
+                elif v > mx:
+                    mx = v
+                count += 1
+    pos_max = mx if count and mx >= 0 else 0.0
+    neg_max = -mn if count and mn < 0 else 0.0
+    return SeriesScan(count, mn, mx, pos_max, neg_max, mask, values)
+
+
+def _scan_blocks(blocks: Iterable[Sequence[Optional[float]]]) -> SeriesScan:
+    """Return the _scan of a series given in blocks, without missing flags.
+
+    Only one block is held at a time, for series read from a stream.
+    """
+    count = 0
+    mn = mx = 0.0
+    for block in blocks:
+        scan = _scan(block)
+        if not scan.num_values:
+            continue
+        if count:
+            mn = min(mn, scan.minimum)
+            mx = max(mx, scan.maximum)
+        else:
+            mn, mx = scan.minimum, scan.maximum
+        count += scan.num_values
+    pos_max = mx if count and mx >= 0 else 0.0
+    neg_max = -mn if count and mn < 0 else 0.0
+    return SeriesScan(count, mn, mx, pos_max, neg_max, None)
 
 
 def scale_values(
@@ -13,28 +90,52 @@ def scale_values(
     maximum: Optional[float] = None,
 ) -> list[Optional[int]]:
     """Scale input numbers to appropriate range."""
-    filtered = [n for n in numbers if n is not None]
-    min_ = min(filtered) if minimum is None else minimum
-    max_ = max(filtered) if maximum is None else maximum
-    dv = max_ - min_
+    if _use_numpy(numbers):
+        values_arr, mask = _as_masked_array(numbers)
+        levels = _scale_array(values_arr, mask, num_lines, minimum, maximum)
+        return _with_gaps(levels, mask)
+
+    if minimum is None or maximum is None:
+        scan = _scan(numbers)
+        if not scan.num_values:
+            raise ValueError("cannot scale a series without values")
+        minimum = scan.minimum if minimum is None else minimum
+        maximum = scan.maximum if maximum is None else maximum
+    return _scale(numbers, num_lines, minimum, maximum)
+
 
-    numbers = [max(min(n, max_), min_) if n is not None else None for n in numbers]
+def _scale(
+    numbers: Sequence[Optional[float]],
+    num_lines: int,
+    min_: float,
+    max_: float,
+    absolute: bool = False,
+) -> list[Optional[int]]:
+    """Clamp and scale numbers to levels in one pass, with known bounds.
 
+    With absolute, negative values are scaled by their absolute value.
+    None and NaN are missing.
+    """
+    dv = max_ - min_
+    if dv < 0:
+        raise ValueError(f"minimum ({min_}) must not exceed maximum ({max_})")
     if dv == 0:
-        values = [4 * num_lines if x is not None else None for x in numbers]
-    elif dv > 0:
-        num_blocks = len(blocks) - 1
-        min_index = 1.0
-        max_index = num_lines * num_blocks
-        values_f = [
-            (
-                ((max_index - min_index) * (x - min_)) / dv + min_index
-                if x is not None
-                else None
-            )
-            for x in numbers
-        ]
-        values = [round(v) or 1 if v is not None else None for v in values_f]
+        return [None if x is None or x != x else 4 * num_lines for x in numbers]
+
+    num_blocks = len(blocks) - 1
+    min_index = 1.0
+    max_index = num_lines * num_blocks
+    span = max_index - min_index
+    values: list[Optional[int]] = []
+    append = values.append
+    for x in numbers:
+        if x is None or x != x:
+            append(None)
+            continue
+        if absolute and x < 0:
+            x = -x
+        x = max(min(x, max_), min_)
+        append(round((span * (x - min_)) / dv + min_index) or 1)
     return values
 
 
@@ -49,6 +150,17 @@ def batch(batch_size: Optional[int], items: Sequence[Any]) -> list[list[Any]]:
     return [[item for item in group if item != MISSING] for group in groups]
 
 
+def _windows(size: Optional[int], items: Sequence[Any]) -> Iterator[list[Any]]:
+    """Lazily yield what batch(size, items) returns, one group at a time."""
+    if size is None:
+        yield list(items)
+        return
+    if size < 1:
+        return
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
+
 def list_join(separator: str, lists: list[list[Any]]) -> list[Any]:
     """Join a list of lists with separator items between each sublist."""
     result = []
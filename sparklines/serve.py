@@ -0,0 +1,173 @@
+"""Render daemon: per-key histories kept warm behind a Unix domain socket.
+
+Protocol: a client sends one line per request, a key followed by zero or
+more whitespace-separated values ("cpu 42"). The values are appended to the
+history of that key, whose sparkline is sent back as "+N" and the N lines of
+the sparkline, or "-message" if the request is invalid. A connection may
+carry any number of requests. The client side is in sparklines.client.
+"""
+
+import asyncio
+import contextlib
+import math
+import os
+import signal
+import socket
+import stat
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from typing import Optional
+
+from sparklines.ansi import RenderContext
+from sparklines.client import default_socket
+from sparklines.renderer import Renderer
+from sparklines.stream import _parse
+
+# Values kept per key, unless given.
+WINDOW = 80
+# Keys kept at most, unless given; the least recently used one is dropped.
+MAX_KEYS = 1024
+# Longest request line accepted, in bytes.
+MAX_REQUEST = 1 << 16
+
+
+class RenderServer:
+    """Histories of values by key, rendered with one renderer on request.
+
+    The renderer and its terminal context (detected once if the renderer has
+    none) are shared by all keys; each history keeps the last window values.
+    At most max_keys histories are kept, so that clients sending ever new
+    keys cannot grow the server without bound: a new key beyond that drops
+    the history of the least recently used one.
+    """
+
+    __slots__ = ("context", "histories", "max_keys", "renderer", "window")
+
+    def __init__(
+        self, renderer: Renderer, window: int = WINDOW, max_keys: int = MAX_KEYS
+    ) -> None:
+        """Serve sparklines drawn by renderer of the last window values."""
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        if max_keys < 1:
+            raise ValueError(f"max_keys must be >= 1, got {max_keys}")
+        self.renderer = renderer
+        self.window = window
+        self.max_keys = max_keys
+        self.context = renderer.context or RenderContext.detect()
+        self.histories: OrderedDict[str, deque[Optional[float]]] = OrderedDict()
+
+    def push(self, key: str, values: Iterable[Optional[float]] = ()) -> list[str]:
+        """Append values to the history of key and return its sparkline lines.
+
+        Values that are not finite (NaN, infinities) are kept as missing.
+        """
+        history = self.histories.get(key)
+        if history is None:
+            if len(self.histories) >= self.max_keys:
+                self.histories.popitem(last=False)
+            history = self.histories[key] = deque(maxlen=self.window)
+        else:
+            self.histories.move_to_end(key)
+        history.extend(v if v is None or math.isfinite(v) else None for v in values)
+        return self.renderer.render(list(history), context=self.context)
+
+    def reply(self, line: bytes) -> bytes:
+        """Return the response to one request line."""
+        tokens = line.split()
+        if not tokens:
+            return b"-empty request\n"
+        try:
+            key = tokens[0].decode()
+        except UnicodeDecodeError:
+            return b"-key is not valid UTF-8\n"
+        try:
+            lines = self.push(key, [_parse(token) for token in tokens[1:]])
+        except ValueError as e:
+            return f"-{e}\n".encode()
+        return f"+{len(lines)}\n".encode() + "".join(f"{s}\n" for s in lines).encode()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(f"-request longer than {MAX_REQUEST} bytes\n".encode())
+                    break
+                if not line:
+                    break
+                writer.write(self.reply(line))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _remove_stale(path: str) -> None:
+    """Remove the socket at path left by a server that is no longer running."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise FileExistsError(f"{path}: exists and is not a socket")
+    if st.st_uid != os.getuid():
+        raise FileExistsError(f"{path}: a socket of another user")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise FileExistsError(f"{path}: a server is already running")
+
+
+async def start_server(
+    server: RenderServer, path: Optional[str] = None
+) -> asyncio.AbstractServer:
+    """Start answering requests for server on a Unix socket at path.
+
+    The socket is only accessible to the current user: it is created with
+    mode 0600, not made private after the fact. A socket left by a server of
+    the same user that is no longer running is replaced.
+    """
+    path = path or default_socket()
+    _remove_stale(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        sock.bind(path)
+    except BaseException:
+        sock.close()
+        raise
+    finally:
+        os.umask(umask)
+    return await asyncio.start_unix_server(server.handle, sock=sock, limit=MAX_REQUEST)
+
+
+def serve(renderer: Renderer, path: Optional[str] = None, window: int = WINDOW) -> None:
+    """Serve sparklines of the last window values per key until interrupted.
+
+    SIGTERM stops the server like Ctrl-C; the socket is removed either way.
+    """
+    path = path or default_socket()
+    server = RenderServer(renderer, window)
+
+    async def run() -> None:
+        listener = await start_server(server, path)
+        task = asyncio.current_task()
+        if task is not None:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            os.unlink(path)
+
+    with contextlib.suppress(asyncio.CancelledError):
+        asyncio.run(run())
@@ -0,0 +1,149 @@
+"""Shared-memory series: a single-writer ring of float64 read without copying.
+
+A producer process pushes values into a SharedSeries; any number of
+renderer processes attach to it by name and pass window() straight to
+sparklines() or scale_values(), which read the shared buffer in place.
+
+The block holds a counter of the values pushed and two copies of the ring
+(each value is written at its slot in both halves), so the last n values
+are always one contiguous slice. The counter is written after the values,
+without a lock: a window taken after reading the counter is not touched by
+the writer until it has pushed capacity - n more values.
+"""
+
+import sys
+from collections.abc import Iterable
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Optional
+
+from sparklines.columnar import ColumnView
+
+# Bytes before the values: the counter of values pushed and the capacity.
+_HEADER_SIZE = 16
+
+# Names of the series created by this process (or, once forked, its parent),
+# whose resource tracker already holds them.
+_CREATED: set[str] = set()
+
+
+class SharedSeries:
+    """A ring of the last capacity float64 values in shared memory.
+
+    Created with a capacity (and optionally a name) by the one process that
+    writes to it, and attached by name elsewhere; pickling a series (e.g.
+    as a multiprocessing.Process argument) attaches to it, which is how
+    child processes of the creator should get it. Missing values are NaN.
+    Views returned by window() must be dropped before close().
+
+    Example:
+        series = SharedSeries(capacity=240)  # producer
+        series.push(read_sensor())
+        ...
+        series = SharedSeries.attach(name)  # renderer
+        print(sparklines(series.window(120), minimum=0)[0])
+
+    """
+
+    __slots__ = ("_counter", "_owner", "_shm", "_values", "capacity")
+
+    def __init__(self, capacity: int, name: Optional[str] = None) -> None:
+        """Create a series of capacity values, named name or a unique name."""
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        size = _HEADER_SIZE + 2 * capacity * 8
+        shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self._init(shm, owner=True)
+        _CREATED.add(self.name)
+        self._counter[1] = capacity
+        self.capacity = capacity
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedSeries":
+        """Return the series of that name, created by another process."""
+        return cls._attach(name, name not in _CREATED)
+
+    @classmethod
+    def _attach(cls, name: str, untrack: bool) -> "SharedSeries":
+        """Attach to the series; untrack unless the creator's tracker is ours."""
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name)
+            # Like track=False: the resource tracker would remove the block
+            # when this process exits, although the creator still uses it.
+            # Processes sharing the creator's tracker (its children) keep the
+            # registration, which is the creator's own.
+            if untrack:
+                resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        series = cls.__new__(cls)
+        series._init(shm, owner=False)
+        series.capacity = series._counter[1]
+        return series
+
+    def _init(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        """Set up the views of the header and of the values."""
+        buf = shm.buf
+        assert buf is not None
+        self._shm = shm
+        self._owner = owner
+        self._counter: memoryview[Any] = buf[:_HEADER_SIZE].cast("Q")
+        self._values: memoryview[Any] = buf[_HEADER_SIZE:].cast("d")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the name only; unpickling (in a child) attaches to the series."""
+        return SharedSeries._attach, (self.name, False)
+
+    def __enter__(self) -> "SharedSeries":
+        """Return the series itself."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Close the series, and remove it if this process created it."""
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    @property
+    def name(self) -> str:
+        """Return the name to attach to the series with."""
+        return str(self._shm.name)
+
+    @property
+    def sequence(self) -> int:
+        """Return the number of values pushed so far."""
+        return int(self._counter[0])
+
+    def push(self, value: Optional[float]) -> None:
+        """Append one value (None for missing), from the writing process."""
+        seq = self._counter[0]
+        slot = seq % self.capacity
+        v = float("nan") if value is None else value
+        self._values[slot] = self._values[slot + self.capacity] = v
+        self._counter[0] = seq + 1
+
+    def extend(self, values: Iterable[Optional[float]]) -> None:
+        """Append values in order, from the writing process."""
+        for v in values:
+            self.push(v)
+
+    def window(self, size: Optional[int] = None) -> ColumnView:
+        """Return a view of the last size values (all by default), oldest first.
+
+        The view reads the shared buffer: nothing is copied, and it sees
+        values that are pushed capacity - size or more values later.
+        """
+        seq = self.sequence
+        size = min(self.capacity if size is None else size, self.capacity, seq)
+        end = seq % self.capacity + self.capacity
+        return ColumnView(self._values[end - size : end])
+
+    def close(self) -> None:
+        """Release this process's mapping of the series."""
+        self._counter.release()
+        self._values.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Remove the series once every process has closed it."""
+        self._shm.unlink()
+        _CREATED.discard(self.name)
@@ -3,58 +3,63 @@
 Please read the file README.md for more information.
 """
 
+import functools
 import sys
-from collections.abc import Sequence
-from typing import Any, Literal, Optional, Union
+from collections.abc import Iterator, Sequence
+from typing import IO, Any, Literal, Optional, Union, overload
 
 from sparklines.ansi import (  # noqa: F401
     HAVE_TERMCOLOR,
     _COMPLEMENT,
     _INVERTED_UNICODE,
+    RenderContext,
     _ansi_ok,
     _inverted_char,
     blocks,
+    glyph_cache_clear,
+    glyph_cache_info,
+)
+from sparklines.columnar import ColumnView, _as_column, load_binary
+from sparklines.downsample import REDUCERS, Reducer, downsample
+from sparklines.emphasis import (  # noqa: F401
+    CompiledEmphasis,
+    Emph,
+    _check_emphasis,
+    compile_emphasis,
 )
-from sparklines.emphasis import _check_emphasis  # noqa: F401
 from sparklines.render import (  # noqa: F401
     _partition_series,
     _render_row,
     _render_series,
     _render_split,
 )
+from sparklines.renderer import Renderer
 from sparklines.rows import (  # noqa: F401
     NumLines,
     _resolve_nl,
+    _validate_num_lines,
     allocate_rows,
     ideal_num_rows,
     proportional,
     resolve_mixed_rows,
 )
-from sparklines.scale import batch, list_join, scale_values  # noqa: F401
-
-
-def _validate_num_lines(num_lines: NumLines) -> None:
-    """Raise ValueError if num_lines is not a valid row-count spec."""
-    if isinstance(num_lines, int) and num_lines > 0:
-        return
-    if num_lines == "auto":
-        return
-    if isinstance(num_lines, tuple) and all(n > 0 for n in num_lines):
-        return
-    raise ValueError(
-        f"num_lines must be a positive int, 'auto', or (up, down) tuple; "
-        f"got {num_lines!r}"
-    )
+from sparklines.scale import _scan, batch, list_join, scale_values  # noqa: F401
+from sparklines.vector import HAVE_NUMPY, _as_matrix, _matrix_bounds, _render_matrix
 
 
 def sparklines(
     numbers: Optional[Sequence[Optional[float]]] = None,
     num_lines: NumLines = 1,
-    emph: Optional[list[str]] = None,
+    emph: Optional[Emph] = None,
     minimum: Optional[float] = None,
     maximum: Optional[float] = None,
     wrap: Optional[int] = None,
     zero: Literal["up", "none"] = "up",
+    context: Optional[RenderContext] = None,
+    width: Optional[int] = None,
+    reducer: Reducer = "max",
+    valid: Optional[Sequence[Any]] = None,
+    workers: Optional[int] = None,
 ) -> list[str]:
     """Return a list of 'sparkline' strings for a given list of input numbers.
 
@@ -64,6 +69,28 @@ def sparklines(
     Mixed positive/negative data is automatically split into two rows: upward
     bars for positives on top, downward bars for negatives below.
 
+    The emph rules may be given as strings or, to avoid re-parsing them on
+    every call, as the result of compile_emphasis().
+
+    Terminal capabilities (ANSI, colour) are detected once per call unless a
+    RenderContext is passed as context.
+
+    With width, series longer than width are first aggregated into width
+    buckets using reducer (see downsample()); wrap and emph then apply to the
+    aggregated values.
+
+    Besides sequences, numbers may be any object supporting the buffer
+    protocol (array.array, memoryview, NumPy arrays) or a primitive Arrow
+    array; these are read in place without building a list. NaN is a missing
+    value there, and valid, a sequence of flags as long as numbers, marks
+    further values as missing where it is false (e.g. an Arrow validity
+    mask or a NumPy bool array).
+
+    With workers > 1, a long series (see parallel.PARALLEL_THRESHOLD) is
+    split into chunks that are scaled and rendered by that many worker
+    processes (threads on a free-threaded Python) and joined back together;
+    the output is the same as without workers.
+
     Examples:
         sparklines([3, 1, 4, 1, 5, 9, 2, 6])
         -> ['▃▁▄▁▄█▂▅']
@@ -74,44 +101,227 @@ def sparklines(
         ]
 
     """
-    if numbers is None:
-        numbers = []
     _validate_num_lines(num_lines)
+    return _renderer(
+        num_lines,
+        _emph_key(emph),
+        minimum,
+        maximum,
+        wrap,
+        zero,
+        width,
+        reducer,
+        workers,
+    ).render(numbers, valid, context)
 
-    if len(numbers) == 0:
-        return [""]
 
-    filtered = [n for n in numbers if n is not None]
-    if not filtered:
-        return [""]
+@functools.lru_cache(maxsize=64)
+def _renderer(
+    num_lines: NumLines = 1,
+    emph: Optional[Emph] = None,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+    wrap: Optional[int] = None,
+    zero: Literal["up", "none"] = "up",
+    width: Optional[int] = None,
+    reducer: Reducer = "max",
+    workers: Optional[int] = None,
+) -> Renderer:
+    """Return a Renderer for these options, shared by calls that repeat them.
 
-    mn, mx = min(filtered), max(filtered)
+    The renderer has no context: callers pass theirs to each render, so the
+    cache neither misses on nor keeps alive every context it is given.
+    Callers validate num_lines first, as a list would fail to hash.
+    """
+    return Renderer(
+        num_lines,
+        emph,
+        minimum,
+        maximum,
+        wrap,
+        zero,
+        width=width,
+        reducer=reducer,
+        workers=workers,
+    )
 
-    if mn < 0 < mx:
-        return _render_split(numbers, num_lines, emph, wrap, zero)
 
-    if mn < 0:
-        neg_only: list[Optional[float]] = [
-            abs(v) if v is not None else None for v in numbers
-        ]
-        return _render_series(
-            neg_only,
-            _resolve_nl(num_lines, "neg"),
-            emph,
-            minimum=minimum,
-            maximum=maximum,
-            wrap=wrap,
-            inverted=True,
-        )
-
-    return _render_series(
-        numbers,
-        _resolve_nl(num_lines, "pos"),
-        emph=emph,
-        minimum=minimum,
-        maximum=maximum,
-        wrap=wrap,
+def _emph_key(emph: Optional[Emph]) -> Optional[Emph]:
+    """Return emph in a hashable form for the _renderer() cache."""
+    return tuple(emph) if isinstance(emph, list) else emph
+
+
+def iter_sparklines(
+    numbers: Optional[Sequence[Optional[float]]] = None,
+    num_lines: NumLines = 1,
+    emph: Optional[Emph] = None,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+    wrap: Optional[int] = None,
+    zero: Literal["up", "none"] = "up",
+    context: Optional[RenderContext] = None,
+    width: Optional[int] = None,
+    reducer: Reducer = "max",
+    valid: Optional[Sequence[Any]] = None,
+    workers: Optional[int] = None,
+) -> Iterator[str]:
+    """Yield the lines of sparklines(...) lazily, one wrap window at a time.
+
+    Takes the same arguments as sparklines() and yields the same lines,
+    including the empty separator line between wrapped windows, but renders
+    a window only when its first line is requested. With wrap, this keeps
+    the first lines of a long series on screen early and memory bounded by
+    one window.
+
+    Example:
+        for line in iter_sparklines(values, wrap=80):
+            print(line)
+
+    """
+    _validate_num_lines(num_lines)
+    return _renderer(
+        num_lines,
+        _emph_key(emph),
+        minimum,
+        maximum,
+        wrap,
+        zero,
+        width,
+        reducer,
+        workers,
+    ).iter_lines(numbers, valid, context)
+
+
+def write_sparklines(
+    stream: IO[Any],
+    numbers: Optional[Sequence[Optional[float]]] = None,
+    *,
+    encoding: str = "utf-8",
+    valid: Optional[Sequence[Any]] = None,
+    **kwargs: Any,
+) -> None:
+    """Write the lines of sparklines(numbers, **kwargs) to stream.
+
+    Each line is terminated by a newline. Every wrap window is written with
+    a single write() call, so output is neither built up in full nor written
+    a line at a time. Binary streams (io.RawIOBase and io.BufferedIOBase, or
+    opened with "b" in their mode) receive the text encoded with encoding.
+
+    Example:
+        write_sparklines(sys.stdout, values, num_lines=2, wrap=80)
+
+    """
+    context = kwargs.pop("context", None)
+    _validate_num_lines(kwargs.get("num_lines", 1))
+    if "emph" in kwargs:
+        kwargs["emph"] = _emph_key(kwargs["emph"])
+    _renderer(**kwargs).write(stream, numbers, valid, encoding, context)
+
+
+@overload
+def sparklines_many(
+    matrix: Sequence[Sequence[Optional[float]]],
+    num_lines: NumLines = ...,
+    emph: Optional[Emph] = ...,
+    minimum: Optional[float] = ...,
+    maximum: Optional[float] = ...,
+    wrap: Optional[int] = ...,
+    zero: Literal["up", "none"] = ...,
+    context: Optional[RenderContext] = ...,
+    scale: Literal["series", "global"] = ...,
+    joined: Literal[False] = ...,
+) -> list[list[str]]: ...
+
+
+@overload
+def sparklines_many(
+    matrix: Sequence[Sequence[Optional[float]]],
+    num_lines: NumLines = ...,
+    emph: Optional[Emph] = ...,
+    minimum: Optional[float] = ...,
+    maximum: Optional[float] = ...,
+    wrap: Optional[int] = ...,
+    zero: Literal["up", "none"] = ...,
+    context: Optional[RenderContext] = ...,
+    scale: Literal["series", "global"] = ...,
+    *,
+    joined: Literal[True],
+) -> str: ...
+
+
+def sparklines_many(
+    matrix: Sequence[Sequence[Optional[float]]],
+    num_lines: NumLines = 1,
+    emph: Optional[Emph] = None,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+    wrap: Optional[int] = None,
+    zero: Literal["up", "none"] = "up",
+    context: Optional[RenderContext] = None,
+    scale: Literal["series", "global"] = "series",
+    joined: bool = False,
+) -> Union[list[list[str]], str]:
+    """Return sparklines() of every row of matrix, rendered in one batch.
+
+    matrix is a 2-D NumPy array or a sequence of series. Each row is scaled
+    on its own with scale="series", or all rows share the minimum and
+    maximum of the whole matrix with scale="global"; either way a row gets
+    the same lines as sparklines(row, ..., minimum=..., maximum=...) with
+    those bounds. Returns one list of lines per row, or with joined=True all
+    lines as one newline-separated string.
+
+    With NumPy and equal-length rows, all rows without negative values are
+    scaled and drawn together by array operations (unless emph or wrap is
+    given); the others are rendered one by one with a shared Renderer.
+
+    Example:
+        sparklines_many([[1, 2, 3], [3, 2, 1]], scale="global")
+        -> [['▁▄█'], ['█▄▁']]
+
+    """
+    if scale not in ("series", "global"):
+        raise ValueError(f"scale must be 'series' or 'global'; got {scale!r}")
+    arrays = _as_matrix(matrix)
+    if scale == "global":
+        lo, hi = _global_bounds(matrix, arrays)
+        minimum = lo if minimum is None else minimum
+        maximum = hi if maximum is None else maximum
+
+    renderer = Renderer(
+        num_lines, emph, minimum, maximum, wrap, zero, context or RenderContext.detect()
     )
+    rendered: list[Optional[list[str]]] = [None] * len(matrix)
+    if arrays is not None and not renderer.emph and wrap is None:
+        values, mask = arrays
+        rendered = _render_matrix(values, mask, renderer.up_rows, minimum, maximum)
+    result = [
+        lines if lines is not None else renderer.render(matrix[i])
+        for i, lines in enumerate(rendered)
+    ]
+    if joined:
+        return "\n".join(line for lines in result for line in lines)
+    return result
+
+
+def _global_bounds(
+    matrix: Sequence[Sequence[Optional[float]]], arrays: Optional[tuple[Any, Any]]
+) -> tuple[Optional[float], Optional[float]]:
+    """Return the min and max over all rows of matrix, or None if it has none."""
+    if arrays is not None:
+        counts, mins, maxs = _matrix_bounds(*arrays)
+        if not counts.any():
+            return None, None
+        return float(mins.min()), float(maxs.max())
+    scans = [s for s in map(_scan, _as_rows(matrix)) if s.num_values]
+    if not scans:
+        return None, None
+    return min(s.minimum for s in scans), max(s.maximum for s in scans)
+
+
+def _as_rows(matrix: Any) -> Iterator[Sequence[Optional[float]]]:
+    """Yield the rows of matrix with buffer input wrapped, like sparklines() does."""
+    for row in matrix:
+        yield _as_column(row)
 
 
 def _demo_lines(nums: list[Optional[float]]) -> list[str]:
@@ -200,18 +410,33 @@ def demo(nums: Optional[list[Optional[float]]] = None) -> str:
 # Suppress unused-import warnings for re-exported names consumed via star import.
 __all__ = [
     "Any",
+    "ColumnView",
+    "CompiledEmphasis",
+    "HAVE_NUMPY",
     "HAVE_TERMCOLOR",
     "NumLines",
+    "REDUCERS",
+    "Reducer",
+    "RenderContext",
+    "Renderer",
     "Union",
     "_check_emphasis",
     "allocate_rows",
     "batch",
     "blocks",
+    "compile_emphasis",
     "demo",
+    "downsample",
+    "glyph_cache_clear",
+    "glyph_cache_info",
     "ideal_num_rows",
+    "iter_sparklines",
     "list_join",
+    "load_binary",
     "proportional",
     "resolve_mixed_rows",
     "scale_values",
     "sparklines",
+    "sparklines_many",
+    "write_sparklines",
 ]
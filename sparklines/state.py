@@ -0,0 +1,197 @@
+"""Append mode: a fixed-size ring of values in a memory-mapped history file.
+
+The file is a 32-byte header (magic, capacity, values pushed, running
+minimum and maximum) followed by capacity little-endian float64 slots;
+missing values are NaN. Pushing a value writes one slot and the header, so
+a status script appending a sample and drawing the last values does O(1)
+I/O however long it has been running. POSIX only (flock, pread).
+"""
+
+import fcntl
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+# Values kept in a new history, unless given.
+WINDOW = 80
+
+MAGIC = b"SPKR"
+# magic, capacity, values pushed, running minimum, running maximum
+_HEADER = struct.Struct("<4sIQdd")
+_SLOT = struct.Struct("<d")
+
+
+class RingFile:
+    """A history of the last capacity values, shared through a file.
+
+    Opening a missing or empty file creates it, with capacity values (by
+    default WINDOW). Opening a history with a smaller capacity grows it,
+    keeping its values. Every push and read holds an exclusive or shared
+    lock on the file (flock), so any number of processes can append to and
+    draw the same history.
+
+    Example:
+        with RingFile("/tmp/cpu.spark", capacity=60) as ring:
+            ring.push([cpu_percent()])
+            print(sparklines(ring.window())[0])
+
+    """
+
+    __slots__ = ("_fd", "_map", "path")
+
+    def __init__(self, path: str, capacity: Optional[int] = None) -> None:
+        """Open or create the history at path, holding at least capacity values."""
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._map: Optional[mmap.mmap] = None
+        try:
+            with self._locked(exclusive=True):
+                if self._map is None:
+                    self._create(capacity or WINDOW)
+                elif capacity and self.capacity < capacity:
+                    self._grow(capacity)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "RingFile":
+        """Return the history itself."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Close the history."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """Hold a lock on the file, mapping it again if another process resized it."""
+        fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            size = os.fstat(self._fd).st_size
+            if self._map is None or len(self._map) != size:
+                self._remap(size)
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _remap(self, size: int) -> None:
+        """Map size bytes of the file, checking its header."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if not size:
+            return
+        if size < _HEADER.size or os.pread(self._fd, 4, 0) != MAGIC:
+            raise ValueError(f"{self.path}: not a sparklines history file")
+        self._map = mmap.mmap(self._fd, size)
+        if size != _HEADER.size + self.capacity * _SLOT.size:
+            raise ValueError(f"{self.path}: truncated history file")
+
+    def _create(self, capacity: int) -> None:
+        """Write an empty history of capacity values to the (empty) file."""
+        os.ftruncate(self._fd, _HEADER.size + capacity * _SLOT.size)
+        os.pwrite(self._fd, _HEADER.pack(MAGIC, capacity, 0, math.inf, -math.inf), 0)
+        self._remap(os.fstat(self._fd).st_size)
+
+    def _grow(self, capacity: int) -> None:
+        """Resize the ring to capacity values, keeping the values in order."""
+        values = self._read(self.capacity)
+        _, _, _, lo, hi = self._header()
+        header = _HEADER.pack(MAGIC, capacity, len(values), lo, hi)
+        os.ftruncate(self._fd, _HEADER.size + capacity * _SLOT.size)
+        os.pwrite(self._fd, header + _encode(values), 0)
+        self._remap(os.fstat(self._fd).st_size)
+
+    def _header(self) -> tuple[bytes, int, int, float, float]:
+        """Return the fields of the header."""
+        assert self._map is not None
+        fields: tuple[bytes, int, int, float, float] = _HEADER.unpack_from(self._map)
+        return fields
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of values the history holds."""
+        return self._header()[1]
+
+    @property
+    def count(self) -> int:
+        """Return the number of values pushed since it was created or grown."""
+        return self._header()[2]
+
+    @property
+    def bounds(self) -> tuple[Optional[float], Optional[float]]:
+        """Return the minimum and maximum of all values ever pushed.
+
+        These include values no longer in the ring, e.g. to draw the window
+        on a scale that does not change as it slides. (None, None) if no
+        value (other than missing ones) was pushed yet.
+        """
+        _, _, _, lo, hi = self._header()
+        return (lo, hi) if lo <= hi else (None, None)
+
+    def push(self, values: Iterable[Optional[float]]) -> None:
+        """Append values (None for missing), overwriting the oldest ones.
+
+        Values that are not finite (NaN, infinities) are stored as missing.
+        """
+        with self._locked(exclusive=True):
+            assert self._map is not None
+            _, capacity, count, lo, hi = self._header()
+            for v in values:
+                if v is None or not math.isfinite(v):
+                    v = math.nan
+                else:
+                    lo, hi = min(lo, v), max(hi, v)
+                _SLOT.pack_into(
+                    self._map, _HEADER.size + count % capacity * _SLOT.size, v
+                )
+                count += 1
+            self._map[: _HEADER.size] = _HEADER.pack(MAGIC, capacity, count, lo, hi)
+
+    def window(self, size: Optional[int] = None) -> "array[float]":
+        """Return the last size values (all by default), oldest first, NaN missing."""
+        with self._locked(exclusive=False):
+            return self._read(size or self.capacity)
+
+    def _read(self, size: int) -> "array[float]":
+        """Return the last size values; the caller holds a lock."""
+        assert self._map is not None
+        _, capacity, count, _, _ = self._header()
+        size = min(size, capacity, count)
+        start, end = (count - size) % capacity, count % capacity or capacity
+        first = _HEADER.size + start * _SLOT.size
+        if start < end or not size:
+            data = self._map[first : first + size * _SLOT.size]
+        else:
+            last = _HEADER.size + end * _SLOT.size
+            data = self._map[first:] + self._map[_HEADER.size : last]
+        values = array("d")
+        values.frombytes(data)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+
+def _encode(values: "array[float]") -> bytes:
+    """Return values as little-endian float64 bytes."""
+    if sys.byteorder != "little":
+        values = array("d", values)
+        values.byteswap()
+    return values.tobytes()
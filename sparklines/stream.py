@@ -0,0 +1,168 @@
+"""Streaming input: numbers parsed from bytes, rendered in bounded memory."""
+
+import math
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from itertools import islice
+from typing import IO, Any, Optional
+
+from sparklines.downsample import _reduce
+from sparklines.renderer import Renderer, _write_windows
+from sparklines.scale import _scan_blocks
+
+# Bytes read from the input at a time.
+READ_SIZE = 1 << 16
+# Values drawn at a time when rendering block by block.
+BLOCK_SIZE = 1 << 14
+# Bytes of piped input kept in memory before it is spooled to a temporary file.
+SPOOL_SIZE = 1 << 22
+
+
+def _parse(token: bytes) -> Optional[float]:
+    """Convert a token to a float, or None if it is not a number."""
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+def iter_numbers(
+    source: IO[bytes],
+    read_size: int = READ_SIZE,
+    copy: Optional[IO[bytes]] = None,
+) -> Iterator[Optional[float]]:
+    """Yield the whitespace-separated values of a binary stream as they are read.
+
+    The stream is read read_size bytes at a time, so memory does not grow
+    with its length; with copy, the bytes read are also written to it.
+    Tokens that are not numbers (e.g. null or none) yield None, as on the
+    command-line.
+    """
+    rest = b""
+    while True:
+        chunk = source.read(read_size)
+        if not chunk:
+            break
+        if copy is not None:
+            copy.write(chunk)
+        tokens = (rest + chunk).split()
+        # A token running up to the end of the chunk may continue in the next.
+        rest = b"" if chunk[-1:].isspace() or not tokens else tokens.pop()
+        for token in tokens:
+            yield _parse(token)
+    if rest:
+        yield _parse(rest)
+
+
+def _blocks(
+    values: Iterable[Optional[float]], size: int
+) -> Iterator[list[Optional[float]]]:
+    """Yield lists of size values (the last one possibly shorter)."""
+    it = iter(values)
+    while True:
+        block = list(islice(it, size))
+        if not block:
+            return
+        yield block
+
+
+def _block_size(wrap: Optional[int]) -> int:
+    """Return BLOCK_SIZE rounded to whole wrap windows."""
+    if not wrap:
+        return BLOCK_SIZE
+    return max(1, BLOCK_SIZE // wrap) * wrap
+
+
+def write_stream(
+    out: IO[Any], source: IO[bytes], renderer: Renderer, encoding: str = "utf-8"
+) -> None:
+    """Write the sparkline of the numbers in a binary stream to out.
+
+    The input is never held in memory, except for emphasis and lttb:
+
+    - with renderer.minimum >= 0 and renderer.maximum, values are drawn in a
+      single pass, block by block, as they are read. Values below the
+      minimum, negative ones included, are drawn at the minimum (where
+      sparklines() would draw negative values downwards, which takes the
+      whole series to decide);
+    - with width, a first pass counts the values and a second pass reduces
+      them to width buckets;
+    - otherwise a first pass scans the values for their bounds and a second
+      pass draws them block by block.
+
+    Input that is not seekable (a pipe) is read twice from a copy, in memory
+    up to SPOOL_SIZE bytes and in a temporary file beyond. With wrap,
+    windows are written as they are drawn; without, memory is bounded by the
+    size of the output. With emphasis (and no width) or the lttb reducer,
+    the values are collected in a compact array of floats, which sparklines
+    reads in place. Apart from the clamp above, the output is that of
+    sparklines().
+    """
+    lo, hi = renderer.minimum, renderer.maximum
+    if renderer.width is not None and renderer.reducer != "lttb":
+        with _two_passes(source) as (first, again):
+            n = sum(1 for _ in first)
+            reduced = _reduce(again(), n, renderer.width, renderer.reducer)
+        renderer.write(out, reduced, encoding=encoding)
+    elif renderer.emph or renderer.width is not None:
+        values = array(
+            "d", (math.nan if v is None else v for v in iter_numbers(source))
+        )
+        renderer.write(out, values, encoding=encoding)
+    elif lo is not None and hi is not None and lo >= 0:
+        blocks = _blocks(iter_numbers(source), _block_size(renderer.wrap))
+        _write_windows(
+            out, _first_or_blank(renderer.render_blocks(blocks, lo, hi)), encoding
+        )
+    else:
+        size = _block_size(renderer.wrap)
+        with _two_passes(source) as (first, again):
+            scan = _scan_blocks(_blocks(first, size))
+            windows: Iterator[list[str]] = iter([])
+            if scan.num_values:
+                windows = renderer.render_blocks(
+                    _blocks(again(), size), scan.minimum, scan.maximum
+                )
+            _write_windows(out, _first_or_blank(windows), encoding)
+
+
+@contextmanager
+def _two_passes(
+    source: IO[bytes],
+) -> Iterator[
+    tuple[Iterator[Optional[float]], Callable[[], Iterator[Optional[float]]]]
+]:
+    """Yield the values of source, and a function that returns them again.
+
+    Seekable input is read again from where it started; other input is
+    copied to a spool as it is first read.
+    """
+    if source.seekable():
+        start = source.tell()
+
+        def reread() -> Iterator[Optional[float]]:
+            source.seek(start)
+            return iter_numbers(source)
+
+        yield iter_numbers(source), reread
+        return
+    import tempfile
+
+    with tempfile.SpooledTemporaryFile(SPOOL_SIZE) as spool:
+
+        def from_spool() -> Iterator[Optional[float]]:
+            spool.seek(0)
+            return iter_numbers(spool)
+
+        yield iter_numbers(source, copy=spool), from_spool
+
+
+def _first_or_blank(windows: Iterator[list[str]]) -> Iterator[list[str]]:
+    """Yield windows, or one blank line if there are none (empty input)."""
+    empty = True
+    for lines in windows:
+        empty = False
+        yield lines
+    if empty:
+        yield [""]
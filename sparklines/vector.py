@@ -0,0 +1,320 @@
+"""Optional NumPy-vectorized engine for scaling, emphasis and row decomposition.
+
+Used automatically when NumPy is installed and the input is an ndarray or has
+at least NUMPY_THRESHOLD elements. Output is identical to the pure-Python path;
+missing values (None, or NaN in float arrays) are tracked with a boolean mask.
+"""
+
+import sys
+from collections.abc import Sequence
+from importlib.util import find_spec
+from typing import Any, Optional
+
+from sparklines.ansi import blocks
+from sparklines.columnar import ColumnView, _Bitmap
+
+# NumPy is imported on first use (see _LazyNumpy), so that rendering short
+# series, and starting the CLI, never pays for importing it.
+HAVE_NUMPY = find_spec("numpy") is not None
+
+# Below this length the per-call overhead of NumPy outweighs its benefit.
+NUMPY_THRESHOLD = 4096
+
+# Number of input values downsampling converts to arrays at a time.
+REDUCE_CHUNK = 1 << 15
+
+_GLYPHS: Any = None
+_CODEPOINTS: Any = None
+
+
+class _LazyNumpy:
+    """Stand-in for the numpy module that imports it on first attribute access.
+
+    The import replaces this object in the module globals, along with the
+    glyph tables, so that later accesses go to numpy directly.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        """Import numpy and return its attribute name."""
+        global np, _GLYPHS, _CODEPOINTS
+        import numpy
+
+        np = numpy
+        _GLYPHS = numpy.array(list(blocks))
+        _CODEPOINTS = numpy.array([ord(c) for c in blocks], dtype=numpy.uint32)
+        return getattr(numpy, name)
+
+
+np: Any = _LazyNumpy()
+
+
+def _is_array(numbers: Any) -> bool:
+    """Return True if numbers is a NumPy ndarray, without importing NumPy.
+
+    Nothing can be an ndarray unless whoever made it imported numpy.
+    """
+    numpy = sys.modules.get("numpy")
+    return HAVE_NUMPY and numpy is not None and isinstance(numbers, numpy.ndarray)
+
+
+def _use_numpy(numbers: Sequence[Optional[float]]) -> bool:
+    """Return True if the vectorized engine should handle numbers."""
+    if not HAVE_NUMPY:
+        return False
+    if _is_array(numbers):
+        return True
+    # Short buffers (ColumnView) are read in place by the Python path too.
+    return len(numbers) >= NUMPY_THRESHOLD
+
+
+def _as_masked_array(
+    numbers: Sequence[Optional[float]], absolute: bool = False
+) -> tuple[Any, Any]:
+    """Return (float64 values, missing mask) for a sequence or ndarray.
+
+    Missing slots are None in sequences and NaN in float arrays; their value
+    in the returned array is 0.0 so that later arithmetic stays finite.
+    """
+    if isinstance(numbers, ColumnView):
+        values, mask = _column_arrays(numbers)
+    elif _is_array(numbers) and np.asarray(numbers).dtype != object:
+        values = np.asarray(numbers, dtype=np.float64).ravel()
+        mask = np.isnan(values)
+    else:
+        n = len(numbers)
+        mask = np.fromiter((v is None for v in numbers), dtype=bool, count=n)
+        values = np.fromiter(
+            (0.0 if v is None else v for v in numbers), dtype=np.float64, count=n
+        )
+        mask |= np.isnan(values)
+    if mask.any():
+        values = np.where(mask, 0.0, values)
+    if absolute:
+        values = np.abs(values)
+    return values, mask
+
+
+def _column_arrays(view: ColumnView) -> tuple[Any, Any]:
+    """Return (float64 values, missing mask) of a ColumnView, sharing its buffer."""
+    values = np.asarray(view.data).astype(np.float64, copy=False)
+    mask = np.isnan(values)
+    valid: Any = view.valid
+    if isinstance(valid, _Bitmap):
+        bits = np.frombuffer(valid.bits, dtype=np.uint8)
+        pos = valid.positions
+        if pos.step == 1:
+            # Unpack only the bytes covering the visible bits.
+            unpacked = np.unpackbits(
+                bits[pos.start >> 3 : (pos.stop + 7) >> 3], bitorder="little"
+            )
+            first = pos.start & 7
+            mask |= unpacked[first : first + len(pos)] == 0
+        else:
+            idx = np.arange(pos.start, pos.stop, pos.step)
+            mask |= (bits[idx >> 3] >> (idx & 7) & 1) == 0
+    elif valid is not None:
+        try:
+            flags = np.asarray(memoryview(valid))
+        except TypeError:
+            flags = np.asarray(valid)
+        mask |= ~flags.astype(bool, copy=False)
+    return values, mask
+
+
+def _count_min_max(values: Any, mask: Any) -> tuple[int, float, float]:
+    """Return the number, min and max of the values not masked as missing."""
+    valid = ~mask
+    count = int(np.count_nonzero(valid))
+    if not count:
+        return 0, 0.0, 0.0
+    mn = float(np.min(values, where=valid, initial=np.inf))
+    mx = float(np.max(values, where=valid, initial=-np.inf))
+    return count, mn, mx
+
+
+def _scale_array(
+    values: Any,
+    mask: Any,
+    num_lines: int = 1,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+) -> Any:
+    """Vectorized scale_values: return int64 levels, 0 where mask is set."""
+    if minimum is None or maximum is None:
+        _, mn, mx = _count_min_max(values, mask)
+        minimum = mn if minimum is None else minimum
+        maximum = mx if maximum is None else maximum
+    min_, max_ = minimum, maximum
+    dv = max_ - min_
+    if dv < 0:
+        raise ValueError(f"minimum ({min_}) must not exceed maximum ({max_})")
+
+    if dv == 0:
+        levels = np.full(values.shape, 4 * num_lines, dtype=np.int64)
+    else:
+        max_index = num_lines * (len(blocks) - 1)
+        clamped = np.clip(values, min_, max_)
+        # Same operation order as scale_values so results are bit-identical;
+        # np.rint rounds half to even just like round().
+        scaled = ((max_index - 1.0) * (clamped - min_)) / dv + 1.0
+        levels = np.rint(scaled).astype(np.int64)
+        levels[levels == 0] = 1
+    levels[mask] = 0
+    return levels
+
+
+def _with_gaps(values: Any, mask: Any) -> list[Any]:
+    """Convert an array and mask back into a list with None gaps."""
+    result: list[Any] = values.tolist()
+    for i in np.flatnonzero(mask).tolist():
+        result[i] = None
+    return result
+
+
+def _row_levels(levels: Any, num_lines: int) -> Any:
+    """Split levels into num_lines rows of 0..8, bottom row first."""
+    offsets = 8 * np.arange(num_lines, dtype=np.int64)[:, None]
+    return np.clip(levels[None, :] - offsets, 0, 8)
+
+
+def _join_row(row: Any) -> str:
+    """Render a row of levels without colour; level 0 is a blank like a gap."""
+    return "".join(_GLYPHS[row].tolist())
+
+
+def _emphasis_indices(values: Any, mask: Any, rules: Sequence[Any]) -> bytes:
+    """Return one colour-index byte per point for compiled emphasis rules."""
+    indices = np.zeros(len(values), dtype=np.uint8)
+    valid = ~mask
+    for rule in rules:
+        if rule.span is not None:
+            selected = np.zeros(len(values), dtype=bool)
+            selected[rule.span] = True
+        else:
+            selected = rule.op(values, rule.value)
+        indices[selected & valid] = rule.color
+    result: bytes = indices.tobytes()
+    return result
+
+
+def _reduce_buckets(
+    numbers: Sequence[Optional[float]], width: int, reducer: str
+) -> list[Optional[float]]:
+    """Vectorized max/min/mean/last over width near-equal buckets.
+
+    Input is converted REDUCE_CHUNK values at a time (whole buckets per
+    chunk), so temporary arrays stay small however long numbers is.
+    """
+    n = len(numbers)
+    bounds = np.arange(width + 1, dtype=np.int64) * n // width
+    result: list[Optional[float]] = []
+    first = 0
+    while first < width:
+        last = int(np.searchsorted(bounds, bounds[first] + REDUCE_CHUNK, "right")) - 1
+        last = min(max(last, first + 1), width)
+        lo = int(bounds[first])
+        values, mask = _as_masked_array(numbers[lo : int(bounds[last])])
+        result.extend(_reduce_chunk(values, mask, bounds[first:last] - lo, reducer))
+        first = last
+    return result
+
+
+def _reduce_chunk(
+    values: Any, mask: Any, starts: Any, reducer: str
+) -> list[Optional[float]]:
+    """Reduce values into the buckets beginning at starts."""
+    counts = np.add.reduceat(~mask, starts)
+    if reducer == "max":
+        reduced = np.maximum.reduceat(np.where(mask, -np.inf, values), starts)
+    elif reducer == "min":
+        reduced = np.minimum.reduceat(np.where(mask, np.inf, values), starts)
+    elif reducer == "last":
+        positions = np.where(mask, 0, np.arange(len(values)))
+        reduced = values[np.maximum.reduceat(positions, starts)]
+    else:
+        sums = np.add.reduceat(np.where(mask, 0.0, values), starts)
+        reduced = sums / np.maximum(counts, 1)
+    return _with_gaps(reduced, counts == 0)
+
+
+def _as_matrix(matrix: Any) -> Optional[tuple[Any, Any]]:
+    """Return (float64 values, missing mask) of a 2-D array or equal-length rows.
+
+    Returns None without NumPy, for ragged or empty input, and for object
+    arrays, which are then rendered row by row.
+    """
+    if not HAVE_NUMPY:
+        return None
+    if _is_array(matrix):
+        if matrix.ndim != 2 or matrix.dtype == object or not matrix.size:
+            return None
+        values = np.asarray(matrix, dtype=np.float64)
+    else:
+        rows = len(matrix)
+        cols = len(matrix[0]) if rows else 0
+        if not cols or any(len(row) != cols for row in matrix):
+            return None
+        values = np.fromiter(
+            (np.nan if v is None else v for row in matrix for v in row),
+            dtype=np.float64,
+            count=rows * cols,
+        ).reshape(rows, cols)
+    mask = np.isnan(values)
+    if mask.any():
+        values = np.where(mask, 0.0, values)
+    return values, mask
+
+
+def _matrix_bounds(values: Any, mask: Any) -> tuple[Any, Any, Any]:
+    """Return the per-row count, min and max of the values not missing."""
+    valid = ~mask
+    counts = valid.sum(axis=1)
+    mins = np.min(values, axis=1, where=valid, initial=np.inf)
+    maxs = np.max(values, axis=1, where=valid, initial=-np.inf)
+    return counts, mins, maxs
+
+
+def _render_matrix(
+    values: Any,
+    mask: Any,
+    num_lines: int,
+    minimum: Optional[float],
+    maximum: Optional[float],
+) -> list[Optional[list[str]]]:
+    """Render every non-negative row of a matrix at once, uncoloured.
+
+    Each row is scaled like scale_values() to its own bounds unless minimum or
+    maximum is given. Rows with negative values or without any value are left
+    as None for the caller to render with the general renderer.
+    """
+    counts, mins, maxs = _matrix_bounds(values, mask)
+    fast = (counts > 0) & (mins >= 0)
+    result: list[Optional[list[str]]] = [None] * len(values)
+    if not fast.any():
+        return result
+    values, mask = values[fast], mask[fast]
+    lo = (mins[fast] if minimum is None else np.full(len(values), minimum))[:, None]
+    hi = (maxs[fast] if maximum is None else np.full(len(values), maximum))[:, None]
+    dv = hi - lo
+    if (dv < 0).any():
+        raise ValueError(f"minimum ({minimum}) must not exceed maximum ({maximum})")
+
+    max_index = num_lines * (len(blocks) - 1)
+    flat = dv == 0
+    clamped = np.clip(values, lo, hi)
+    # Same operation order as scale_values so results are bit-identical.
+    scaled = ((max_index - 1.0) * (clamped - lo)) / np.where(flat, 1.0, dv) + 1.0
+    levels = np.rint(scaled).astype(np.int64)
+    levels[levels == 0] = 1
+    levels = np.where(flat, 4 * num_lines, levels)
+    levels[mask] = 0
+
+    width = values.shape[1]
+    lines = []
+    for row in reversed(range(num_lines)):
+        codes = _CODEPOINTS[np.clip(levels - 8 * row, 0, 8)]
+        # Reinterpret each row of code points as one fixed-width string.
+        lines.append(codes.view(np.dtype(("U", width))).ravel().tolist())
+    for i, row_lines in zip(np.flatnonzero(fast).tolist(), zip(*lines)):
+        result[i] = list(row_lines)
+    return result
@@ -0,0 +1,20 @@
+"""Shared fixtures."""
+
+import pytest
+
+from sparklines import vector
+
+
+@pytest.fixture(params=["python", "numpy"])
+def engine(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test with the pure-Python engine and, if installed, NumPy.
+
+    With NumPy, series of any length take the vectorized path.
+    """
+    if request.param == "python":
+        monkeypatch.setattr(vector, "HAVE_NUMPY", False)
+    elif not vector.HAVE_NUMPY:
+        pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(vector, "NUMPY_THRESHOLD", 0)
+    return str(request.param)
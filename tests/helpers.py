@@ -1,8 +1,31 @@
 """Shared test helpers."""
 
+import io
 import re
+from typing import Any
 
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape sequences from a string."""
     return re.compile(r"\x1b[^m]*m").sub("", text)
+
+
+class Pipe(io.RawIOBase):
+    """A non-seekable raw byte stream, like a pipe."""
+
+    def __init__(self, data: bytes) -> None:
+        """Serve data."""
+        self._data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, buf: Any) -> int:
+        """Read from the data."""
+        return self._data.readinto(buf)
+
+
+def pipe(data: bytes) -> io.BufferedReader:
+    """Return data as a buffered, non-seekable stream, like stdin from a pipe."""
+    return io.BufferedReader(Pipe(data))
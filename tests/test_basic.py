@@ -1,6 +1,11 @@
 """Tests for basic (positive-only) sparkline output."""
 
+from typing import Optional
+
+import pytest
+
 from sparklines import sparklines
+from sparklines.render import _BLOCKS, _transpose
 
 
 def test_pi() -> None:
@@ -82,3 +87,20 @@ def test_minimum_internal_consistency() -> None:
     res = sparklines([0, 0, 11, 12, 13], minimum=10)
     exp = sparklines([10, 10, 11, 12, 13], minimum=10)
     assert res == exp
+
+
+@pytest.mark.parametrize("num_lines", [1, 2, 3, 16])
+def test_transpose_matches_row_peeling(num_lines: int) -> None:
+    """Test the glyph-column tables against peeling off 8 levels per row."""
+    values: list[Optional[int]] = [None, *range(8 * num_lines + 1), None]
+    exp = []
+    remaining = values
+    for _ in range(num_lines):
+        exp.append(tuple(min(v, 8) if v is not None else None for v in remaining))
+        remaining = [max(0, v - 8) if v is not None else None for v in remaining]
+    assert _transpose(values, None, num_lines) == exp
+    glyph_rows = [
+        tuple(_BLOCKS[v] if v is not None else " " for v in row) for row in exp
+    ]
+    assert _transpose(values, _BLOCKS, num_lines) == glyph_rows
+    assert _transpose([], None, num_lines) == [()] * num_lines
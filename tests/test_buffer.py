@@ -0,0 +1,69 @@
+"""Tests for SparklineBuffer: sliding min/max and incremental rendering."""
+
+import math
+import random
+from typing import Optional
+
+import pytest
+
+from sparklines import NumLines, SparklineBuffer, sparklines
+
+
+def test_buffer_window_and_min_max() -> None:
+    """Test that the window drops old samples and min/max follow it."""
+    buf = SparklineBuffer(3)
+    assert buf.render() == [""]
+    assert buf.min_max() is None
+    buf.extend([5, 1, None, 2])
+    assert len(buf) == 3
+    assert buf.values() == [1, None, 2]
+    assert buf.min_max() == (1, 2)
+    buf.push(3)
+    assert buf.min_max() == (2, 3)
+
+
+def test_buffer_nan_is_a_gap() -> None:
+    """Test that NaN is a gap that leaves min/max alone, like None."""
+    buf = SparklineBuffer(4)
+    buf.extend([5, math.nan, 1, 3])
+    assert buf.values() == [5, None, 1, 3]
+    assert buf.min_max() == (1, 5)
+    buf.push(math.nan)
+    assert buf.min_max() == (1, 3)
+    assert buf.render() == sparklines([None, 1, 3, None])
+
+
+@pytest.mark.parametrize(
+    "num_lines,minimum,maximum,lo,hi",
+    [
+        (1, None, None, 0, 100),
+        (2, 0, 100, 0, 100),
+        (3, None, None, -50, 50),
+        ((2, 1), None, None, -100, 0),
+    ],
+)
+def test_buffer_render_matches_sparklines(
+    num_lines: NumLines,
+    minimum: Optional[float],
+    maximum: Optional[float],
+    lo: float,
+    hi: float,
+) -> None:
+    """Test that incremental render() equals a full sparklines() call each tick."""
+    rng = random.Random(7)
+    buf = SparklineBuffer(20, num_lines=num_lines, minimum=minimum, maximum=maximum)
+    for step in range(200):
+        value = None if rng.random() < 0.05 else round(rng.uniform(lo, hi), 1)
+        buf.push(value)
+        if step % 3 == 0:
+            continue
+        exp = sparklines(
+            buf.values(), num_lines=num_lines, minimum=minimum, maximum=maximum
+        )
+        assert buf.render() == exp
+
+
+def test_buffer_invalid_capacity() -> None:
+    """Test that a non-positive capacity is rejected."""
+    with pytest.raises(ValueError):
+        SparklineBuffer(0)
@@ -1,7 +1,10 @@
 """Tests for the CLI: argument parsing, --version, --demo, and integration."""
 
+import io
+import math
 import os
 import sys
+from array import array
 from pathlib import Path
 
 import pytest
@@ -11,10 +14,10 @@ if sys.version_info >= (3, 11):
 else:
     import tomli as tomllib
 
-from sparklines import demo
-from sparklines.__main__ import main
+from sparklines import demo, follow, sparklines
+from sparklines.__main__ import FPS, main
 from sparklines.__main__ import test_valid_number as is_valid_number
-from tests.helpers import strip_ansi
+from tests.helpers import pipe, strip_ansi
 
 
 def test_parse_float() -> None:
@@ -104,3 +107,72 @@ def test_main_version(capsys: pytest.CaptureFixture[str]) -> None:
 
     out, _ = capsys.readouterr()
     assert out == f"{expected_version}\n"
+
+
+def test_files_labelled_in_order(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that --file inputs are labelled and kept in order with --jobs."""
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"s{i}.txt"
+        path.write_text(" ".join(str((i + k) % 5) for k in range(8)) + "\n")
+        paths.append(str(path))
+    main([arg for path in paths for arg in ("-f", path)] + ["-j", "3"])
+    out, _ = capsys.readouterr()
+    lines = out.rstrip("\n").split("\n")
+    assert [line.split()[0] for line in lines] == paths
+    assert lines[0] == f"{paths[0]} {sparklines([0, 1, 2, 3, 4, 0, 1, 2])[0]}"
+
+
+def test_columns_csv_and_tsv(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test --columns by header name and number, in CSV and TSV input."""
+    csv_path = tmp_path / "m.csv"
+    csv_path.write_text("ts,cpu,mem\n1,3,1\n2,,5\n3,9,2\n")
+    tsv_path = tmp_path / "m.tsv"
+    tsv_path.write_text("1\t2\n3\t1\n")
+    main(["-f", str(csv_path), "-c", "cpu,3"])
+    out, _ = capsys.readouterr()
+    assert out == f"{csv_path}:cpu ▁ █\n{csv_path}:3   ▁█▃\n"
+    main(["-f", str(tsv_path), "-c", "2,1"])
+    out, _ = capsys.readouterr()
+    assert out == f"{tsv_path}:2 █▁\n{tsv_path}:1 ▁█\n"
+    with pytest.raises(SystemExit):
+        main(["-f", str(tsv_path), "-c", "cpu"])
+
+
+def test_stdin_streamed(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that values read from stdin render as when given as arguments.
+
+    With --min 0 and --max, the single pass draws negative values at 0.
+    """
+    for nums in (["3", "1", "4", "null", "5", "9", "2", "6"], ["-1", "2", "null"]):
+        for args in ([], ["-m", "0", "-M", "9"]):
+            data = " ".join(nums).encode()
+            for source in (io.BytesIO(data), pipe(data)):
+                monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(source))
+                main(args)
+                out, _ = capsys.readouterr()
+                clamped = [n.replace("-1", "0") for n in nums] if args else nums
+                main([*args, "--", *clamped])
+                assert capsys.readouterr()[0] == out
+
+
+def test_binary_format(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test --format with --offset/--count on a raw float32 file."""
+    path = tmp_path / "values.f32"
+    path.write_bytes(array("f", [3, 1, 4, math.nan, 5, 9, 2, 6]).tobytes())
+    main(["--format", "f32", "--offset", "2", "--count", "4", "-f", str(path)])
+    out, _ = capsys.readouterr()
+    assert out == f"{path} {sparklines([4, None, 5, 9])[0]}\n"
+    with pytest.raises(SystemExit):
+        main(["--offset", "2", "1", "2"])
+
+
+def test_fps_default_matches_follow() -> None:
+    """Test that the --fps default shown in --help is the one follow uses."""
+    assert FPS == follow.MAX_FPS
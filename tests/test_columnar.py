@@ -0,0 +1,129 @@
+"""Tests for zero-copy buffer-protocol and Arrow input."""
+
+import io
+import math
+import mmap
+import pickle
+import tracemalloc
+from array import array
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+from sparklines import ColumnView, load_binary, sparklines
+from sparklines import vector
+
+DATA = [3.0, 1.0, 4.0, math.nan, 5.0, 9.0, 2.0, 6.0]
+EXPECTED = sparklines([3, 1, 4, None, 5, 9, 2, 6])
+
+
+class FakeArrowArray:
+    """Just enough of pyarrow.Array: a float64 column with a validity bitmap."""
+
+    type = "double"
+
+    def __init__(self, values: list[Optional[float]], offset: int = 0) -> None:
+        """Build the buffers for values, None being null."""
+        bits = sum(1 << i for i, v in enumerate(values) if v is not None)
+        self._validity = bits.to_bytes((len(values) + 7) // 8, "little")
+        self._data = array("d", [0.0 if v is None else v for v in values])
+        self.offset = offset
+        self._length = len(values) - offset
+        self.null_count = values[offset:].count(None)
+
+    def __len__(self) -> int:
+        """Return the length after the offset."""
+        return self._length
+
+    def buffers(self) -> list[Any]:
+        """Return the validity bitmap and data buffers."""
+        return [self._validity, self._data]
+
+
+def test_short_views_stay_in_python() -> None:
+    """Test that only views of NUMPY_THRESHOLD values or more go to NumPy."""
+    short = ColumnView(memoryview(array("d", DATA)))
+    long = ColumnView(memoryview(array("d", DATA * vector.NUMPY_THRESHOLD)))
+    assert not vector._use_numpy(short)
+    assert vector._use_numpy(long) == vector.HAVE_NUMPY
+
+
+def test_buffer_inputs(engine: str) -> None:
+    """Test that array.array and memoryview render like a list, NaN as a gap."""
+    buf = array("d", DATA)
+    assert sparklines(buf) == EXPECTED
+    assert sparklines(memoryview(buf)) == EXPECTED
+    assert (
+        sparklines(array("i", [3, 1, 4, 0, 5, 9, 2, 6]), valid=b"\1\1\1\0\1\1\1\1")
+        == EXPECTED
+    )
+    assert sparklines(array("d", [-1.0, 2.0]), wrap=1) == sparklines([-1, 2], wrap=1)
+
+
+def test_valid_mask(engine: str) -> None:
+    """Test that values are missing where valid is false."""
+    buf = array("d", [3, 1, 4, 7, 5, 9, 2, 6])
+    valid = [True, True, True, False, True, True, True, True]
+    assert sparklines(buf, valid=valid) == EXPECTED
+    assert sparklines(list(buf), valid=valid) == EXPECTED
+    with pytest.raises(ValueError):
+        sparklines(buf, valid=valid[1:])
+
+
+def test_arrow_array(engine: str) -> None:
+    """Test Arrow-style input with a validity bitmap and an offset."""
+    values: list[Optional[float]] = [8, 8, 3, 1, 4, None, 5, 9, 2, 6]
+    arrow: Any = FakeArrowArray(values, offset=2)
+    assert sparklines(arrow) == EXPECTED
+    view = ColumnView(memoryview(array("d", DATA)))
+    assert list(view[::2]) == [3.0, 4.0, 5.0, 2.0]
+    # Views are sent to worker processes by value.
+    part = ColumnView(memoryview(array("d", DATA)), [True] * 7 + [False])[::-3]
+    assert list(pickle.loads(pickle.dumps(part))) == list(part)
+
+
+def test_downsample_memory_is_bounded(engine: str) -> None:
+    """Test that width-targeted rendering never copies the whole input."""
+    n = 1 << 20
+    buf = array("d", range(n))
+    buf[n // 2] = math.nan
+    tracemalloc.start()
+    try:
+        lines = sparklines(buf, width=80)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert lines == sparklines(list(range(80)))
+    assert peak < len(buf) * buf.itemsize / 4
+
+
+@pytest.mark.parametrize("fmt, code", [("f32", "f"), ("f64", "d"), ("i32", "i")])
+def test_load_binary(tmp_path: Path, fmt: str, code: str) -> None:
+    """Test that raw binary files are mapped, NaN missing, with a range."""
+    path = tmp_path / f"values.{fmt}"
+    values = [3, 1, 4, 7, 5, 9, 2, 6] if code == "i" else DATA
+    with open(path, "wb") as f:
+        f.write(array(code, values).tobytes() + b"\0")  # plus a partial value
+    view = load_binary(path, fmt)
+    assert isinstance(view.data.obj, mmap.mmap)
+    if code != "i":
+        assert sparklines(view) == EXPECTED
+    expected = [None if v != v else v for v in values[2:5]]
+    assert list(load_binary(path, fmt, offset=2, count=3)) == expected
+    assert list(load_binary(path, fmt, offset=-2)) == [2, 6]
+    assert list(load_binary(path, fmt, offset=20)) == []
+    with pytest.raises(ValueError):
+        load_binary(path, "f16")
+
+
+def test_load_npy(tmp_path: Path) -> None:
+    """Test .npy files in either byte order and of any shape."""
+    np = pytest.importorskip("numpy")
+    for dtype in ("<f8", ">f4"):
+        path = tmp_path / "values.npy"
+        np.save(path, np.array(DATA, dtype=dtype).reshape(2, 4))
+        assert sparklines(load_binary(path, "npy")) == EXPECTED
+        assert list(load_binary(path, "npy", 2, 3)) == [4, None, 5]
+    with pytest.raises(ValueError):
+        load_binary(io.BytesIO(b"not npy"), "npy")
@@ -0,0 +1,90 @@
+"""Tests for width-targeted downsampling and the width= option."""
+
+from typing import Optional
+
+import pytest
+
+from sparklines import downsample, sparklines
+from sparklines import vector
+from sparklines.__main__ import main
+from tests.helpers import strip_ansi
+
+
+def test_downsample_reducers() -> None:
+    """Test max, min, mean and last over equal buckets, skipping gaps."""
+    data: list[Optional[float]] = [1, 5, 2, None, 3, 9, None, None]
+    assert downsample(data, 4, "max") == [5, 2, 9, None]
+    assert downsample(data, 4, "min") == [1, 2, 3, None]
+    assert downsample(data, 4, "mean") == [3.0, 2.0, 6.0, None]
+    assert downsample(data, 4, "last") == [5, 2, 9, None]
+
+
+def test_downsample_uneven_buckets() -> None:
+    """Test that bucket sizes differ by at most one and cover every value."""
+    data = list(range(10))
+    assert downsample(data, 3, "last") == [2, 5, 9]
+    assert downsample(data, 3, "min") == [0, 3, 6]
+
+
+def test_downsample_short_input_unchanged() -> None:
+    """Test that series not longer than width are returned as they are."""
+    assert downsample([1, None, float("nan")], 5) == [1, None, None]
+
+
+def test_downsample_minmax_envelope() -> None:
+    """Test that the envelope keeps both extremes of a bucket in time order."""
+    data = [0.0, 4.0, -3.0, 1.0, 2.0, -5.0, 6.0, 0.0]
+    assert downsample(data, 4, "minmax") == [4.0, -3.0, -5.0, 6.0]
+    assert downsample(data, 5, "minmax") == [4.0, -3.0, -5.0, 6.0]
+    assert downsample(data, 1, "minmax") == downsample(data, 1, "mean") == [0.625]
+
+
+def test_downsample_lttb_keeps_spike() -> None:
+    """Test that LTTB keeps endpoints and an isolated spike that mean would flatten."""
+    data = [1.0] * 50 + [100.0] + [1.0] * 49
+    res = downsample(data, 10, "lttb")
+    assert len(res) == 10
+    assert res[0] == 1.0 and res[-1] == 1.0
+    assert 100.0 in res
+    assert max(v for v in downsample(data, 10, "mean") if v is not None) < 20
+
+
+@pytest.mark.parametrize("reducer", ["max", "min", "mean", "last"])
+def test_downsample_numpy_matches_python(
+    monkeypatch: pytest.MonkeyPatch, reducer: str
+) -> None:
+    """Test that the vectorized bucket reduction matches the Python loop."""
+    pytest.importorskip("numpy")
+    data: list[Optional[float]] = [
+        None if i % 11 == 0 else float((i * 37) % 101) for i in range(1000)
+    ]
+    with monkeypatch.context() as m:
+        m.setattr(vector, "HAVE_NUMPY", False)
+        slow = downsample(data, 37, reducer)  # type: ignore[arg-type]
+    with monkeypatch.context() as m:
+        m.setattr(vector, "NUMPY_THRESHOLD", 0)
+        fast = downsample(data, 37, reducer)  # type: ignore[arg-type]
+    assert slow == pytest.approx(fast)
+
+
+def test_sparklines_width_mixed() -> None:
+    """Test that width applies before the mixed positive/negative split."""
+    data = [float(i % 20 - 10) for i in range(2000)]
+    res = sparklines(data, width=40, reducer="minmax")
+    assert len(res) == 2
+    assert all(len(strip_ansi(line)) == 40 for line in res)
+
+
+def test_downsample_invalid() -> None:
+    """Test that a bad width or reducer is rejected."""
+    with pytest.raises(ValueError):
+        downsample([1, 2], 0)
+    with pytest.raises(ValueError):
+        downsample([1, 2], 1, "median")  # type: ignore[arg-type]
+
+
+def test_width_cli(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that --width and --reducer aggregate the input on the command line."""
+    main(["--width", "4", "--reducer", "max"] + [str(i) for i in range(1, 9)])
+    out, _ = capsys.readouterr()
+    assert out == "▁▃▆█\n"
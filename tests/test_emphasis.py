@@ -4,8 +4,16 @@ from typing import Optional
 
 import pytest
 
-from sparklines import sparklines
+from sparklines import (
+    RenderContext,
+    compile_emphasis,
+    glyph_cache_clear,
+    glyph_cache_info,
+    sparklines,
+)
+from sparklines.ansi import HAVE_TERMCOLOR
 from sparklines.sparklines import _check_emphasis
+from tests.helpers import strip_ansi
 
 
 def test_inverted_with_emph() -> None:
@@ -61,3 +69,85 @@ def test_emph_index_cli_validator() -> None:
         test_valid_emphasis("red:[")
     with pytest.raises(ValueError):
         test_valid_emphasis("red:0:3")
+
+
+def test_compile_emphasis_reuse() -> None:
+    """Test that compiled rules render the same as strings and can be reused."""
+    data = [1.0, 5.0, -3.0, None, 7.0, 2.0]
+    rules = ["red:gt:4", "blue:[0:2]", "nocolor", "green:lt:0"]
+    compiled = compile_emphasis(rules)
+    assert len(compiled) == 3
+    assert compile_emphasis(compiled) is compiled
+    assert sparklines(data, emph=compiled) == sparklines(data, emph=rules)
+    assert sparklines(data[:3], emph=compiled) == sparklines(data[:3], emph=rules)
+    assert _check_emphasis(data, compiled) == {
+        0: "blue",
+        1: "blue",
+        2: "green",
+        4: "red",
+    }
+
+
+def test_emphasis_map_no_match_is_falsy() -> None:
+    """Test that rules matching nothing behave like an empty emphasis dict."""
+    emphasized = compile_emphasis(["red:gt:100"]).evaluate([1.0, 2.0])
+    assert not emphasized
+    assert emphasized.get(0, "white") == "white"
+    assert sparklines([1, 2], emph=["red:gt:100"]) == sparklines([1, 2])
+
+
+def test_glyph_cache_shared_across_calls() -> None:
+    """Test that coloured cells come from the shared glyph cache on later calls."""
+    glyph_cache_clear()
+    data = [1.0, 5.0, -3.0, 7.0]
+    first = sparklines(data, emph=["red:gt:4", "blue:lt:0"])
+    misses = glyph_cache_info().misses
+    assert misses > 0
+    assert sparklines(data, emph=["red:gt:4", "blue:lt:0"]) == first
+    info = glyph_cache_info()
+    assert info.misses == misses
+    assert info.hits >= misses
+
+
+def _colour_context(coalesce: bool) -> RenderContext:
+    """Return a context that emits emphasis colours even without a TTY."""
+    context = RenderContext(termcolor=True, coalesce=coalesce)
+    context.colorize = True
+    return context
+
+
+needs_termcolor = pytest.mark.skipif(
+    not HAVE_TERMCOLOR, reason="termcolor is not installed"
+)
+
+
+@needs_termcolor
+def test_coalesced_colour_runs() -> None:
+    """Test that equal-colour runs share one escape pair and shrink the output."""
+    data = [float(i % 7) for i in range(200)]
+    emph = ["green:ge:0"]
+    runs = sparklines(data, emph=emph, context=_colour_context(True))[0]
+    cells = sparklines(data, emph=emph, context=_colour_context(False))[0]
+    assert strip_ansi(runs) == strip_ansi(cells)
+    assert runs.count("\x1b[") == 2
+    assert cells.count("\x1b[") == 400
+    # 200 cells: 609 bytes instead of 2400.
+    assert len(runs.encode()) * 3 < len(cells.encode())
+
+
+@needs_termcolor
+def test_coalesced_mixed_colours() -> None:
+    """Test that a colour change starts a new run."""
+    res = sparklines([1, 2, 3, 4], emph=["red:le:2"], context=_colour_context(True))
+    assert res[0].count("\x1b[0m") == 2
+    assert strip_ansi(res[0]) == "▁▃▆█"
+
+
+def test_coalesced_inverted_runs() -> None:
+    """Test that reverse-video downward bars are coalesced into one run."""
+    data = [-1.0, -2.0, -3.0, -4.0, -5.0, -6.0, -7.0]
+    runs = sparklines(data, context=RenderContext(termcolor=False))[0]
+    cells = sparklines(data, context=RenderContext(termcolor=False, coalesce=False))
+    assert runs.count("\x1b[7m") == 1
+    assert cells[0].count("\x1b[7m") == 6
+    assert strip_ansi(runs) == strip_ansi(cells[0])
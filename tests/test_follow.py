@@ -0,0 +1,113 @@
+"""Tests for follow mode: a sliding window redrawn in place."""
+
+import asyncio
+import io
+import threading
+from collections.abc import AsyncIterator
+from typing import Optional
+
+import pytest
+
+import sparklines as sparklines_module
+from sparklines import Renderer, RenderContext, sparklines
+from sparklines.follow import _frame, follow, sparkline_stream
+
+
+def test_follow_coalesces_bursts() -> None:
+    """Test that a burst of lines is drawn in a few frames, ending on the last."""
+    values = [(i * 7) % 11 for i in range(5000)]
+    source = io.BytesIO(b"".join(b"%d\n" % v for v in values))
+    out = io.StringIO()
+    renderer = Renderer(context=RenderContext(ansi=True))
+    frames = follow(source, out, renderer, window=40, max_fps=20)
+    assert 1 <= frames < 10
+    assert out.getvalue().endswith(sparklines(values[-40:])[0] + "\n")
+
+
+def test_follow_ends_while_reader_lingers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that follow returns at the end of source, however late the reader exits."""
+    monkeypatch.setattr(threading.Thread, "is_alive", lambda self: True)
+    out = io.StringIO()
+    runner = threading.Thread(
+        target=follow,
+        args=(io.BytesIO(b"1\n2\n3\n"), out, Renderer(), 3),
+        daemon=True,
+    )
+    runner.start()
+    runner.join(5)
+    assert out.getvalue().endswith(sparklines([1, 2, 3])[0] + "\n")
+
+
+def test_frame_redraw() -> None:
+    """Test moving back over the previous frame, with and without ANSI."""
+    assert _frame(["ab", "cd"], 0, True, 0) == "ab\ncd"
+    assert _frame(["ab", "cd"], 3, True, 2) == "\r\x1b[2A\x1b[Jab\ncd"
+    assert _frame(["a"], 1, False, 3) == "\ra  "
+    with pytest.raises(ValueError):
+        follow(io.BytesIO(), io.StringIO(), Renderer(), window=0)
+
+
+async def _samples(
+    values: list[Optional[float]], pause: float = 0.0, fail: bool = False
+) -> AsyncIterator[Optional[float]]:
+    for v in values:
+        await asyncio.sleep(pause)
+        yield v
+    if fail:
+        raise OSError("sensor lost")
+
+
+def test_stream_coalesces_bursts() -> None:
+    """Test that a burst of samples gives a few frames, the last one complete."""
+    values: list[Optional[float]] = [(i * 7) % 11 for i in range(5000)]
+    values[-3] = None
+
+    async def run() -> list[list[str]]:
+        stream = sparkline_stream(_samples(values), window=40, max_fps=20)
+        return [lines async for lines in stream]
+
+    frames = asyncio.run(run())
+    assert 1 <= len(frames) < 10
+    assert frames[-1] == sparklines(values[-40:])
+
+
+def test_stream_rate_limited() -> None:
+    """Test that frames are max_fps apart at most, however fast samples come."""
+
+    async def run() -> list[float]:
+        loop = asyncio.get_running_loop()
+        stream = sparkline_stream(_samples(list(range(60)), 0.005), 10, max_fps=20)
+        return [loop.time() async for _ in stream]
+
+    # The last frame is drawn as soon as the samples end.
+    times = asyncio.run(run())[:-1]
+    assert 2 <= len(times) <= 12
+    assert min(b - a for a, b in zip(times, times[1:])) >= 0.045
+
+
+def test_stream_errors_and_early_exit() -> None:
+    """Test that source errors are raised and breaking out stops the reader."""
+
+    async def failing() -> None:
+        async for _ in sparkline_stream(_samples([1, 2], fail=True), 5):
+            pass
+
+    with pytest.raises(OSError, match="sensor lost"):
+        asyncio.run(failing())
+
+    async def first_frame() -> list[str]:
+        stream = sparkline_stream(_samples([3, 1, 4], pause=0.01), 5, num_lines=2)
+        async for lines in stream:
+            await stream.aclose()
+            return lines
+        return []
+
+    assert asyncio.run(first_frame()) == sparklines([3], num_lines=2)
+
+    async def no_window() -> None:
+        async for _ in sparkline_stream(_samples([1]), window=0):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(no_window())
+    assert sparklines_module.sparkline_stream is sparkline_stream
@@ -0,0 +1,68 @@
+"""Tests for SeriesIndex: range aggregation from the pyramid and persistence."""
+
+import random
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from sparklines import SeriesIndex, downsample, sparklines
+
+
+def _data(n: int) -> list[Optional[float]]:
+    rng = random.Random(5)
+    return [None if rng.random() < 0.05 else rng.uniform(-50, 100) for _ in range(n)]
+
+
+@pytest.mark.parametrize("start,stop,width", [(0, None, 40), (13, 777, 17), (5, 9, 80)])
+@pytest.mark.parametrize("reducer", ["max", "min", "mean"])
+def test_aggregate_matches_downsample(
+    start: int, stop: Optional[int], width: int, reducer: str
+) -> None:
+    """Test that pyramid aggregation equals downsampling the sliced series."""
+    data = _data(1000)
+    index = SeriesIndex(data)
+    res = index.aggregate(start, stop, width, reducer)  # type: ignore[arg-type]
+    exp = downsample(data[start:stop], width, reducer)  # type: ignore[arg-type]
+    assert res == pytest.approx(exp)
+
+
+def test_aggregate_empty_bucket_and_range() -> None:
+    """Test that all-missing buckets are gaps and empty ranges are empty."""
+    index = SeriesIndex([1.0, None, None, 4.0, float("nan"), None])
+    assert index.aggregate(width=3) == [1.0, 4.0, None]
+    assert index.aggregate(4, 2) == []
+    assert len(SeriesIndex([])) == 0
+    assert len(SeriesIndex()) == 0
+
+
+def test_ndarray_input() -> None:
+    """Test that an ndarray is indexed like a list, NaN as missing."""
+    np = pytest.importorskip("numpy")
+    data = [3.0, 1.0, None, 4.0, 1.0, 5.0]
+    arr = np.array([np.nan if v is None else v for v in data])
+    assert SeriesIndex(arr).aggregate(width=3) == SeriesIndex(data).aggregate(width=3)
+    assert len(SeriesIndex(np.arange(10.0))) == 10
+
+
+def test_render_passes_options() -> None:
+    """Test that render() feeds the aggregate into sparklines()."""
+    data = [float(i) for i in range(1000)]
+    index = SeriesIndex(data)
+    assert index.render(width=8) == sparklines(downsample(data, 8))
+    assert len(index.render(0, 500, width=10, num_lines=3)) == 3
+
+
+def test_save_load_roundtrip(tmp_path: Path) -> None:
+    """Test that a saved index loads back with identical aggregates."""
+    data = _data(333)
+    index = SeriesIndex(data)
+    path = str(tmp_path / "series.spkidx")
+    index.save(path)
+    loaded = SeriesIndex.load(path)
+    assert len(loaded) == 333
+    assert loaded.aggregate(10, 300, 25, "mean") == index.aggregate(10, 300, 25, "mean")
+
+    (tmp_path / "bad").write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        SeriesIndex.load(str(tmp_path / "bad"))
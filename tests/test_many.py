@@ -0,0 +1,61 @@
+"""Tests for sparklines_many: batch rendering of many series."""
+
+import random
+from typing import Any, Optional
+
+import pytest
+
+from sparklines import sparklines, sparklines_many
+
+Matrix = list[list[Optional[float]]]
+
+
+def _matrix(rows: int, cols: int, seed: int) -> Matrix:
+    rng = random.Random(seed)
+    matrix: Matrix = []
+    for r in range(rows):
+        lo = -50 if r % 5 == 3 else 0
+        hi = 0 if r % 5 == 4 else 100
+        row: list[Optional[float]] = [
+            None if rng.random() < 0.1 else round(rng.uniform(lo, hi), 1)
+            for _ in range(cols)
+        ]
+        matrix.append(row)
+    matrix[1] = [7.0] * cols
+    matrix[2] = [None] * cols
+    return matrix
+
+
+@pytest.mark.parametrize(
+    "kw",
+    [{}, {"num_lines": 3}, {"minimum": 10, "maximum": 60}, {"wrap": 7}],
+)
+def test_many_matches_sparklines(engine: str, kw: dict[str, Any]) -> None:
+    """Test that every row renders exactly as sparklines() renders it."""
+    matrix = _matrix(20, 30, 1)
+    assert sparklines_many(matrix, **kw) == [sparklines(row, **kw) for row in matrix]
+
+
+def test_many_global_scale(engine: str) -> None:
+    """Test that scale="global" shares the bounds of the whole matrix."""
+    matrix: Matrix = [[1, 2, 3], [3, 5, None], [9, 9, 9]]
+    exp = [sparklines(row, minimum=1, maximum=9) for row in matrix]
+    assert sparklines_many(matrix, scale="global") == exp
+    joined = sparklines_many(matrix, num_lines=2, scale="global", joined=True)
+    assert joined.split("\n") == [
+        line for row in matrix for line in sparklines(row, 2, minimum=1, maximum=9)
+    ]
+
+
+def test_many_ndarray_and_ragged(engine: str) -> None:
+    """Test ndarray input (NaN as a gap) and rows of different lengths."""
+    matrix: Matrix = [[3, 1, 4], [1, None, 9, 2]]
+    assert sparklines_many(matrix) == [sparklines(row) for row in matrix]
+    if engine == "numpy":
+        np = pytest.importorskip("numpy")
+        arr: Any = np.array([[3, 1, 4, np.nan], [1, 5, 9, 2]])
+        assert sparklines_many(arr) == [["▆▁█ "], ["▁▄█▂"]]
+        mixed: Any = np.array([[1, np.nan, -2, 3], [1, 5, 9, 2]])
+        assert sparklines_many(mixed)[0] == sparklines([1, None, -2, 3])
+    with pytest.raises(ValueError):
+        sparklines_many(matrix, scale="rows")  # type: ignore[call-overload]
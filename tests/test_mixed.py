@@ -5,9 +5,11 @@ Covers inverted bars, auto-split, row allocation, zero handling, and scaling.
 
 import math
 import os
+import random
 
 
-from sparklines import sparklines
+from sparklines import RenderContext, sparklines
+from sparklines.ansi import _inverted_char
 from sparklines.sparklines import allocate_rows, ideal_num_rows
 from tests.helpers import strip_ansi
 
@@ -88,6 +90,25 @@ def test_inverted_no_color_fallback() -> None:
             os.environ["NO_COLOR"] = orig
 
 
+def test_inverted_explicit_context() -> None:
+    """Test that an explicit RenderContext overrides the detected environment."""
+    data: list[float] = [3, 1, -4, 1, -5, 9, 2, 6]
+    plain = sparklines(data, context=RenderContext(ansi=False))
+    assert "\x1b[" not in plain[1]
+    assert strip_ansi(plain[1]) == plain[1]
+    assert any(ch in plain[1] for ch in "▔▀█")
+    assert sparklines(data, context=RenderContext()) == sparklines(data)
+
+
+def test_inverted_glyph_table_matches_char() -> None:
+    """Test that context glyph tables match _inverted_char for every level."""
+    ctx = RenderContext.detect()
+    for color in (None, "red"):
+        glyphs = ctx.down_glyphs(color)
+        assert list(glyphs) == [_inverted_char(v, color) for v in range(9)]
+        assert ctx.down_glyphs(color) is glyphs
+
+
 # ---------------------------------------------------------------------------
 # Auto-split detection
 # ---------------------------------------------------------------------------
@@ -156,6 +177,39 @@ def test_proportional_6_4() -> None:
     assert allocate_rows(6, 4, 5) == (3, 2)
 
 
+def _allocate_rows_scan(pos_max: float, neg_max: float, n: int) -> tuple[int, int]:
+    """Reference allocation scanning every split, as allocate_rows originally did."""
+    if n == 2:
+        return 1, 1
+    ideal_i = n * pos_max / (pos_max + neg_max)
+    keys = [
+        (abs(pos_max * (n - i) - neg_max * i), abs(2 * i - n), abs(i - ideal_i), i)
+        for i in range(1, n)
+    ]
+    best = min(keys, key=lambda k: k[:3] + (abs(k[3] - round(ideal_i)),))
+    return best[3], n - best[3]
+
+
+def test_allocate_rows_matches_full_scan() -> None:
+    """Test the windowed search against a full scan, including tie-breaking."""
+    rng = random.Random(3)
+    pairs = [(float(a), float(b)) for a in range(1, 13) for b in range(1, 13)]
+    pairs += [(rng.uniform(0.001, 1e6), rng.uniform(0.001, 1e6)) for _ in range(300)]
+    pairs += [(1e-12, 3e-12), (math.pi, math.e), (1.0, 99.0), (99.0, 1.0)]
+    for pos_max, neg_max in pairs:
+        for n in (2, 3, 4, 5, 7, 10, 17, 64, 100):
+            exp = _allocate_rows_scan(pos_max, neg_max, n)
+            assert allocate_rows(pos_max, neg_max, n) == exp, (pos_max, neg_max, n)
+
+
+def test_ideal_num_rows_cached() -> None:
+    """Test that repeated auto layouts for the same range are served from cache."""
+    ideal_num_rows.cache_clear()
+    assert ideal_num_rows(7.5, 2.5) == 4
+    assert ideal_num_rows(7.5, 2.5) == 4
+    assert ideal_num_rows.cache_info().hits == 1
+
+
 # ---------------------------------------------------------------------------
 # Key worked dataset: [1,2,3,-1,-2,-3,0,4,5,6]  pos_max=6, neg_max=3
 # ---------------------------------------------------------------------------
@@ -0,0 +1,62 @@
+"""Tests for chunk-parallel rendering with workers=."""
+
+import random
+from array import array
+from typing import Any, Optional
+
+import pytest
+
+from sparklines import Renderer, RenderContext, iter_sparklines, sparklines
+from sparklines import parallel
+
+COLOR = RenderContext(ansi=True, termcolor=True)
+
+
+def _series(n: int, lo: float, hi: float, seed: int) -> list[Optional[float]]:
+    rng = random.Random(seed)
+    return [
+        None if rng.random() < 0.05 else round(rng.uniform(lo, hi), 1) for _ in range(n)
+    ]
+
+
+@pytest.fixture
+def engine(engine: str, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Render in parallel from 100 points, in colour, with either engine."""
+    monkeypatch.setenv("FORCE_COLOR", "1")
+    monkeypatch.setattr(parallel, "PARALLEL_THRESHOLD", 100)
+    monkeypatch.setattr("sparklines.renderer.PARALLEL_THRESHOLD", 100)
+    return engine
+
+
+@pytest.mark.parametrize("lo, hi", [(0, 100), (-100, 0), (-50, 100)])
+@pytest.mark.parametrize(
+    "kw",
+    [
+        {},
+        {"num_lines": 3, "wrap": 45},
+        {"num_lines": 2, "emph": ["red:gt:60", "green:lt:20", "blue:[90:130]"]},
+        {"emph": ["blue:[0:5]"]},
+        {"wrap": 70, "emph": ["red:ge:0", "blue:[5:15]"], "minimum": 10},
+    ],
+)
+def test_workers_match_serial(
+    engine: str, lo: float, hi: float, kw: dict[str, Any]
+) -> None:
+    """Test that rendering in chunks gives exactly the serial output."""
+    numbers = _series(500, lo, hi, seed=int(hi - lo))
+    expected = sparklines(numbers, context=COLOR, **kw)
+    assert sparklines(numbers, context=COLOR, workers=2, **kw) == expected
+    lines = iter_sparklines(numbers, context=COLOR, workers=3, **kw)
+    assert list(lines) == expected
+    buf = array("d", [float("nan") if v is None else v for v in numbers])
+    assert sparklines(buf, context=COLOR, workers=2, **kw) == expected
+
+
+def test_chunk_bounds() -> None:
+    """Test that chunks cover the series and hold whole wrap windows."""
+    bounds = parallel._chunk_bounds(1000, 2, 30)
+    assert bounds[0][0] == 0 and bounds[-1][1] == 1000
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+    assert all(start % 30 == 0 for start, _ in bounds)
+    with pytest.raises(ValueError):
+        Renderer(workers=0)
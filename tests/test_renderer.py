@@ -0,0 +1,95 @@
+"""Tests for the reusable Renderer and the sparklines() wrapper around it."""
+
+import io
+from typing import Any, Optional
+
+import pytest
+
+from sparklines import (
+    NumLines,
+    Renderer,
+    RenderContext,
+    iter_sparklines,
+    sparklines,
+    write_sparklines,
+)
+from sparklines.sparklines import _renderer
+
+SERIES: list[list[Optional[float]]] = [
+    [3, 1, 4, 1, 5, 9, 2, 6],
+    [-3, -1, None, -4],
+    [3, -1, 4, -1, 5, -9, 2, -6],
+    [None],
+    [],
+]
+
+
+@pytest.mark.parametrize(
+    "kw",
+    [
+        {},
+        {"num_lines": 2, "wrap": 3},
+        {"num_lines": "auto", "emph": ["red:gt:3", "blue:[0:2]"]},
+        {"num_lines": (2, 1), "zero": "none"},
+        {"minimum": 0, "maximum": 10, "width": 4, "reducer": "mean"},
+    ],
+)
+def test_renderer_matches_sparklines(kw: dict[str, Any]) -> None:
+    """Test that render(), render_many(), iter_lines() and write() agree."""
+    context = RenderContext(ansi=True, termcolor=True)
+    renderer = Renderer(context=context, **kw)
+    expected = [sparklines(s, context=context, **kw) for s in SERIES]
+    assert [renderer.render(s) for s in SERIES] == expected
+    plain = Renderer(**kw)
+    assert [plain.render(s, context=context) for s in SERIES] == expected
+    assert renderer.render_many(SERIES) == expected
+    assert [list(renderer.iter_lines(s)) for s in SERIES] == expected
+    out = io.StringIO()
+    renderer.write(out, SERIES[0])
+    assert out.getvalue() == "".join(line + "\n" for line in expected[0])
+
+
+def test_renderer_rows() -> None:
+    """Test that up_rows and down_rows resolve num_lines for one-sided series."""
+    cases: list[tuple[NumLines, tuple[int, int]]] = [
+        (1, (1, 1)),
+        (4, (4, 4)),
+        ((3, 2), (3, 2)),
+        ("auto", (1, 1)),
+    ]
+    for num_lines, rows in cases:
+        renderer = Renderer(num_lines=num_lines)
+        assert (renderer.up_rows, renderer.down_rows) == rows
+
+
+def test_renderer_validates_once() -> None:
+    """Test that invalid options are rejected by the constructor."""
+    with pytest.raises(ValueError):
+        Renderer(num_lines=0)
+    with pytest.raises(ValueError):
+        Renderer(width=0)
+    with pytest.raises(ValueError):
+        Renderer(reducer="median")  # type: ignore[arg-type]
+
+
+def test_sparklines_reuses_renderer() -> None:
+    """Test that repeated sparklines() calls share one cached Renderer."""
+    _renderer.cache_clear()
+    for values in SERIES:
+        sparklines(values, num_lines=2, emph=["red:gt:3"])
+    info = _renderer.cache_info()
+    assert (info.misses, info.hits) == (1, len(SERIES) - 1)
+
+    for _ in range(3):
+        sparklines([1, 2], num_lines=2, emph=["red:gt:3"], context=RenderContext())
+    assert _renderer.cache_info().misses == 1
+
+
+def test_sparklines_validates_before_caching() -> None:
+    """Test that an unhashable num_lines is rejected with ValueError."""
+    with pytest.raises(ValueError):
+        sparklines([1, 2], num_lines=[2, 1])  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        list(iter_sparklines([1, 2], num_lines=[2, 1]))  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        write_sparklines(io.StringIO(), [1, 2], num_lines=[2, 1])
@@ -1,6 +1,12 @@
 """Tests for scale_values and batch."""
 
-from sparklines import batch, scale_values
+from collections.abc import Iterator
+from typing import Optional
+
+import pytest
+
+from sparklines import batch, scale_values, sparklines
+from sparklines.scale import _scan
 
 
 def test_scale0() -> None:
@@ -31,3 +37,34 @@ def test_batch() -> None:
 
     batches = batch(None, range(3))
     assert batches == [[0, 1, 2]]
+
+
+def test_scan() -> None:
+    """Test that one scan yields count, bounds, sign maxima and missing flags."""
+    scan = _scan([3, None, -4, 1, None])
+    assert scan[:5] == (3, -4, 3, 3, 4)
+    assert list(scan.missing) == [0, 1, 0, 0, 1]
+    assert _scan([None])[:5] == (0, 0.0, 0.0, 0.0, 0.0)
+    assert _scan([-2, -1]).pos_max == 0.0
+
+
+class CountingList(list[Optional[float]]):
+    """List that counts how often it is iterated over."""
+
+    passes = 0
+
+    def __iter__(self) -> Iterator[Optional[float]]:
+        """Count the pass, then iterate as usual."""
+        CountingList.passes += 1
+        return super().__iter__()
+
+
+@pytest.mark.parametrize(
+    "numbers,max_passes",
+    [([3, 1, None, 5], 2), ([-3, -1, None, -5], 2), ([3, -1, None, 5], 2)],
+)
+def test_render_passes(numbers: list[Optional[float]], max_passes: int) -> None:
+    """Test that rendering does not re-scan the input for each step."""
+    CountingList.passes = 0
+    sparklines(CountingList(numbers), num_lines=2)
+    assert CountingList.passes <= max_passes
@@ -0,0 +1,162 @@
+"""Tests for the render daemon and its client over a Unix socket."""
+
+import asyncio
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from sparklines import Renderer, RenderContext, sparklines
+from sparklines.__main__ import main
+from sparklines.client import request
+from sparklines.serve import RenderServer, start_server
+
+PLAIN = RenderContext(ansi=False)
+
+
+def test_push_keeps_window_per_key() -> None:
+    """Test that each key renders the last window values pushed to it."""
+    server = RenderServer(Renderer(context=PLAIN, num_lines=2), window=4)
+    for v in [3, 1, 4, 1, 5]:
+        server.push("a", [v])
+    server.push("b", [None, 2])
+    assert server.push("a") == sparklines([1, 4, 1, 5], num_lines=2)
+    assert server.push("b", [7]) == sparklines([None, 2, 7], num_lines=2)
+    with pytest.raises(ValueError):
+        RenderServer(Renderer(), window=0)
+
+
+def test_keys_are_capped() -> None:
+    """Test that beyond max_keys, the least recently used key is dropped."""
+    server = RenderServer(Renderer(context=PLAIN), max_keys=3)
+    for key in "abc":
+        server.push(key, [1])
+    server.push("a", [2])
+    server.push("d", [3])
+    assert list(server.histories) == ["c", "a", "d"]
+    assert server.push("b") == [""]
+    assert list(server.histories) == ["a", "d", "b"]
+    with pytest.raises(ValueError):
+        RenderServer(Renderer(), max_keys=0)
+
+
+def test_reply_protocol() -> None:
+    """Test the framing of responses and the rejection of empty requests."""
+    server = RenderServer(Renderer(context=PLAIN))
+    line = sparklines([1, None, 2])[0]
+    assert server.reply(b"k 1 null 2\n") == f"+1\n{line}\n".encode()
+    assert server.reply(b" \n").startswith(b"-")
+    assert server.reply(b"\xff 1\n").startswith(b"-")
+
+
+def test_non_finite_values_are_missing() -> None:
+    """Test that nan and inf are kept as gaps and do not break the key."""
+    server = RenderServer(Renderer(context=PLAIN))
+    line = sparklines([None, None, None, 3])[0]
+    assert server.reply(b"k inf nan -inf\n") == b"+1\n\n"
+    assert server.reply(b"k 3\n") == f"+1\n{line}\n".encode()
+
+
+def test_render_errors_are_replies(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a failing render is answered with -message, not dropped."""
+
+    def fail(*args: object, **kwargs: object) -> list[str]:
+        raise ValueError("cannot render")
+
+    server = RenderServer(Renderer(context=PLAIN))
+    monkeypatch.setattr(Renderer, "render", fail)
+    assert server.reply(b"k 1\n") == b"-cannot render\n"
+
+
+def test_many_concurrent_clients(tmp_path: Path) -> None:
+    """Test that concurrent clients, one-shot or persistent, are all answered."""
+    path = str(tmp_path / "s.sock")
+    server = RenderServer(Renderer(context=PLAIN), window=100)
+
+    async def run() -> list[bytes]:
+        async with await start_server(server, path):
+            await asyncio.gather(
+                *(asyncio.to_thread(request, f"k{i % 4}", [i], path) for i in range(40))
+            )
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"x 1\nx 2\n")
+            replies = [await reader.readline() for _ in range(4)]
+            writer.close()
+            return replies
+
+    replies = asyncio.run(run())
+    assert sorted(len(h) for h in server.histories.values()) == [2, 10, 10, 10, 10]
+    assert replies[2:] == [b"+1\n", (sparklines([1, 2])[0] + "\n").encode()]
+
+
+def test_socket_checks(tmp_path: Path) -> None:
+    """Test that stale sockets are replaced and other files are left alone."""
+    stale = str(tmp_path / "stale.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(stale)
+    server = RenderServer(Renderer(context=PLAIN))
+
+    async def run() -> list[str]:
+        async with await start_server(server, stale):
+            assert stat.S_IMODE(os.stat(stale).st_mode) == 0o600
+            return await asyncio.to_thread(request, "k", [1.0], stale)
+
+    umask = os.umask(0)
+    try:
+        assert asyncio.run(run()) == sparklines([1])
+    finally:
+        os.umask(umask)
+    (tmp_path / "file").write_text("")
+    with pytest.raises(FileExistsError):
+        asyncio.run(start_server(server, str(tmp_path / "file")))
+    with pytest.raises(ValueError):
+        request("two words", [1], stale)
+    with pytest.raises(OSError):
+        request("k", [1], str(tmp_path / "missing.sock"))
+
+
+def test_sockets_of_other_users_are_refused(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that neither side uses a socket another user created."""
+    path = str(tmp_path / "other.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(path)
+        sock.listen()
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(path).st_uid + 1)
+        with pytest.raises(PermissionError):
+            request("k", [1], path)
+        with pytest.raises(FileExistsError):
+            asyncio.run(start_server(RenderServer(Renderer()), path))
+
+
+def test_cli_serve_and_client(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test --serve in a subprocess with --client requests, and SIGTERM."""
+    path = tmp_path / "s.sock"
+    cmd = [sys.executable, "-m", "sparklines", "--serve", "--socket", str(path)]
+    daemon = subprocess.Popen([*cmd, "-n", "2", "--window", "3"])
+    try:
+        for _ in range(200):
+            if path.exists():
+                break
+            time.sleep(0.05)
+        for v in ["5", "1", "null", "7"]:
+            main(["--client", "cpu", v, "--socket", str(path)])
+        capsys.readouterr()
+        main(["--client", "cpu", "--socket", str(path)])
+        assert capsys.readouterr()[0] == "\n".join(
+            sparklines([1, None, 7], num_lines=2, context=PLAIN) + [""]
+        )
+    finally:
+        daemon.terminate()
+        assert daemon.wait(10) == 0
+    assert not path.exists()
+    with pytest.raises(SystemExit):
+        main(["--client", "cpu", "1", "--socket", str(path)])
@@ -0,0 +1,88 @@
+"""Tests for SharedSeries: a single-writer ring in shared memory."""
+
+import multiprocessing
+import subprocess
+import sys
+
+import pytest
+
+from sparklines import sparklines
+from sparklines import vector
+from sparklines.scale import scale_values
+from sparklines.shared import SharedSeries
+
+
+def _produce(series: SharedSeries, n: int) -> None:
+    series.extend(float(i % 17) for i in range(n))
+    series.close()
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+def test_window_renders_in_place(monkeypatch: pytest.MonkeyPatch, numpy: bool) -> None:
+    """Test that windows are the last values, read by sparklines as they are."""
+    if numpy and not vector.HAVE_NUMPY:
+        pytest.skip("numpy is not installed")
+    monkeypatch.setattr(vector, "HAVE_NUMPY", numpy)
+    monkeypatch.setattr(vector, "NUMPY_THRESHOLD", 0)
+    with SharedSeries(8) as series:
+        assert len(series.window()) == 0
+        series.extend([3, 1, 4, 1, 5, 9, 2, 6, 5, None, 5])
+        window = series.window(6)
+        expected = [9, 2, 6, 5, None, 5]
+        assert list(window) == expected
+        assert sparklines(window, num_lines=2) == sparklines(expected, num_lines=2)
+        assert scale_values(window) == scale_values(expected)
+        assert list(series.window()) == [1, 5, *expected]
+        del window
+
+
+def test_window_is_a_view() -> None:
+    """Test that a window is untouched until capacity - size more pushes."""
+    with SharedSeries(8) as series:
+        series.extend(range(10))
+        window = series.window(5)
+        series.extend([10, 11, 12])
+        assert list(window) == [5, 6, 7, 8, 9]
+        series.push(13)
+        assert list(window) == [13, 6, 7, 8, 9]
+        del window
+    with pytest.raises(ValueError):
+        SharedSeries(0)
+
+
+def test_producer_process() -> None:
+    """Test that a producer in another process writes to the same series."""
+    with SharedSeries(100) as series:
+        ctx = multiprocessing.get_context("spawn")
+        producer = ctx.Process(target=_produce, args=(series, 1000))
+        producer.start()
+        producer.join()
+        assert producer.exitcode == 0
+        assert series.sequence == 1000
+        assert list(series.window(3)) == [float(i % 17) for i in range(997, 1000)]
+        reader = SharedSeries.attach(series.name)
+        assert reader.capacity == 100 and reader.sequence == 1000
+        reader.close()
+
+
+def test_attach_from_unrelated_process() -> None:
+    """Test that a process attaching by name leaves the series in place."""
+    with SharedSeries(4) as series:
+        series.extend([1, 2])
+        code = (
+            "import sys\n"
+            "from sparklines.shared import SharedSeries\n"
+            "series = SharedSeries.attach(sys.argv[1])\n"
+            "series.push(3)\n"
+            "series.close()\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, series.name],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stderr == ""
+        reader = SharedSeries.attach(series.name)
+        assert list(reader.window()) == [1, 2, 3]
+        reader.close()
@@ -0,0 +1,95 @@
+"""Tests for import-time and CLI startup: what is loaded, and how long it takes."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Microseconds that importing each module may take (bytecode cached), well
+# above what it takes on a laptop (about 40 and 55 ms) to absorb slow CI.
+IMPORT_BUDGET_US = {"sparklines": 120_000, "sparklines.__main__": 160_000}
+
+# Modules that only some inputs or options need, loaded when they are used.
+LAZY_MODULES = [
+    "numpy",
+    "termcolor",
+    "concurrent.futures",
+    "multiprocessing",
+    "importlib.metadata",
+    "csv",
+    "ast",
+    "sparklines.follow",
+    "sparklines.serve",
+    "sparklines.state",
+    "sparklines.shared",
+    "asyncio",
+]
+
+
+# Ordinary CLI runs that must load neither NumPy nor asyncio. --client gets
+# no answer here, but imports everything it needs before connecting.
+CLI_RUNS = {
+    "stdin": [],
+    "state": ["--state", "{tmp}/history", "--push", "3", "--window", "8"],
+    "client": ["--client", "cpu", "3", "--socket", "{tmp}/missing.sock"],
+}
+
+
+def _run(code: str, pycache: Path, *options: str) -> str:
+    """Run code in a fresh interpreter and return its stderr."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    cmd = [sys.executable, *options, "-X", f"pycache_prefix={pycache}", "-c", code]
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    return result.stderr
+
+
+def _import_times(code: str, pycache: Path) -> dict[str, int]:
+    """Return the cumulative import time of the top-level imports of code."""
+    times = {}
+    for line in _run(code, pycache, "-X", "importtime").splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_US))
+def test_lazy_modules_not_imported(module: str, tmp_path: Path) -> None:
+    """Test that importing sparklines loads no optional or rarely used module."""
+    code = (
+        f"import sys, {module}\n"
+        f"sys.stderr.write(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    assert _run(code, tmp_path) == ""
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_US))
+def test_import_time_budget(module: str, tmp_path: Path) -> None:
+    """Test that importing sparklines stays within its budget."""
+    _run(f"import {module}", tmp_path)  # compile once
+    best = min(_import_times(f"import {module}", tmp_path)[module] for _ in range(3))
+    assert best < IMPORT_BUDGET_US[module]
+
+
+@pytest.mark.parametrize("run", sorted(CLI_RUNS))
+def test_cli_runs_stay_light(run: str, tmp_path: Path) -> None:
+    """Test that stdin input, --push and --client load neither NumPy nor asyncio."""
+    args = [arg.format(tmp=tmp_path) for arg in CLI_RUNS[run]]
+    code = (
+        "import runpy, sys\n"
+        f"sys.argv = ['sparklines', *{args!r}]\n"
+        "try:\n"
+        "    runpy.run_module('sparklines', run_name='__main__')\n"
+        "finally:\n"
+        "    heavy = [m for m in ('numpy', 'asyncio') if m in sys.modules]\n"
+        "    sys.stderr.write(f'\\nloaded: {heavy}')\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        input="3 1 4 1 5\n",
+        capture_output=True,
+        text=True,
+    )
+    assert result.stderr.splitlines()[-1] == "loaded: []"
@@ -0,0 +1,98 @@
+"""Tests for append mode: the memory-mapped ring of values in a history file."""
+
+import math
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from sparklines import sparklines
+from sparklines.__main__ import main
+from sparklines.state import RingFile
+
+
+def _values(ring: RingFile, size: int = 0) -> list[object]:
+    return [None if math.isnan(v) else v for v in ring.window(size)]
+
+
+def test_ring_wraps_and_persists(tmp_path: Path) -> None:
+    """Test that the last values are kept in order across wrap and reopening."""
+    path = str(tmp_path / "h")
+    with RingFile(path, 5) as ring:
+        assert _values(ring) == [] and ring.bounds == (None, None)
+        ring.push(range(12))
+        ring.push([None])
+        assert _values(ring) == [8, 9, 10, 11, None]
+        assert _values(ring, 3) == [10, 11, None]
+    with RingFile(path) as ring:
+        assert ring.capacity == 5 and ring.count == 13
+        assert ring.bounds == (0, 11)
+        assert _values(ring, 2) == [11, None]
+
+
+def test_ring_non_finite_values_are_missing(tmp_path: Path) -> None:
+    """Test that NaN and infinities are gaps, left out of the bounds."""
+    with RingFile(str(tmp_path / "h"), 5) as ring:
+        ring.push([2, math.inf, -math.inf, math.nan, 4])
+        assert _values(ring) == [2, None, None, None, 4]
+        assert ring.bounds == (2, 4)
+
+
+def test_ring_grows(tmp_path: Path) -> None:
+    """Test that opening with a larger capacity keeps the values in order."""
+    path = str(tmp_path / "h")
+    with RingFile(path, 4) as ring:
+        ring.push([1, 2, 3, 4, 5, 6])
+    with RingFile(path, 6) as ring:
+        ring.push([7])
+        assert ring.capacity == 6
+        assert _values(ring) == [3, 4, 5, 6, 7]
+        assert ring.bounds == (1, 7)
+
+
+def test_ring_rejects_other_files(tmp_path: Path) -> None:
+    """Test that files that are not histories are left alone."""
+    other = tmp_path / "other"
+    other.write_bytes(b"3 1 4 1 5 9 2 6 5 3 5 8 9 7 9 3 2 3 8 4 6 2 6 4 3 3 8 3 2")
+    with pytest.raises(ValueError):
+        RingFile(str(other))
+    assert other.read_bytes().startswith(b"3 1 4")
+    with pytest.raises(ValueError):
+        RingFile(str(tmp_path / "h"), 0)
+
+
+def _push_many(path: str, start: int) -> None:
+    with RingFile(path) as ring:
+        for v in range(start, start + 200):
+            ring.push([v])
+
+
+def test_concurrent_pushes(tmp_path: Path) -> None:
+    """Test that pushes from several processes are all kept (file locking)."""
+    path = str(tmp_path / "h")
+    RingFile(path, 1000).close()
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_push_many, args=(path, i * 200)) for i in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    with RingFile(path) as ring:
+        assert ring.count == 800
+        assert sorted(ring.window()) == list(range(800))
+
+
+def test_cli_state(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test --state with --push, --window and --scale."""
+    path = str(tmp_path / "h")
+    for v in ["3", "1", "4", "null", "5", "9"]:
+        main(["--state", path, "--push", v, "--window", "4"])
+    assert capsys.readouterr()[0].splitlines()[-1] == sparklines([4, None, 5, 9])[0]
+    main(["--state", path, "--window", "2", "--scale", "history"])
+    assert capsys.readouterr()[0] == sparklines([5, 9], minimum=1, maximum=9)[0] + "\n"
+    main(["--state", path, "--push", "1e309", "--window", "2", "--scale", "history"])
+    assert (
+        capsys.readouterr()[0] == sparklines([9, None], minimum=1, maximum=9)[0] + "\n"
+    )
+    with pytest.raises(SystemExit):
+        main(["--push", "1"])
@@ -0,0 +1,125 @@
+"""Tests for streaming input: incremental parsing and block-wise rendering."""
+
+import io
+import random
+import tracemalloc
+from typing import Any, Optional
+
+import pytest
+
+from sparklines import Renderer, write_sparklines
+from sparklines import stream
+from tests.helpers import pipe
+
+
+class Discard(io.StringIO):
+    """A text stream that counts and drops what is written."""
+
+    size = 0
+
+    def write(self, s: str) -> int:
+        """Count s."""
+        self.size += len(s)
+        return len(s)
+
+
+def _data(values: list[Optional[float]]) -> bytes:
+    return " \n".join("null" if v is None else str(v) for v in values).encode()
+
+
+def test_iter_numbers_across_reads() -> None:
+    """Test that tokens split between reads are parsed whole."""
+    data = b"3 1.25\n-4 null\t  5e1 none 9"
+    expected = [3.0, 1.25, -4.0, None, 50.0, None, 9.0]
+    for size in (1, 2, 3, 7, 100):
+        assert list(stream.iter_numbers(io.BytesIO(data), size)) == expected
+    assert list(stream.iter_numbers(io.BytesIO(b"  \n"))) == []
+
+
+@pytest.mark.parametrize("lo, hi", [(0, 100), (-100, 0), (-50, 80)])
+@pytest.mark.parametrize(
+    "kw",
+    [
+        {},
+        {"num_lines": 3},
+        {"num_lines": 2, "wrap": 70},
+        {"minimum": 0, "maximum": 100, "wrap": 45},
+        {"width": 30},
+        {"width": 25, "reducer": "minmax", "num_lines": 2},
+        {"width": 40, "reducer": "lttb"},
+        {"emph": ["red:gt:5"]},
+    ],
+)
+def test_write_stream_matches(
+    monkeypatch: pytest.MonkeyPatch, lo: float, hi: float, kw: dict[str, Any]
+) -> None:
+    """Test streamed output against write_sparklines, seekable and not.
+
+    With bounds, values below the minimum are drawn at the minimum.
+    """
+    monkeypatch.setattr(stream, "BLOCK_SIZE", 64)
+    rng = random.Random(int(hi - lo))
+    values: list[Optional[float]] = [
+        None if rng.random() < 0.1 else round(rng.uniform(lo, hi), 1)
+        for _ in range(500)
+    ]
+    clamped = values
+    if "minimum" in kw:
+        clamped = [v if v is None else max(v, kw["minimum"]) for v in values]
+    expected = io.StringIO()
+    write_sparklines(expected, clamped, **kw)
+    for source in (io.BytesIO(_data(values)), pipe(_data(values))):
+        out = io.StringIO()
+        stream.write_stream(out, source, Renderer(**kw))
+        assert out.getvalue() == expected.getvalue()
+
+
+def test_write_stream_empty() -> None:
+    """Test that input without values gives one blank line, like sparklines."""
+    options: list[dict[str, Any]] = [{}, {"minimum": 0, "maximum": 1}]
+    for kw in options:
+        out = io.StringIO()
+        stream.write_stream(out, io.BytesIO(b" \n"), Renderer(**kw))
+        assert out.getvalue() == "\n"
+
+
+def _peak_memory(lines: int, kw: dict[str, Any]) -> int:
+    source = pipe(b"3.5 7.25 null 1\n" * lines)
+    tracemalloc.start()
+    try:
+        stream.write_stream(Discard(), source, Renderer(**kw))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize(
+    "kw",
+    [
+        {"minimum": 0, "maximum": 8, "wrap": 80},
+        {"wrap": 80},
+        {"width": 80, "reducer": "minmax"},
+    ],
+)
+def test_pipe_memory_is_bounded(
+    monkeypatch: pytest.MonkeyPatch, kw: dict[str, Any]
+) -> None:
+    """Test that memory does not grow with piped input, spooled or not."""
+    monkeypatch.setattr(stream, "SPOOL_SIZE", 1 << 14)
+    small, large = _peak_memory(1 << 13, kw), _peak_memory(1 << 16, kw)
+    assert large < small * 1.5
+
+
+def test_bounded_pipe_is_drawn_as_read() -> None:
+    """Test that with bounds, the first window is written before the input ends."""
+    data = b"1 5 9 " * (1 << 16)
+    source = pipe(data)
+    read_at_write: list[int] = []
+
+    class Out(Discard):
+        def write(self, s: str) -> int:
+            read_at_write.append(source.raw._data.tell())  # type: ignore[attr-defined]
+            return super().write(s)
+
+    stream.write_stream(Out(), source, Renderer(minimum=0, maximum=9, wrap=60))
+    assert read_at_write[0] < len(data) // 2
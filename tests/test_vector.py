@@ -0,0 +1,103 @@
+"""Tests for the optional NumPy-vectorized engine: identical output to pure Python."""
+
+import math
+import random
+from typing import Any, Optional
+
+import pytest
+
+from sparklines import compile_emphasis, scale_values, sparklines
+from sparklines import vector
+
+np = pytest.importorskip("numpy")
+
+
+def _series(n: int, seed: int, lo: float, hi: float) -> list[Optional[float]]:
+    rng = random.Random(seed)
+    return [None if rng.random() < 0.1 else rng.uniform(lo, hi) for _ in range(n)]
+
+
+def _both(monkeypatch: pytest.MonkeyPatch, func: Any, *args: Any, **kw: Any) -> Any:
+    """Return (pure-Python result, vectorized result) of func(*args, **kw)."""
+    with monkeypatch.context() as m:
+        m.setattr(vector, "HAVE_NUMPY", False)
+        slow = func(*args, **kw)
+    with monkeypatch.context() as m:
+        m.setattr(vector, "NUMPY_THRESHOLD", 0)
+        fast = func(*args, **kw)
+    return slow, fast
+
+
+@pytest.mark.parametrize("num_lines", [1, 2, 3])
+def test_scale_values_identical(
+    monkeypatch: pytest.MonkeyPatch, num_lines: int
+) -> None:
+    """Test that vectorized scaling matches the Python path, including gaps."""
+    data = _series(500, 1, 0, 100) + [0.5, 1.5, 2.5]
+    slow, fast = _both(monkeypatch, scale_values, data, num_lines=num_lines)
+    assert slow == fast
+    slow, fast = _both(monkeypatch, scale_values, data, minimum=20, maximum=60)
+    assert slow == fast
+
+
+def test_scale_values_constant(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the flat-series case (dv == 0)."""
+    slow, fast = _both(monkeypatch, scale_values, [3, None, 3], num_lines=2)
+    assert slow == fast == [8, None, 8]
+
+
+@pytest.mark.parametrize("data", [[1, None, 2], [-1, None, -2], [3, None, 3]])
+def test_short_nan_list_identical(
+    monkeypatch: pytest.MonkeyPatch, data: list[Optional[float]]
+) -> None:
+    """Test that NaN in a short list is a gap on both engines, like None."""
+    nans = [math.nan if v is None else v for v in data]
+    expected = sparklines(data, num_lines=2, emph=["red:gt:1"])
+    slow, fast = _both(monkeypatch, sparklines, nans, num_lines=2, emph=["red:gt:1"])
+    assert slow == fast == expected
+    slow, fast = _both(monkeypatch, scale_values, nans)
+    assert slow == fast == scale_values(data)
+
+
+@pytest.mark.parametrize(
+    "kw",
+    [
+        {},
+        {"num_lines": 3},
+        {"wrap": 37},
+        {"emph": ["red:gt:50", "blue:[::7]"]},
+        {"num_lines": 2, "wrap": 50, "emph": ["green:le:10"]},
+    ],
+)
+@pytest.mark.parametrize("lo,hi", [(0, 100), (-100, 0)])
+def test_sparklines_identical(
+    monkeypatch: pytest.MonkeyPatch, kw: dict[str, Any], lo: float, hi: float
+) -> None:
+    """Test that rendered output is byte-identical for positive and negative data."""
+    data = _series(300, 2, lo, hi)
+    slow, fast = _both(monkeypatch, sparklines, data, **kw)
+    assert slow == fast
+
+
+def test_ndarray_input_nan_is_gap() -> None:
+    """Test that an ndarray is accepted directly, with NaN rendered as a gap."""
+    arr = np.array([3, 1, 4, 1, 5, 9, 2, 6, np.nan])
+    assert sparklines(arr) == ["▃▁▄▁▄█▂▅ "]
+    assert sparklines(np.array([np.nan])) == [""]
+
+
+def test_ndarray_mixed_sign_nan_is_gap() -> None:
+    """Test that NaN is a gap in mixed positive/negative ndarray input."""
+    data = [1.0, None, -2.0, 3.0]
+    arr = np.array([np.nan if v is None else v for v in data])
+    assert sparklines(arr) == sparklines(data)
+    assert sparklines(arr, num_lines=4, wrap=3) == sparklines(data, num_lines=4, wrap=3)
+
+
+def test_emphasis_identical(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that vectorized emphasis evaluation matches the Python path."""
+    data = _series(400, 3, -10, 10)
+    rules = ["red:gt:5", "blue:[::3]", "green:le:-2", "yellow:[-20:]", "red:eq:0"]
+    compiled = compile_emphasis(rules)
+    slow, fast = _both(monkeypatch, lambda d: compiled.evaluate(d).to_dict(), data)
+    assert slow == fast
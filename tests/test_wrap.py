@@ -1,6 +1,12 @@
 """Tests for line-wrapping behaviour, including mixed positive/negative data."""
 
-from sparklines import sparklines
+import io
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import pytest
+
+from sparklines import iter_sparklines, render, sparklines, vector, write_sparklines
 from tests.helpers import strip_ansi
 
 
@@ -93,3 +99,74 @@ def test_wrap_all_negative_unaffected() -> None:
     res = [strip_ansi(line) for line in sparklines([-1, -2, -3, -4], wrap=2)]
     assert len(res) == 3
     assert res[1] == ""
+
+
+@pytest.mark.parametrize(
+    "numbers,kw",
+    [
+        ([], {}),
+        ([None, None], {}),
+        ([1, 2, 3, 1, 2, 3, 1, 2], {"wrap": 3}),
+        ([3, -1, 4, -1, 5, -9, 2, -6], {"wrap": 3, "num_lines": 2}),
+        ([-3, -1, -4, None, -5], {"wrap": 2}),
+    ],
+)
+def test_iter_and_write_match_sparklines(
+    numbers: list[Optional[float]], kw: dict[str, Any]
+) -> None:
+    """Test that the lazy and stream variants produce the same lines."""
+    exp = sparklines(numbers, **kw)
+    assert list(iter_sparklines(numbers, **kw)) == exp
+    text = io.StringIO()
+    write_sparklines(text, numbers, **kw)
+    assert text.getvalue() == "".join(line + "\n" for line in exp)
+    raw = io.BytesIO()
+    write_sparklines(raw, numbers, **kw)
+    assert raw.getvalue() == text.getvalue().encode("utf-8")
+
+
+class _Lines:
+    """A text stream that is not an io.TextIOBase, like some log handlers."""
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        return len(text)
+
+
+def test_write_sparklines_duck_typed_text() -> None:
+    """Test that streams that are neither text nor binary IO receive text."""
+    out = _Lines()
+    write_sparklines(out, [1, 2, 3, 4], wrap=2)  # type: ignore[arg-type]
+    assert out.parts == ["▁▃\n", "\n▆█\n"]
+
+
+def test_iter_sparklines_is_lazy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only the windows consumed so far are rendered."""
+    drawn: list[int] = []
+    transpose = render._transpose
+
+    def counting(batch: Sequence[Any], *args: Any) -> Any:
+        drawn.append(len(batch))
+        return transpose(batch, *args)
+
+    monkeypatch.setattr(vector, "HAVE_NUMPY", False)
+    monkeypatch.setattr(render, "_transpose", counting)
+    lines = iter_sparklines([1, 2, 3, 4] * 1000, wrap=4)
+    assert drawn == []
+    assert next(lines) == "▁▃▆█"
+    assert drawn == [4]
+    # The separator is only yielded once the next window exists.
+    assert next(lines) == ""
+    assert next(lines) == "▁▃▆█"
+    assert drawn == [4, 4]
+
+
+def test_iter_sparklines_validates_eagerly() -> None:
+    """Test that bad options raise at call time, not on the first next()."""
+    with pytest.raises(ValueError):
+        iter_sparklines([1, 2], num_lines=0)
+    with pytest.raises(TypeError):
+        write_sparklines(io.StringIO(), [1, 2], colour="red")